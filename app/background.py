@@ -0,0 +1,185 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("spendscope.background")
+
+# Work started off the script thread has no Streamlit session: anything that
+# would touch st.session_state checks in_background() and takes a session-free path.
+_LOCAL = threading.local()
+
+
+def in_background() -> bool:
+    return bool(getattr(_LOCAL, "active", False))
+
+
+def _mark_background() -> None:
+    _LOCAL.active = True
+
+
+class SharedConnection:
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            try:
+                if self._conn is not None and not self._conn.is_closed():
+                    return self._conn
+            except Exception:
+                pass
+            self._conn = self._factory()
+            return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                if self._conn is not None:
+                    self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+
+# One connection per target for all background work in the process; module
+# state survives reruns, unlike globals in the Streamlit script.
+_CONNECTIONS: Dict[str, SharedConnection] = {}
+_CONNECTIONS_LOCK = threading.Lock()
+
+
+def shared_connection(key: str, factory: Callable[[], Any]) -> SharedConnection:
+    with _CONNECTIONS_LOCK:
+        holder = _CONNECTIONS.get(key)
+        if holder is None:
+            holder = _CONNECTIONS[key] = SharedConnection(factory)
+        return holder
+
+
+def close_shared_connections() -> None:
+    with _CONNECTIONS_LOCK:
+        holders = list(_CONNECTIONS.values())
+        _CONNECTIONS.clear()
+    for holder in holders:
+        holder.close()
+
+
+# Objects that own threads or process-wide state (query cache, shared backend,
+# prewarmer) are built once per process here rather than with st.cache_resource,
+# which "Clear app cache" would drop while their threads keep running.
+_SINGLETONS: Dict[str, Any] = {}
+_SINGLETONS_LOCK = threading.RLock()
+
+
+def process_singleton(name: str, factory: Callable[[], Any]) -> Any:
+    with _SINGLETONS_LOCK:
+        if name not in _SINGLETONS:
+            _SINGLETONS[name] = factory()
+        return _SINGLETONS[name]
+
+
+class Prewarmer:
+    def __init__(self, jobs: List[Tuple[str, Callable[[], Any]]], name: str = "spendscope-prewarm"):
+        self.jobs = list(jobs)
+        self.name = name
+        self.done = 0
+        self.failed = 0
+        self.current: Optional[str] = None
+        self.errors: Dict[str, str] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "Prewarmer":
+        with self._lock:
+            if self._thread is None:
+                self.started_at = time.monotonic()
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+        return self
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.finished
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    def _run(self) -> None:
+        _LOCAL.active = True
+        logger.info("prewarm started: %d queries", len(self.jobs))
+        try:
+            for label, job in self.jobs:
+                self.current = label
+                try:
+                    job()
+                except Exception as exc:
+                    with self._lock:
+                        self.failed += 1
+                        self.errors[label] = f"{type(exc).__name__}: {exc}"
+                    logger.warning("prewarm %s failed: %s", label, exc)
+                finally:
+                    with self._lock:
+                        self.done += 1
+        finally:
+            self.current = None
+            self.finished_at = time.monotonic()
+            _LOCAL.active = False
+            logger.info(
+                "prewarm finished: %d/%d ok in %.1fs",
+                self.done - self.failed,
+                len(self.jobs),
+                self.finished_at - (self.started_at or self.finished_at),
+            )
+
+    def progress(self) -> Dict[str, Any]:
+        with self._lock:
+            end = self.finished_at if self.finished_at is not None else time.monotonic()
+            return {
+                "total": len(self.jobs),
+                "done": self.done,
+                "failed": self.failed,
+                "current": self.current,
+                "finished": self.finished,
+                "elapsed_s": 0.0 if self.started_at is None else end - self.started_at,
+            }
+
+
+class Refresher:
+    def __init__(self, workers: int = 2, name: str = "spendscope-refresh"):
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, int(workers)),
+            thread_name_prefix=name,
+            initializer=_mark_background,
+        )
+
+    def submit(self, fn: Callable[[], Any]):
+        return self._pool.submit(self._run, fn)
+
+    @staticmethod
+    def _run(fn: Callable[[], Any]) -> None:
+        try:
+            fn()
+        except Exception:
+            logger.exception("background refresh failed")
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+_REFRESHER: Optional[Refresher] = None
+_REFRESHER_LOCK = threading.Lock()
+
+
+def shared_refresher(workers: int = 2) -> Refresher:
+    global _REFRESHER
+    with _REFRESHER_LOCK:
+        if _REFRESHER is None:
+            _REFRESHER = Refresher(workers)
+        return _REFRESHER
@@ -0,0 +1,340 @@
+import datetime as dt
+import os
+import re
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+
+# SQL for every app read lives here so the loaders and the background cache
+# warm-up issue identical text and therefore share cache entries. Values travel
+# as qmark binds and dates as explicit bounds, so the text is the same for every
+# window and day and Snowflake's result cache can serve repeats across sessions.
+class Query(NamedTuple):
+    sql: str
+    cache_key: str
+    params: Tuple[Any, ...] = ()
+    tag: str = ""
+    query_class: str = "marts"
+
+
+QUERY_TAG_PREFIX = "spendscope"
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_$]*$")
+
+
+def ident(name: str) -> str:
+    # Database/schema names come from env and cannot be bound; quote anything
+    # that is not a plain identifier instead of pasting it into the SQL.
+    name = str(name)
+    if _IDENTIFIER.match(name):
+        return name
+    return '"' + name.replace('"', '""') + '"'
+
+
+def normalize_sql(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+# Query class per cache_key prefix, used to route reads to a warehouse:
+# metadata probes are tiny, marts are the dashboard scans, pro aggregates the
+# hourly table. Unlisted prefixes are treated as marts.
+QUERY_CLASSES = {
+    "exists": "metadata",
+    "probe_hourly": "metadata",
+    "show_warehouses": "metadata",
+    "bva_latest": "metadata",
+    "fresh": "metadata",
+    "today": "metadata",
+    "pro_hourly": "pro",
+}
+QUERY_CLASS_NAMES = ("metadata", "marts", "pro")
+
+
+def query_class(cache_key: str) -> str:
+    return QUERY_CLASSES.get(str(cache_key).split(":", 1)[0], "marts")
+
+
+# Session parameters set at connect time by the app and check_snowflake.py, from
+# SNOWFLAKE_* env vars; unset, invalid or non-positive values keep Snowflake's default.
+SESSION_PARAMETER_ENV = (
+    ("STATEMENT_TIMEOUT_IN_SECONDS", "SNOWFLAKE_STATEMENT_TIMEOUT_SECONDS"),
+    ("CLIENT_PREFETCH_THREADS", "SNOWFLAKE_CLIENT_PREFETCH_THREADS"),
+    ("CLIENT_RESULT_CHUNK_SIZE", "SNOWFLAKE_CLIENT_RESULT_CHUNK_SIZE"),
+)
+
+
+def session_parameters() -> Dict[str, int]:
+    params = {}
+    for name, env in SESSION_PARAMETER_ENV:
+        try:
+            value = int(os.getenv(env, "").strip() or 0)
+        except ValueError:
+            continue
+        if value > 0:
+            params[name] = value
+    return params
+
+
+def query_tag(cache_key: str) -> str:
+    return f"{QUERY_TAG_PREFIX}:{str(cache_key).split(':', 1)[0]}"
+
+
+def build(sql: str, cache_key: str, params: Iterable[Any] = ()) -> Query:
+    return Query(normalize_sql(sql), cache_key, tuple(params), query_tag(cache_key), query_class(cache_key))
+
+
+# Marts stamp dates with Snowflake's current_date(), which follows the session
+# TIMEZONE (America/Los_Angeles by default), not the app server's clock. Callers
+# pass that date as `today`; the local date is only a fallback for offline use.
+def current_date() -> Query:
+    return build("select current_date() as today", "today")
+
+
+def days_ago(days: int, today: Optional[dt.date] = None) -> dt.date:
+    return (today or dt.date.today()) - dt.timedelta(days=int(days))
+
+
+# Seconds before a cached result is refreshed in the background, keyed by the
+# cache_key prefix. Metering-driven marts move hourly; storage, forecast and
+# budgets are rebuilt daily. Override with REFRESH_SECONDS_<PREFIX>, e.g.
+# REFRESH_SECONDS_STORAGE=21600.
+REFRESH_SECONDS = {
+    "today": 300,
+    "fct": 900,
+    "dept": 900,
+    "fresh": 900,
+    "probe_hourly": 900,
+    "pro_hourly": 900,
+    "top_spenders": 900,
+    "total_cost": 900,
+    "active_users": 900,
+    "show_warehouses": 900,
+    "storage": 3600,
+    "app_costs": 3600,
+    "utilization": 3600,
+    "forecast": 3600,
+    "budget": 3600,
+    "bva_latest": 3600,
+    "exists": 3600,
+}
+DEFAULT_REFRESH_SECONDS = 900
+
+
+def refresh_seconds(cache_key: Optional[str]) -> float:
+    prefix = str(cache_key or "").split(":", 1)[0]
+    default = REFRESH_SECONDS.get(prefix, DEFAULT_REFRESH_SECONDS)
+    raw = os.getenv(f"REFRESH_SECONDS_{prefix.upper()}", "") if prefix else ""
+    try:
+        return float(raw) if raw.strip() else float(default)
+    except ValueError:
+        return float(default)
+
+
+def models_lookback_days(lookback_days: int) -> int:
+    return max(lookback_days * 2 + 7, 14)
+
+
+def table_exists(database: str, schema: str, table: str) -> Query:
+    return build(
+        f"""
+        select 1
+        from {ident(database)}.information_schema.tables
+        where lower(table_schema) = lower(?)
+          and lower(table_name)   = lower(?)
+        limit 1
+    """,
+        f"exists:{database}.{schema}.{table}".lower(),
+        (schema, table),
+    )
+
+
+def daily_costs(db: str, sch: str, lb: int, today: Optional[dt.date] = None) -> Query:
+    return build(
+        f"""
+        select usage_date, warehouse_name, compute_cost, cloud_services_cost,
+               total_cost, idle_cost, _loaded_at
+        from {ident(db)}.{ident(sch)}.fct_daily_costs
+        where usage_date >= ?
+        order by usage_date
+    """,
+        f"fct:{db}.{sch}:{lb}",
+        (days_ago(lb, today),),
+    )
+
+
+def cost_by_department(db: str, sch: str, lb: int, today: Optional[dt.date] = None) -> Query:
+    return build(
+        f"""
+        select department, usage_date, total_cost_usd
+        from {ident(db)}.{ident(sch)}.fct_cost_by_department
+        where usage_date >= ?
+        order by usage_date
+    """,
+        f"dept:{db}.{sch}:{lb}",
+        (days_ago(lb, today),),
+    )
+
+
+def metering_freshness(au_db: str, au_schema: str) -> Query:
+    return build(
+        f"select max(END_TIME) as last_end_time from {ident(au_db)}.{ident(au_schema)}.WAREHOUSE_METERING_HISTORY",
+        f"fresh:{au_db}.{au_schema}",
+    )
+
+
+def budget_daily(db: str, sch: str) -> Query:
+    return build(
+        f"select date, department, budget_usd from {ident(db)}.{ident(sch)}.budget_daily",
+        f"budget:{db}.{sch}",
+    )
+
+
+def budget_vs_actual_latest(db: str, sch: str) -> Query:
+    return build(
+        f"select max(usage_date) as usage_date from {ident(db)}.{ident(sch)}.fct_budget_vs_actual",
+        f"bva_latest:{db}.{sch}",
+    )
+
+
+def cost_forecast(db: str, sch: str, today: Optional[dt.date] = None) -> Query:
+    return build(
+        f"""
+        select forecast_date, warehouse_name, forecasted_cost_usd,
+               confidence_band_low, confidence_band_high, days_ahead
+        from {ident(db)}.{ident(sch)}.fct_cost_forecast
+        where forecast_run_date = ?
+        order by forecast_date
+        """,
+        f"forecast:{db}.{sch}",
+        (today or dt.date.today(),),
+    )
+
+
+def storage_costs(db: str, sch: str, lookback_days: int, today: Optional[dt.date] = None) -> Query:
+    return build(
+        f"""
+        select usage_date, database_name,
+               total_storage_tb, estimated_storage_cost_usd,
+               estimated_active_cost_usd, estimated_failsafe_cost_usd, estimated_stage_cost_usd,
+               month_to_date_storage_cost as mtd_storage_cost_usd
+        from {ident(db)}.{ident(sch)}.fct_daily_storage_costs
+        where usage_date >= ?
+        order by usage_date
+        """,
+        f"storage:{db}.{sch}:{lookback_days}",
+        (days_ago(lookback_days, today),),
+    )
+
+
+def top_spenders(db: str, sch: str, lookback_days: int, today: Optional[dt.date] = None) -> Query:
+    return build(
+        f"""
+        select usage_date, user_name, primary_warehouse_name,
+               query_count, total_runtime_seconds, gb_scanned,
+               estimated_cost_usd, has_cost_estimate,
+               rank_by_query_count, rank_by_runtime, rank_by_cost,
+               pct_of_daily_query_total
+        from {ident(db)}.{ident(sch)}.fct_top_spenders
+        where usage_date >= ?
+        order by usage_date desc
+        """,
+        f"top_spenders:{db}.{sch}:{lookback_days}",
+        (days_ago(lookback_days, today),),
+    )
+
+
+def active_users(db: str, sch: str, lookback_days: int, today: Optional[dt.date] = None) -> Query:
+    return build(
+        f"""
+        select hll_estimate(hll_combine(users_hll)) as active_users,
+               min(usage_date) as first_usage_date,
+               max(usage_date) as last_usage_date
+        from {ident(db)}.{ident(sch)}.fct_daily_costs
+        where usage_date >= ?
+          and users_hll is not null
+        """,
+        f"active_users:{db}.{sch}:{lookback_days}",
+        (days_ago(lookback_days, today),),
+    )
+
+
+def app_query_costs(db: str, sch: str, lookback_days: int, today: Optional[dt.date] = None) -> Query:
+    return build(
+        f"""
+        select usage_date, query_tag, query_count, total_elapsed_seconds, gb_scanned,
+               zero_scan_query_count, attributed_credits, attributed_cost_usd
+        from {ident(db)}.{ident(sch)}.fct_app_query_costs
+        where usage_date >= ?
+        order by usage_date
+        """,
+        f"app_costs:{db}.{sch}:{lookback_days}",
+        (days_ago(lookback_days, today),),
+    )
+
+
+def warehouse_utilization(db: str, sch: str) -> Query:
+    return build(
+        f"""
+        select warehouse_name, day_of_week, hour_of_day, days_in_window,
+               avg_credits_per_hour, total_credits, idle_cost_usd, query_count,
+               active_hours, active_hour_ratio, window_start_date, window_end_date
+        from {ident(db)}.{ident(sch)}.fct_warehouse_hourly_utilization
+        """,
+        f"utilization:{db}.{sch}",
+    )
+
+
+def total_cost_summary(db: str, sch: str, today: Optional[dt.date] = None) -> Query:
+    return build(
+        f"""
+        select usage_date, cost_category, cost_usd, pct_of_daily_total, mtd_cost_usd
+        from {ident(db)}.{ident(sch)}.fct_total_cost_summary
+        where usage_date >= ?
+        order by usage_date, cost_category
+        """,
+        f"total_cost:{db}.{sch}",
+        ((today or dt.date.today()).replace(day=1),),
+    )
+
+
+def show_warehouses() -> Query:
+    return build("show warehouses", "show_warehouses")
+
+
+def hourly_probe(db: str, sch: str) -> Query:
+    return build(
+        f"select * from {ident(db)}.{ident(sch)}.int_hourly_compute_costs limit 1",
+        f"probe_hourly:{db}.{sch}",
+    )
+
+
+def pro_hourly(
+    db: str,
+    sch: str,
+    days: int,
+    credit_threshold: float,
+    has_size: bool,
+    today: Optional[dt.date] = None,
+) -> Query:
+    today = today or dt.date.today()
+    size_select = "max(warehouse_size) as warehouse_size," if has_size else "null as warehouse_size,"
+    return build(
+        f"""
+        select
+            warehouse_name,
+            sum(case when is_potentially_idle = true and total_credits_used >= ?
+                     then compute_cost_usd else 0 end) as idle_cost_adj,
+            sum(total_cost_usd)  as total_cost,
+            sum(compute_cost_usd) as compute_cost,
+            count(*) as total_hours,
+            sum(case when queries_executed > 0 then 1 else 0 end) as active_hours,
+            sum(case when queries_executed > 0 then total_credits_used else 0 end) as credits_on_active_hours,
+            {size_select}
+            count(distinct usage_date) as total_days,
+            count(distinct case when queries_executed > 0 then usage_date end) as active_days
+        from {ident(db)}.{ident(sch)}.int_hourly_compute_costs
+        where usage_date between ? and ?
+        group by 1
+    """,
+        f"pro_hourly:{db}.{sch}:{days}:{credit_threshold}",
+        (float(credit_threshold), days_ago(days - 1, today), today),
+    )
@@ -0,0 +1,422 @@
+import contextvars
+import functools
+import random
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+
+def estimate_bytes(value: Any) -> int:
+    if isinstance(value, pd.DataFrame):
+        try:
+            return int(value.memory_usage(index=True, deep=True).sum())
+        except Exception:
+            return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_bytes(k) + estimate_bytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_bytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def _copy(value: Any) -> Any:
+    # Callers post-process loader results in place (lc/to_float), so hand out
+    # copies the same way st.cache_data does instead of the cached object.
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    return value
+
+
+class CachedFailure(Exception):
+    def __init__(self, message: str, ttl: float, permanent: bool = False):
+        super().__init__(message)
+        self.message = message
+        self.ttl = float(ttl)
+        self.permanent = permanent
+
+
+# Loaders that swallow a CachedFailure (run_query returns an empty frame) call
+# note_failure so any cached() loader wrapping them stores its degraded result
+# for the failure TTL instead of forever.
+_FAILURE_TTL: contextvars.ContextVar = contextvars.ContextVar("spendscope_failure_ttl", default=None)
+
+
+def note_failure(ttl: float) -> None:
+    current = _FAILURE_TTL.get()
+    _FAILURE_TTL.set(ttl if current is None else min(current, ttl))
+
+
+PERMANENT_ERRNOS = {904, 1003, 2003, 2043}
+PERMANENT_MESSAGES = ("does not exist", "not authorized", "invalid identifier", "syntax error", "insufficient privileges")
+
+
+def is_permanent_error(exc: BaseException) -> bool:
+    if isinstance(exc, CachedFailure):
+        return exc.permanent
+    if getattr(exc, "errno", None) in PERMANENT_ERRNOS:
+        return True
+    sqlstate = str(getattr(exc, "sqlstate", "") or "")
+    if sqlstate.startswith("42"):
+        return True
+    message = str(exc).lower()
+    return any(needle in message for needle in PERMANENT_MESSAGES)
+
+
+def retry_with_backoff(
+    fn: Callable[[], Any],
+    *,
+    attempts: int = 3,
+    base_delay: float = 0.5,
+    max_delay: float = 4.0,
+    retryable: Callable[[BaseException], bool] = lambda exc: not is_permanent_error(exc),
+    sleep: Callable[[float], None] = time.sleep,
+    jitter: Callable[[float, float], float] = random.uniform,
+) -> Any:
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except Exception as exc:
+            attempt += 1
+            if attempt >= max(1, attempts) or not retryable(exc):
+                raise
+            # Full jitter keeps sessions that failed together from retrying in lockstep.
+            sleep(jitter(0.0, min(max_delay, base_delay * (2 ** (attempt - 1)))))
+
+
+class _Entry:
+    __slots__ = ("value", "size", "expires_at", "stale_at", "failure")
+
+    def __init__(
+        self,
+        value: Any,
+        size: int,
+        expires_at: Optional[float],
+        stale_at: Optional[float],
+        failure: Optional[CachedFailure],
+    ):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.stale_at = stale_at
+        self.failure = failure
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error", "degraded_ttl", "abandoned")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[Exception] = None
+        self.degraded_ttl: Optional[float] = None
+        self.abandoned = False
+
+
+# Process-wide LRU bounded by entry count and by estimated result bytes.
+# Entries stored with refresh_after go stale after that many seconds: they keep
+# being served while one background refresh per key (via `refresh`, a callable
+# that runs a zero-arg function off the request thread) replaces them. Stale
+# entries are dropped outright after max_stale seconds without a refresh.
+# An optional shared backend (see shared_cache.CacheBackend) sits behind the
+# local LRU so replicas reuse each other's results; its errors never fail a read.
+# Concurrent misses on a key wait up to flight_timeout seconds for the first
+# caller's load, then load on their own.
+class QueryCache:
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 256 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+        refresh: Optional[Callable[[Callable[[], None]], Any]] = None,
+        max_stale: float = 86400.0,
+        shared: Any = None,
+        flight_timeout: Optional[float] = 60.0,
+    ):
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self.max_stale = max(0.0, float(max_stale))
+        self.flight_timeout = None if flight_timeout is None else max(0.0, float(flight_timeout))
+        self._clock = clock
+        self._refresh = refresh
+        self._shared = shared
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._refreshing = set()
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self._bytes = 0
+        # Bumped by clear(); refreshes started before it are discarded.
+        self._generation = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.negative_hits = 0
+        self.stale_hits = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.shared_hits = 0
+        self.shared_misses = 0
+        self.shared_errors = 0
+        self.coalesced = 0
+        self.flight_timeouts = 0
+
+    def _lookup(self, key: Hashable) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at is not None and self._clock() >= entry.expires_at:
+            self._discard(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        if entry.failure is not None:
+            self.negative_hits += 1
+        return entry
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                return False, None
+            if entry.failure is not None:
+                return True, entry.failure
+            return True, _copy(entry.value)
+
+    def put(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        refresh_after: Optional[float] = None,
+    ) -> bool:
+        failure = value if isinstance(value, CachedFailure) else None
+        size = estimate_bytes(failure.message if failure is not None else value)
+        now = self._clock()
+        expires_at = None if ttl is None else now + max(0.0, float(ttl))
+        stale_at = None
+        if refresh_after is not None and failure is None and ttl is None:
+            stale_at = now + max(0.0, float(refresh_after))
+            expires_at = stale_at + self.max_stale
+        with self._lock:
+            self._discard(key)
+            if size > self.max_bytes:
+                return False
+            self._entries[key] = _Entry(None if failure else value, size, expires_at, stale_at, failure)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+            return True
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], refresh_after: Optional[float] = None) -> Any:
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                if entry.failure is not None:
+                    raise entry.failure.with_traceback(None)
+                if entry.stale_at is not None and self._clock() >= entry.stale_at:
+                    self.stale_hits += 1
+                    self._schedule_refresh(key, loader, refresh_after)
+                return _copy(entry.value)
+            # Single flight: concurrent misses on one key wait for the first
+            # caller's load instead of each sending the same query.
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+            else:
+                self.coalesced += 1
+        if not leader:
+            if not flight.done.wait(self.flight_timeout):
+                # The leader looks stuck (e.g. a hung statement): stop waiting on it.
+                with self._lock:
+                    self.flight_timeouts += 1
+                value, degraded_ttl = self._load(key, loader, refresh_after)
+            elif flight.abandoned:
+                value, degraded_ttl = self._load(key, loader, refresh_after)
+            elif flight.error is not None:
+                raise flight.error.with_traceback(None)
+            else:
+                value, degraded_ttl = flight.value, flight.degraded_ttl
+            if degraded_ttl is not None:
+                note_failure(degraded_ttl)
+            return _copy(value)
+        try:
+            flight.value, flight.degraded_ttl = self._load(key, loader, refresh_after)
+        except Exception as exc:
+            flight.error = exc
+            raise
+        except BaseException:
+            # Control flow from the leader's own session (Streamlit's stop/rerun,
+            # KeyboardInterrupt) is not a query result; waiters load for themselves.
+            flight.abandoned = True
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+        if flight.degraded_ttl is not None:
+            note_failure(flight.degraded_ttl)
+        return _copy(flight.value)
+
+    def _load(self, key: Hashable, loader: Callable[[], Any], refresh_after: Optional[float]) -> Tuple[Any, Optional[float]]:
+        shared = self._shared_get(key)
+        if shared is not None:
+            value, age = shared
+            self.put(key, value, refresh_after=None if refresh_after is None else max(0.0, refresh_after - age))
+            if refresh_after is not None and age >= refresh_after:
+                with self._lock:
+                    self.stale_hits += 1
+                    self._schedule_refresh(key, loader, refresh_after)
+            return value, None
+        token = _FAILURE_TTL.set(None)
+        try:
+            value = loader()
+            degraded_ttl = _FAILURE_TTL.get()
+        except CachedFailure as failure:
+            self.put(key, failure, ttl=failure.ttl)
+            raise
+        finally:
+            _FAILURE_TTL.reset(token)
+        if degraded_ttl is None:
+            self._shared_set(key, value, refresh_after)
+        self.put(key, value, ttl=degraded_ttl, refresh_after=refresh_after)
+        return value, degraded_ttl
+
+    def _shared_get(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        if self._shared is None:
+            return None
+        try:
+            hit = self._shared.get(key)
+        except Exception:
+            self.shared_errors += 1
+            return None
+        if hit is None:
+            self.shared_misses += 1
+        else:
+            self.shared_hits += 1
+        return hit
+
+    def _shared_set(self, key: Hashable, value: Any, refresh_after: Optional[float]) -> None:
+        if self._shared is None:
+            return
+        try:
+            self._shared.set(key, value, ttl=(refresh_after or 0.0) + self.max_stale)
+        except Exception:
+            self.shared_errors += 1
+
+    def _schedule_refresh(self, key: Hashable, loader: Callable[[], Any], refresh_after: Optional[float]) -> None:
+        if self._refresh is None or key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        generation = self._generation
+        try:
+            self._refresh(lambda: self._run_refresh(key, loader, refresh_after, generation))
+        except Exception:
+            self._refreshing.discard(key)
+
+    def _run_refresh(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        refresh_after: Optional[float],
+        generation: int = 0,
+    ) -> None:
+        shared = self._shared_get(key)
+        if shared is not None and refresh_after is not None and shared[1] < refresh_after:
+            # Another replica already refreshed this key.
+            with self._lock:
+                if generation != self._generation:
+                    return
+                self._refreshing.discard(key)
+                self.put(key, shared[0], refresh_after=refresh_after - shared[1])
+            return
+        token = _FAILURE_TTL.set(None)
+        try:
+            value = loader()
+            degraded_ttl = _FAILURE_TTL.get()
+        except CachedFailure as failure:
+            value, degraded_ttl = None, failure.ttl
+        except Exception:
+            value, degraded_ttl = None, refresh_after or 0.0
+        finally:
+            _FAILURE_TTL.reset(token)
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._refreshing.discard(key)
+            if degraded_ttl is not None:
+                # Keep serving the last good result; try again after the failure TTL.
+                self.refresh_failures += 1
+                entry = self._entries.get(key)
+                if entry is not None and entry.stale_at is not None:
+                    entry.stale_at = self._clock() + degraded_ttl
+                return
+            self.refreshes += 1
+            self.put(key, value, refresh_after=refresh_after)
+        self._shared_set(key, value, refresh_after)
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def clear(self, shared: bool = False) -> None:
+        if shared and self._shared is not None:
+            try:
+                self._shared.clear()
+            except Exception:
+                self.shared_errors += 1
+        with self._lock:
+            self._entries.clear()
+            self._refreshing.clear()
+            self._bytes = 0
+            self._generation += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            now = self._clock()
+            return {
+                "entries": len(self._entries),
+                "negative_entries": sum(1 for e in self._entries.values() if e.failure is not None),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "negative_hits": self.negative_hits,
+                "evictions": self.evictions,
+                "stale_entries": sum(1 for e in self._entries.values() if e.stale_at is not None and now >= e.stale_at),
+                "stale_hits": self.stale_hits,
+                "refreshing": len(self._refreshing),
+                "refreshes": self.refreshes,
+                "refresh_failures": self.refresh_failures,
+                "shared_backend": getattr(self._shared, "name", "none") if self._shared is not None else "none",
+                "shared_hits": self.shared_hits,
+                "shared_misses": self.shared_misses,
+                "shared_errors": self.shared_errors,
+                "in_flight": len(self._inflight),
+                "coalesced": self.coalesced,
+                "flight_timeouts": self.flight_timeouts,
+            }
+
+
+def cached(get_cache: Callable[[], QueryCache], refresh_after: Any = None):
+    # refresh_after is seconds, or a callable taking the wrapped function's
+    # arguments so one decorator can give each query its own cadence.
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (fn.__qualname__, args, tuple(sorted(kwargs.items())))
+            after = refresh_after(*args, **kwargs) if callable(refresh_after) else refresh_after
+            return get_cache().get_or_load(key, lambda: fn(*args, **kwargs), refresh_after=after)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,156 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def cache_key_digest(key: Hashable) -> str:
+    # Keys are tuples of str/int/float/bool, so repr() is stable across processes.
+    return hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+
+
+# Interface every shared backend implements. get() returns the value with its
+# age in seconds so replicas agree on freshness no matter which one stored it.
+# A Redis-style backend maps set() to SET key value EX ttl plus a stored-at field.
+class CacheBackend(ABC):
+    name = "none"
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        ...
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any, ttl: float) -> bool:
+        ...
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+_SCHEMA = """
+create table if not exists cache_entries (
+    key         text primary key,
+    value       blob not null,
+    size        integer not null,
+    stored_at   real not null,
+    expires_at  real not null,
+    accessed_at real not null
+)
+"""
+
+
+class SQLiteCacheBackend(CacheBackend):
+    name = "sqlite"
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 512 * 1024 * 1024,
+        busy_timeout: float = 5.0,
+        touch_interval: float = 60.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.max_bytes = max(1, int(max_bytes))
+        self.busy_timeout = busy_timeout
+        self.touch_interval = max(0.0, float(touch_interval))
+        self._clock = clock
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+            conn.execute("create index if not exists cache_entries_accessed on cache_entries (accessed_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread; SQLite's file locks serialise writers
+        # across threads and replicas, busy_timeout makes them wait, not fail.
+        # Rollback journal, not WAL: WAL keeps its index in shared memory on one
+        # host and is unsafe on network filesystems, where replicas on other
+        # hosts share this file.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("pragma journal_mode=delete")
+            conn.execute(f"pragma busy_timeout={int(self.busy_timeout * 1000)}")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        digest = cache_key_digest(key)
+        now = self._clock()
+        conn = self._connect()
+        row = conn.execute(
+            "select value, stored_at, accessed_at from cache_entries where key = ? and expires_at > ?",
+            (digest, now),
+        ).fetchone()
+        if row is None:
+            return None
+        # Reads only write once per touch_interval, so cache hits rarely take the
+        # write lock every replica contends for; eviction order is coarse by as much.
+        if now - row[2] >= self.touch_interval:
+            conn.execute("update cache_entries set accessed_at = ? where key = ?", (now, digest))
+        return pickle.loads(row[0]), max(0.0, now - row[1])
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> bool:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return False
+        now = self._clock()
+        conn = self._connect()
+        conn.execute("begin immediate")
+        try:
+            conn.execute(
+                "insert or replace into cache_entries (key, value, size, stored_at, expires_at, accessed_at) "
+                "values (?, ?, ?, ?, ?, ?)",
+                (cache_key_digest(key), blob, len(blob), now, now + max(0.0, float(ttl)), now),
+            )
+            conn.execute("delete from cache_entries where expires_at <= ?", (now,))
+            total = conn.execute("select coalesce(sum(size), 0) from cache_entries").fetchone()[0]
+            while total > self.max_bytes:
+                oldest = conn.execute(
+                    "select key, size from cache_entries order by accessed_at limit 1"
+                ).fetchone()
+                if oldest is None:
+                    break
+                conn.execute("delete from cache_entries where key = ?", (oldest[0],))
+                total -= oldest[1]
+            conn.execute("commit")
+        except Exception:
+            conn.execute("rollback")
+            raise
+        return True
+
+    def delete(self, key: Hashable) -> None:
+        self._connect().execute("delete from cache_entries where key = ?", (cache_key_digest(key),))
+
+    def clear(self) -> None:
+        self._connect().execute("delete from cache_entries")
+
+    def stats(self) -> Dict[str, Any]:
+        row = self._connect().execute(
+            "select count(*), coalesce(sum(size), 0) from cache_entries where expires_at > ?",
+            (self._clock(),),
+        ).fetchone()
+        return {"backend": self.name, "path": self.path, "entries": row[0], "bytes": row[1], "max_bytes": self.max_bytes}
+
+
+def open_backend(url: str, max_bytes: int = 512 * 1024 * 1024) -> Optional[CacheBackend]:
+    url = (url or "").strip()
+    if not url:
+        return None
+    if url.startswith("sqlite:///"):
+        return SQLiteCacheBackend(url[len("sqlite:///"):], max_bytes=max_bytes)
+    raise ValueError(f"Unsupported SHARED_CACHE_URL scheme: {url.split(':', 1)[0]}")
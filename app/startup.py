@@ -0,0 +1,85 @@
+import importlib
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+def import_budget_ms() -> float:
+    try:
+        return float(os.getenv("IMPORT_BUDGET_MS", "250"))
+    except ValueError:
+        return 250.0
+
+
+# Import timings live at module level so they survive Streamlit reruns: a heavy
+# module is only paid for once per process, the first time a session needs it.
+IMPORT_TIMINGS: Dict[str, float] = {}
+IMPORT_ERRORS: Dict[str, str] = {}
+
+
+class LazyModule:
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def load(self):
+        if self._module is not None:
+            return self._module
+        if self._name in IMPORT_ERRORS:
+            return None
+        started = time.perf_counter()
+        try:
+            self._module = importlib.import_module(self._name)
+        except Exception as exc:
+            IMPORT_ERRORS[self._name] = f"{type(exc).__name__}: {exc}"
+            return None
+        finally:
+            IMPORT_TIMINGS.setdefault(self._name, (time.perf_counter() - started) * 1000.0)
+        return self._module
+
+    @property
+    def available(self) -> bool:
+        return self.load() is not None
+
+    @property
+    def import_error(self) -> str:
+        return IMPORT_ERRORS.get(self._name, "")
+
+    def __getattr__(self, attr: str):
+        module = self.load()
+        if module is None:
+            raise ImportError(f"{self._name} unavailable: {self.import_error or 'import failed'}")
+        return getattr(module, attr)
+
+
+class StartupProfile:
+    def __init__(self, started: Optional[float] = None):
+        self._last = started if started is not None else time.perf_counter()
+        self.phases: List[Dict[str, float]] = []
+
+    def mark(self, phase: str) -> float:
+        now = time.perf_counter()
+        elapsed = (now - self._last) * 1000.0
+        self._last = now
+        self.phases.append({"phase": phase, "ms": elapsed})
+        return elapsed
+
+    @contextmanager
+    def phase(self, name: str):
+        self._last = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.mark(name)
+
+    def report(self) -> List[Dict[str, str]]:
+        budget = import_budget_ms()
+        rows = [
+            {"Step": f"phase: {p['phase']}", "ms": f"{p['ms']:.1f}", "Budget": ""}
+            for p in self.phases
+        ]
+        for name, ms in sorted(IMPORT_TIMINGS.items(), key=lambda kv: kv[1], reverse=True):
+            status = "error" if name in IMPORT_ERRORS else ("over budget" if ms > budget else "ok")
+            rows.append({"Step": f"lazy import: {name}", "ms": f"{ms:.1f}", "Budget": f"{budget:.0f} ({status})"})
+        return rows
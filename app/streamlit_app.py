@@ -1,8 +1,13 @@
 # app/streamlit_app.py
+import time
+
+_SCRIPT_STARTED = time.perf_counter()
+
 import os
 import calendar
 import datetime as dt
 import html
+import logging
 from typing import Optional, Dict, List
 
 # Load .env so flags like ENABLE_PRO_PACK are available to the app
@@ -32,17 +37,51 @@ except ModuleNotFoundError:
     from components import apply_chart_theme, inline_stat_strip, kpi_hero, ranked_list, section_close, section_open
 
 try:
-    import plotly.graph_objects as go
-    PLOTLY = True
-except Exception:
-    PLOTLY = False
+    from app.startup import LazyModule, StartupProfile
+except ModuleNotFoundError:
+    from startup import LazyModule, StartupProfile
+
+try:
+    from app.background import (
+        Prewarmer,
+        close_shared_connections,
+        in_background,
+        process_singleton,
+        shared_connection,
+        shared_refresher,
+    )
+except ModuleNotFoundError:
+    from background import (
+        Prewarmer,
+        close_shared_connections,
+        in_background,
+        process_singleton,
+        shared_connection,
+        shared_refresher,
+    )
+
+try:
+    from app.shared_cache import open_backend
+except ModuleNotFoundError:
+    from shared_cache import open_backend
 
 try:
-    import snowflake.connector as sf
-    SF_IMPORT_ERROR = ""
-except Exception as exc:
-    sf = None  # type: ignore
-    SF_IMPORT_ERROR = f"{type(exc).__name__}: {exc}"
+    from app import queries
+except ImportError:
+    import queries
+
+try:
+    from app.query_cache import CachedFailure, QueryCache, cached, is_permanent_error, note_failure, retry_with_backoff
+except ModuleNotFoundError:
+    from query_cache import CachedFailure, QueryCache, cached, is_permanent_error, note_failure, retry_with_backoff
+
+# Plotly and the Snowflake connector dominate import time; load them on first use
+# so sessions that never draw a chart or open a connection skip the cost.
+go = LazyModule("plotly.graph_objects")
+sf = LazyModule("snowflake.connector")
+
+startup_profile = StartupProfile(_SCRIPT_STARTED)
+startup_profile.mark("eager imports")
 
 # -------- helpers -----------------------------------------------------------
 def env_bool(name: str, default: bool = False) -> bool:
@@ -51,6 +90,18 @@ def env_bool(name: str, default: bool = False) -> bool:
         return default
     return str(v).strip().lower() in {"1", "true", "yes", "on"}
 
+def env_int(name: str, default: int) -> int:
+    try:
+        return int(str(os.getenv(name, default)).strip())
+    except ValueError:
+        return default
+
+def env_float(name: str, default: float) -> float:
+    try:
+        return float(str(os.getenv(name, default)).strip())
+    except ValueError:
+        return default
+
 DEV_MODE = env_bool("DEV_MODE", False)
 
 st.set_page_config(
@@ -86,15 +137,46 @@ def to_float(df: pd.DataFrame, cols: List[str]) -> pd.DataFrame:
 def dim_count(d: dt.date) -> int:
     return calendar.monthrange(d.year, d.month)[1]
 
-def clear_all_caches():
+# Set SHARED_CACHE_URL (e.g. sqlite:////mnt/shared/spendscope-cache.db) on every
+# replica so they reuse each other's query results and agree on freshness.
+def _open_shared_cache_backend():
     try:
-        st.cache_data.clear()
+        return open_backend(
+            os.getenv("SHARED_CACHE_URL", ""),
+            max_bytes=env_int("SHARED_CACHE_MAX_MB", 512) * 1024 * 1024,
+        )
+    except Exception as exc:
+        logging.getLogger("spendscope.shared_cache").warning("shared cache disabled: %s: %s", type(exc).__name__, exc)
+        return None
+
+def shared_cache_backend():
+    return process_singleton("shared_cache_backend", _open_shared_cache_backend)
+
+def query_cache() -> QueryCache:
+    return process_singleton(
+        "query_cache",
+        lambda: QueryCache(
+            max_entries=env_int("QUERY_CACHE_MAX_ENTRIES", 256),
+            max_bytes=env_int("QUERY_CACHE_MAX_MB", 256) * 1024 * 1024,
+            refresh=shared_refresher(env_int("QUERY_REFRESH_WORKERS", 2)).submit,
+            max_stale=env_float("QUERY_MAX_STALE_SECONDS", 86400.0),
+            shared=shared_cache_backend(),
+            flight_timeout=env_float("QUERY_FLIGHT_TIMEOUT_SECONDS", 60.0),
+        ),
+    )
+
+def clear_all_caches(shared: bool = False):
+    try:
+        query_cache().clear(shared=shared)
     except Exception:
         pass
+    # Only the st.cache_data loaders: the query cache, shared backend and
+    # prewarmer are process singletons whose threads outlive a clear.
     try:
-        st.cache_resource.clear()
+        st.cache_data.clear()
     except Exception:
         pass
+    close_shared_connections()
     try:
         for k in list(st.session_state.keys()):
             if str(k).startswith("sf_conn::"):
@@ -117,6 +199,8 @@ def reset_data_errors():
     st.session_state[DATA_ERRORS_KEY] = {}
 
 def record_data_error(scope: str, exc: object):
+    if in_background():
+        return
     message = str(exc).replace("\n", " ").strip()
     if not message:
         message = "Unknown Snowflake data error."
@@ -142,8 +226,7 @@ def data_error_for(*needles: str) -> Optional[str]:
     return None
 
 # -------- Snowflake ---------------------------------------------------------
-@st.cache_data(show_spinner=False)
-def get_conn_params() -> Dict[str, str]:
+def conn_params_from_env() -> Dict[str, str]:
     return {
         "account": os.getenv("SNOWFLAKE_ACCOUNT", ""),
         "user": os.getenv("SNOWFLAKE_USER", ""),
@@ -154,121 +237,180 @@ def get_conn_params() -> Dict[str, str]:
         "schema": os.getenv("SNOWFLAKE_SCHEMA", ""),
     }
 
+@st.cache_data(show_spinner=False)
+def get_conn_params() -> Dict[str, str]:
+    return conn_params_from_env()
+
 def active_schema(demo: bool) -> str:
     return "DEMO" if demo else (get_conn_params().get("schema", "") or "PUBLIC")
 
-def _raw_connect():
-    cp = get_conn_params()
-    if sf is None:
-        record_data_error("snowflake_import", f"Snowflake connector unavailable: {SF_IMPORT_ERROR or 'import failed'}")
+# Dashboard reads can be kept off the dbt build warehouse: each query class
+# (see queries.QUERY_CLASSES) may name its own warehouse, falling back to
+# SNOWFLAKE_APP_WAREHOUSE and then SNOWFLAKE_WAREHOUSE.
+def warehouse_for(query_class: str) -> str:
+    return (
+        os.getenv(f"SNOWFLAKE_WAREHOUSE_{query_class.upper()}", "").strip()
+        or os.getenv("SNOWFLAKE_APP_WAREHOUSE", "").strip()
+        or os.getenv("SNOWFLAKE_WAREHOUSE", "")
+    )
+
+def open_connection(cp: Dict[str, str]):
+    return sf.connect(
+        account=cp["account"],
+        user=cp["user"],
+        password=cp["password"],
+        warehouse=cp["warehouse"],
+        role=cp["role"],
+        database=cp["database"],
+        schema=cp["schema"],
+        paramstyle="qmark",
+        session_parameters=queries.session_parameters(),
+    )
+
+def _raw_connect(cp: Dict[str, str]):
+    if not sf.available:
+        record_data_error("snowflake_import", f"Snowflake connector unavailable: {sf.import_error or 'import failed'}")
         return None
     try:
-        return sf.connect(
-            account=cp["account"],
-            user=cp["user"],
-            password=cp["password"],
-            warehouse=cp["warehouse"],
-            role=cp["role"],
-            database=cp["database"],
-            schema=cp["schema"],
-        )
+        return open_connection(cp)
     except Exception as exc:
         record_data_error("snowflake_connection", f"{type(exc).__name__}: {exc}")
         return None
 
-def connect():
-    cp = get_conn_params()
-    key = f"sf_conn::{cp.get('account','')}::{cp.get('user','')}::{cp.get('database','')}::{cp.get('schema','')}"
+def connection_key(cp: Dict[str, str]) -> str:
+    return (
+        f"sf_conn::{cp.get('account','')}::{cp.get('user','')}::{cp.get('database','')}::{cp.get('schema','')}"
+        f"::{cp.get('warehouse','')}"
+    )
+
+def connect(warehouse: Optional[str] = None):
+    cp = dict(conn_params_from_env() if in_background() else get_conn_params())
+    if warehouse:
+        cp["warehouse"] = warehouse
+    if in_background():
+        return shared_connection(connection_key(cp), lambda: open_connection(cp)).get()
+    key = connection_key(cp)
     conn = st.session_state.get(key)
     try:
         if conn is not None and hasattr(conn, "is_closed") and not conn.is_closed():
             return conn
     except Exception:
         pass
-    conn = _raw_connect()
+    conn = _raw_connect(cp)
     if conn is None:
         record_data_error("snowflake_connection", "Snowflake connection unavailable.")
     st.session_state[key] = conn
     return conn
 
-@st.cache_data(show_spinner=False)
-def run_query(sql: str, cache_key: Optional[str] = None) -> pd.DataFrame:
-    scope = cache_key or "snowflake_query"
-    if sf is None:
-        record_data_error(scope, f"Snowflake connector unavailable: {SF_IMPORT_ERROR or 'import failed'}")
-        return pd.DataFrame()
-    conn = connect()
+# Failed queries are cached briefly so one Snowflake blip does not blank a section
+# until someone clears the cache; missing objects and grants get a longer TTL.
+QUERY_ERROR_TTL_SECONDS = env_float("QUERY_ERROR_TTL_SECONDS", 30.0)
+QUERY_MISSING_TTL_SECONDS = env_float("QUERY_MISSING_TTL_SECONDS", 600.0)
+QUERY_RETRY_ATTEMPTS = env_int("QUERY_RETRY_ATTEMPTS", 3)
+QUERY_RETRY_BASE_SECONDS = env_float("QUERY_RETRY_BASE_SECONDS", 0.5)
+QUERY_RETRY_MAX_SECONDS = env_float("QUERY_RETRY_MAX_SECONDS", 4.0)
+
+# Snowflake only reuses a cached result for identical text and binds, which the
+# query builder guarantees; QUERY_TAG marks every dashboard read in QUERY_HISTORY.
+USE_CACHED_RESULT = env_bool("SNOWFLAKE_USE_CACHED_RESULT", True)
+
+def statement_params(query: queries.Query) -> Dict[str, str]:
+    params = {"USE_CACHED_RESULT": "TRUE" if USE_CACHED_RESULT else "FALSE"}
+    if query.tag:
+        params["QUERY_TAG"] = query.tag
+    return params
+
+def query_failure(message: str, permanent: bool) -> CachedFailure:
+    ttl = QUERY_MISSING_TTL_SECONDS if permanent else QUERY_ERROR_TTL_SECONDS
+    return CachedFailure(message, ttl=ttl, permanent=permanent)
+
+@cached(query_cache, refresh_after=lambda query: queries.refresh_seconds(query.cache_key))
+def execute_query(query: queries.Query) -> pd.DataFrame:
+    if not sf.available:
+        raise query_failure(f"Snowflake connector unavailable: {sf.import_error or 'import failed'}", permanent=True)
+    warehouse = warehouse_for(query.query_class)
+    conn = connect(warehouse)
     if conn is None:
-        record_data_error(scope, "Snowflake connection unavailable.")
-        return pd.DataFrame()
-    cur = None
+        # connect() already made its attempt; a failed login is retried once the
+        # negative entry expires rather than in a tight loop here.
+        raise query_failure("Snowflake connection unavailable.", permanent=False)
+
+    def attempt() -> pd.DataFrame:
+        cur = None
+        try:
+            live_conn = connect(warehouse)
+            if live_conn is None:
+                raise ConnectionError("Snowflake connection lost.")
+            cur = live_conn.cursor()
+            cur.execute(query.sql, query.params or None, _statement_params=statement_params(query))
+            cols = [c[0] for c in cur.description] if cur.description else []
+            rows = cur.fetchall()
+            return pd.DataFrame(rows, columns=cols)
+        finally:
+            try:
+                if cur is not None:
+                    cur.close()
+            except Exception:
+                pass
+
     try:
-        cur = conn.cursor()
-        cur.execute(sql)
-        cols = [c[0] for c in cur.description] if cur.description else []
-        rows = cur.fetchall()
-        return pd.DataFrame(rows, columns=cols)
+        return retry_with_backoff(
+            attempt,
+            attempts=QUERY_RETRY_ATTEMPTS,
+            base_delay=QUERY_RETRY_BASE_SECONDS,
+            max_delay=QUERY_RETRY_MAX_SECONDS,
+        )
     except Exception as exc:
-        record_data_error(scope, f"{type(exc).__name__}: {exc}")
+        raise query_failure(f"{type(exc).__name__}: {exc}", permanent=is_permanent_error(exc)) from exc
+
+def run_query(query: queries.Query) -> pd.DataFrame:
+    try:
+        return execute_query(query)
+    except CachedFailure as exc:
+        note_failure(exc.ttl)
+        record_data_error(query.cache_key or "snowflake_query", exc.message)
         return pd.DataFrame()
-    finally:
-        try:
-            if cur is not None:
-                cur.close()
-        except Exception:
-            pass
 
 def table_exists(database: str, schema: str, table: str) -> bool:
     if not database or not schema or not table:
         return False
-    q = f"""
-        select 1
-        from {database}.information_schema.tables
-        where lower(table_schema) = lower('{schema}')
-          and lower(table_name)   = lower('{table}')
-        limit 1
-    """
+    q = queries.table_exists(database, schema, table)
     try:
-        df = lc(run_query(q, cache_key=f"exists:{database}.{schema}.{table}".lower()))
+        df = lc(run_query(q))
         return not df.empty
     except Exception:
         return False
 
+# Date bounds follow Snowflake's current_date() (the session TIMEZONE), which is
+# what fct_cost_forecast stamps as forecast_run_date; the app server's date can be
+# a day off. It goes through the query cache like any other read, so reruns reuse
+# it and it is re-read in the background every REFRESH_SECONDS["today"].
+def snowflake_today() -> dt.date:
+    try:
+        df = lc(execute_query(queries.current_date()))
+    except CachedFailure:
+        # No session to ask: the mart queries fail the same way and report it.
+        df = pd.DataFrame()
+    if df.empty or "today" not in df.columns:
+        return dt.date.today()
+    return pd.to_datetime(df["today"].iloc[0]).date()
+
 # -------- data loads --------------------------------------------------------
 @st.cache_data(ttl=60, show_spinner=False)
-def load_models(demo: bool, lookback_days: int):
+def load_models(demo: bool, lookback_days: int, today: dt.date):
     cp = get_conn_params()
     db = cp["database"]
     sch = active_schema(demo)
-    lb = max(lookback_days * 2 + 7, 14)
-
-    fct = lc(
-        run_query(
-            f"""
-        select usage_date, warehouse_name, compute_cost, cloud_services_cost,
-               total_cost, idle_cost, _loaded_at
-        from {db}.{sch}.fct_daily_costs
-        where usage_date >= dateadd(day, -{lb}, current_date())
-        order by usage_date
-    """,
-            cache_key=f"fct:{db}.{sch}:{lb}",
-        )
-    )
+    lb = queries.models_lookback_days(lookback_days)
+
+    q = queries.daily_costs(db, sch, lb, today)
+    fct = lc(run_query(q))
     if "usage_date" in fct.columns:
         fct["usage_date"] = pd.to_datetime(fct["usage_date"]).dt.date
     fct = to_float(fct, ["compute_cost", "cloud_services_cost", "total_cost", "idle_cost"])
 
-    dept = lc(
-        run_query(
-            f"""
-        select department, usage_date, total_cost_usd
-        from {db}.{sch}.fct_cost_by_department
-        where usage_date >= dateadd(day, -{lb}, current_date())
-        order by usage_date
-    """,
-            cache_key=f"dept:{db}.{sch}:{lb}",
-        )
-    )
+    q = queries.cost_by_department(db, sch, lb, today)
+    dept = lc(run_query(q))
     if "usage_date" in dept.columns:
         dept["usage_date"] = pd.to_datetime(dept["usage_date"]).dt.date
     dept = to_float(dept, ["total_cost_usd"])
@@ -323,12 +465,8 @@ def load_models(demo: bool, lookback_days: int):
     fresh = pd.DataFrame()
     try:
         if not demo:  # only probe warehouse metering in Live
-            fresh = lc(
-                run_query(
-                    f"select max(END_TIME) as last_end_time from {AU_DB}.{AU_SCHEMA}.WAREHOUSE_METERING_HISTORY",
-                    cache_key=f"fresh:{AU_DB}.{AU_SCHEMA}",
-                )
-            )
+            q = queries.metering_freshness(AU_DB, AU_SCHEMA)
+            fresh = lc(run_query(q))
     except Exception:
         fresh = pd.DataFrame(columns=["last_end_time"])
 
@@ -339,14 +477,10 @@ def load_budget(demo: bool) -> pd.DataFrame:
     cp = get_conn_params()
     db = cp.get("database", "")
     sch = active_schema(demo)
-    if sf is not None and db and sch:
+    if db and sch and sf.available:
         try:
-            live = lc(
-                run_query(
-                    f"select date, department, budget_usd from {db}.{sch}.budget_daily",
-                    cache_key=f"budget:{db}.{sch}",
-                )
-            )
+            q = queries.budget_daily(db, sch)
+            live = lc(run_query(q))
             if not live.empty:
                 live["date"] = pd.to_datetime(live["date"]).dt.date
                 live = to_float(live, ["budget_usd"])
@@ -383,15 +517,11 @@ def load_budget_vs_actual_latest(demo: bool) -> Optional[dt.date]:
     cp = get_conn_params()
     db = cp.get("database", "")
     sch = active_schema(demo)
-    if sf is None or not db or not sch:
+    if not db or not sch or not sf.available:
         return None
     try:
-        latest = lc(
-            run_query(
-                f"select max(usage_date) as usage_date from {db}.{sch}.fct_budget_vs_actual",
-                cache_key=f"bva_latest:{db}.{sch}",
-            )
-        )
+        q = queries.budget_vs_actual_latest(db, sch)
+        latest = lc(run_query(q))
         if not latest.empty and pd.notnull(latest.iloc[0].get("usage_date")):
             return pd.to_datetime(latest.iloc[0]["usage_date"]).date()
     except Exception:
@@ -399,42 +529,24 @@ def load_budget_vs_actual_latest(demo: bool) -> Optional[dt.date]:
     return None
 
 @st.cache_data(ttl=60, show_spinner=False)
-def load_forecast(demo: bool) -> pd.DataFrame:
+def load_forecast(demo: bool, today: dt.date) -> pd.DataFrame:
     cp = get_conn_params()
     db = cp["database"]
     sch = active_schema(demo)
-    df = lc(run_query(
-        f"""
-        select forecast_date, warehouse_name, forecasted_cost_usd,
-               confidence_band_low, confidence_band_high, days_ahead
-        from {db}.{sch}.fct_cost_forecast
-        where forecast_run_date = current_date()
-        order by forecast_date
-        """,
-        cache_key=f"forecast:{db}.{sch}",
-    ))
+    q = queries.cost_forecast(db, sch, today)
+    df = lc(run_query(q))
     if "forecast_date" in df.columns:
         df["forecast_date"] = pd.to_datetime(df["forecast_date"]).dt.date
     df = to_float(df, ["forecasted_cost_usd", "confidence_band_low", "confidence_band_high", "days_ahead"])
     return df
 
 @st.cache_data(ttl=60, show_spinner=False)
-def load_storage_costs(demo: bool, lookback_days: int) -> pd.DataFrame:
+def load_storage_costs(demo: bool, lookback_days: int, today: dt.date) -> pd.DataFrame:
     cp = get_conn_params()
     db = cp["database"]
     sch = active_schema(demo)
-    df = lc(run_query(
-        f"""
-        select usage_date, database_name,
-               total_storage_tb, estimated_storage_cost_usd,
-               estimated_active_cost_usd, estimated_failsafe_cost_usd, estimated_stage_cost_usd,
-               month_to_date_storage_cost as mtd_storage_cost_usd
-        from {db}.{sch}.fct_daily_storage_costs
-        where usage_date >= dateadd(day, -{lookback_days}, current_date())
-        order by usage_date
-        """,
-        cache_key=f"storage:{db}.{sch}:{lookback_days}",
-    ))
+    q = queries.storage_costs(db, sch, lookback_days, today)
+    df = lc(run_query(q))
     if "usage_date" in df.columns:
         df["usage_date"] = pd.to_datetime(df["usage_date"]).dt.date
     df = to_float(df, ["total_storage_tb", "estimated_storage_cost_usd",
@@ -443,23 +555,12 @@ def load_storage_costs(demo: bool, lookback_days: int) -> pd.DataFrame:
     return df
 
 @st.cache_data(ttl=60, show_spinner=False)
-def load_top_spenders(demo: bool, lookback_days: int) -> pd.DataFrame:
+def load_top_spenders(demo: bool, lookback_days: int, today: dt.date) -> pd.DataFrame:
     cp = get_conn_params()
     db = cp["database"]
     sch = active_schema(demo)
-    df = lc(run_query(
-        f"""
-        select usage_date, user_name, primary_warehouse_name,
-               query_count, total_runtime_seconds, gb_scanned,
-               estimated_cost_usd, has_cost_estimate,
-               rank_by_query_count, rank_by_runtime, rank_by_cost,
-               pct_of_daily_query_total
-        from {db}.{sch}.fct_top_spenders
-        where usage_date >= dateadd(day, -{lookback_days}, current_date())
-        order by usage_date desc
-        """,
-        cache_key=f"top_spenders:{db}.{sch}:{lookback_days}",
-    ))
+    q = queries.top_spenders(db, sch, lookback_days, today)
+    df = lc(run_query(q))
     if "usage_date" in df.columns:
         df["usage_date"] = pd.to_datetime(df["usage_date"]).dt.date
     df = to_float(df, ["query_count", "total_runtime_seconds", "gb_scanned",
@@ -467,27 +568,57 @@ def load_top_spenders(demo: bool, lookback_days: int) -> pd.DataFrame:
     return df
 
 @st.cache_data(ttl=60, show_spinner=False)
-def load_total_cost_summary(demo: bool) -> pd.DataFrame:
+def load_active_users(demo: bool, lookback_days: int, today: dt.date) -> pd.DataFrame:
+    cp = get_conn_params()
+    db = cp["database"]
+    sch = active_schema(demo)
+    q = queries.active_users(db, sch, lookback_days, today)
+    df = lc(run_query(q))
+    return to_float(df, ["active_users"])
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_app_query_costs(demo: bool, lookback_days: int, today: dt.date) -> pd.DataFrame:
     cp = get_conn_params()
     db = cp["database"]
     sch = active_schema(demo)
-    df = lc(run_query(
-        f"""
-        select usage_date, cost_category, cost_usd, pct_of_daily_total, mtd_cost_usd
-        from {db}.{sch}.fct_total_cost_summary
-        where usage_date >= date_trunc('month', current_date())
-        order by usage_date, cost_category
-        """,
-        cache_key=f"total_cost:{db}.{sch}",
-    ))
+    q = queries.app_query_costs(db, sch, lookback_days, today)
+    df = lc(run_query(q))
+    if "usage_date" in df.columns:
+        df["usage_date"] = pd.to_datetime(df["usage_date"]).dt.date
+    df = to_float(df, ["query_count", "total_elapsed_seconds", "gb_scanned", "zero_scan_query_count",
+                        "attributed_credits", "attributed_cost_usd"])
+    return df
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_warehouse_utilization(demo: bool) -> pd.DataFrame:
+    cp = get_conn_params()
+    db = cp["database"]
+    sch = active_schema(demo)
+    q = queries.warehouse_utilization(db, sch)
+    df = lc(run_query(q))
+    df = to_float(df, ["avg_credits_per_hour", "total_credits", "idle_cost_usd", "query_count", "active_hours", "active_hour_ratio"])
+    for col in ("day_of_week", "hour_of_day", "days_in_window"):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype(int)
+    return df
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_total_cost_summary(demo: bool, today: dt.date) -> pd.DataFrame:
+    cp = get_conn_params()
+    db = cp["database"]
+    sch = active_schema(demo)
+    q = queries.total_cost_summary(db, sch, today)
+    df = lc(run_query(q))
     if "usage_date" in df.columns:
         df["usage_date"] = pd.to_datetime(df["usage_date"]).dt.date
     df = to_float(df, ["cost_usd", "pct_of_daily_total", "mtd_cost_usd"])
     return df
 
-@st.cache_data(show_spinner=False)
+# Not cached themselves: execute_query caches and refreshes each query, and a
+# second layer on top would refresh from its still-stale entries.
 def load_current_warehouses():
-    df = lc(run_query("show warehouses", cache_key="show_warehouses"))
+    q = queries.show_warehouses()
+    df = lc(run_query(q))
     if df.empty:
         return {}
     name_col = "name" if "name" in df.columns else "NAME"
@@ -510,44 +641,85 @@ def load_current_warehouses():
             out[str(r[name_col]).upper()] = {"auto_suspend": None, "size": None}
     return out
 
-@st.cache_data(show_spinner=False)
 def load_pro_hourly_soft(
     demo: bool,
     days: int,
     credit_threshold: float = 0.05,
     pro_db: Optional[str] = None,
     pro_schema: Optional[str] = None,
+    today: Optional[dt.date] = None,
 ) -> pd.DataFrame:
     cp = get_conn_params()
     db = pro_db or cp["database"]
     sch = pro_schema or active_schema(demo)
-    probe = lc(run_query(f"select * from {db}.{sch}.int_hourly_compute_costs limit 1", cache_key=f"probe_hourly:{db}.{sch}"))
+    q = queries.hourly_probe(db, sch)
+    probe = lc(run_query(q))
     if probe.empty:
         return pd.DataFrame()
     has_size = "warehouse_size" in probe.columns or "WAREHOUSE_SIZE" in probe.columns
-    size_select = "max(warehouse_size) as warehouse_size," if has_size else "null as warehouse_size,"
-
-    q = f"""
-        select
-            warehouse_name,
-            sum(case when is_potentially_idle = true and total_credits_used >= {credit_threshold}
-                     then compute_cost_usd else 0 end) as idle_cost_adj,
-            sum(total_cost_usd)  as total_cost,
-            sum(compute_cost_usd) as compute_cost,
-            count(*) as total_hours,
-            sum(case when queries_executed > 0 then 1 else 0 end) as active_hours,
-            sum(case when queries_executed > 0 then total_credits_used else 0 end) as credits_on_active_hours,
-            {size_select}
-            count(distinct usage_date) as total_days,
-            count(distinct case when queries_executed > 0 then usage_date end) as active_days
-        from {db}.{sch}.int_hourly_compute_costs
-        where usage_date between dateadd(day, -{days-1}, current_date()) and current_date()
-        group by 1
-    """
-    df = lc(run_query(q, cache_key=f"pro_hourly:{db}.{sch}:{days}:{credit_threshold}"))
+    q = queries.pro_hourly(db, sch, days, credit_threshold, has_size, today)
+    df = lc(run_query(q))
     df = to_float(df, ["idle_cost_adj", "total_cost", "compute_cost", "total_hours", "active_hours", "credits_on_active_hours", "total_days", "active_days"])
     return df
 
+# -------- pre-warm ----------------------------------------------------------
+# Streamlit has no process-start hook, so the warm-up starts with the first script
+# run in the process and fills the shared query cache the loaders read through.
+PREWARM_CACHES = env_bool("PREWARM_CACHES", False)
+PREWARM_MODES = [m.strip().lower() for m in os.getenv("PREWARM_MODES", "demo,live").split(",") if m.strip()]
+DEFAULT_WINDOW_DAYS = 30
+
+def prewarm_jobs(modes: List[str], windows: List[int]):
+    cp = conn_params_from_env()
+    db = cp.get("database", "")
+    if not db:
+        return []
+    AU_DB = os.getenv("ACCOUNT_USAGE_DATABASE", "SNOWFLAKE")
+    AU_SCHEMA = os.getenv("ACCOUNT_USAGE_SCHEMA", "ACCOUNT_USAGE")
+    ordered = sorted(set(windows), key=lambda days: (days != DEFAULT_WINDOW_DAYS, days))
+    today = snowflake_today()
+    jobs = {}
+    for mode in modes:
+        if mode not in ("demo", "live"):
+            continue
+        demo = mode == "demo"
+        sch = "DEMO" if demo else (cp.get("schema", "") or "PUBLIC")
+        batch = []
+        for days in ordered:
+            lb = queries.models_lookback_days(days)
+            batch += [
+                queries.daily_costs(db, sch, lb, today),
+                queries.cost_by_department(db, sch, lb, today),
+                queries.storage_costs(db, sch, days, today),
+                queries.top_spenders(db, sch, days, today),
+                queries.active_users(db, sch, days, today),
+                queries.app_query_costs(db, sch, days, today),
+            ]
+        batch += [
+            queries.budget_daily(db, sch),
+            queries.budget_vs_actual_latest(db, sch),
+            queries.cost_forecast(db, sch, today),
+            queries.total_cost_summary(db, sch, today),
+            queries.warehouse_utilization(db, sch),
+        ]
+        if not demo:
+            batch.append(queries.metering_freshness(AU_DB, AU_SCHEMA))
+        for q in batch:
+            jobs.setdefault(q.cache_key, lambda q=q: execute_query(q))
+    return list(jobs.items())
+
+def _start_prewarmer() -> Optional[Prewarmer]:
+    if not sf.available:
+        return None
+    jobs = prewarm_jobs(PREWARM_MODES, WINDOW_PRESETS)
+    if not jobs:
+        return None
+    return Prewarmer(jobs).start()
+
+def prewarmer() -> Optional[Prewarmer]:
+    # Once per process: demo toggles, Retry and "Clear app cache" never start a second warm-up
+    return process_singleton("prewarmer", _start_prewarmer)
+
 # -------- styles ------------------------------------------------------------
 st.markdown(STYLES, unsafe_allow_html=True)
 
@@ -578,9 +750,9 @@ with st.sidebar:
         clear_all_caches()
         st.session_state.last_demo = demo_mode
 
-    window_default = int(st.session_state.get("ui_days_shown", 30))
+    window_default = int(st.session_state.get("ui_days_shown", DEFAULT_WINDOW_DAYS))
     if window_default not in WINDOW_PRESETS:
-        window_default = 30
+        window_default = DEFAULT_WINDOW_DAYS
     days_shown = int(
         st.selectbox(
             "Time window",
@@ -602,7 +774,7 @@ with st.sidebar:
             st.caption("FinOps Pro add-on required before projected idle and right-sizing insights can be enabled.")
         rows_to_show = st.slider("Show up to N rows", 3, 15, 8, 1)
         if st.button("Clear app cache"):
-            clear_all_caches()
+            clear_all_caches(shared=True)
             st.success("Caches cleared.")
         advanced_freshness_slot = st.empty()
         advanced_last_build_slot = st.empty()
@@ -648,14 +820,20 @@ def critical_demo_data_issues(fct_df: pd.DataFrame, dept_df: pd.DataFrame) -> Li
     return issues
 
 # -------- data & metrics ----------------------------------------------------
+prewarm = prewarmer() if PREWARM_CACHES else None
 reset_data_errors()
-fct, dept, fresh = load_models(demo_mode, days_shown)
+today = snowflake_today()
+fct, dept, fresh = load_models(demo_mode, days_shown, today)
 budget = load_budget(demo_mode)
 bva_latest = load_budget_vs_actual_latest(demo_mode)
-forecast_df = load_forecast(demo_mode)
-storage_df = load_storage_costs(demo_mode, days_shown)
-top_spenders_df = load_top_spenders(demo_mode, days_shown)
-total_cost_df = load_total_cost_summary(demo_mode)
+forecast_df = load_forecast(demo_mode, today)
+storage_df = load_storage_costs(demo_mode, days_shown, today)
+top_spenders_df = load_top_spenders(demo_mode, days_shown, today)
+active_users_df = load_active_users(demo_mode, days_shown, today)
+total_cost_df = load_total_cost_summary(demo_mode, today)
+app_costs_df = load_app_query_costs(demo_mode, days_shown, today)
+utilization_df = load_warehouse_utilization(demo_mode)
+startup_profile.mark("data loads")
 
 render_page_header(demo_mode)
 demo_issues = critical_demo_data_issues(fct, dept) if demo_mode else []
@@ -668,7 +846,6 @@ if demo_issues:
         clear_all_caches()
         st.rerun()
 
-today = dt.date.today()
 first_day = today.replace(day=1)
 dim = dim_count(today)
 elapsed = (today - first_day).days + 1
@@ -725,7 +902,7 @@ pro_schema = PRO_SCHEMA or active_schema(demo_mode)
 pro_connected = table_exists(pro_db, pro_schema, "INT_HOURLY_COMPUTE_COSTS")
 
 pro_hourly = (
-    load_pro_hourly_soft(demo_mode, days_shown, pro_db=pro_db, pro_schema=pro_schema)
+    load_pro_hourly_soft(demo_mode, days_shown, pro_db=pro_db, pro_schema=pro_schema, today=today)
     if (PRO_PACK_FLAG and enable_pro and pro_connected)
     else pd.DataFrame()
 )
@@ -888,7 +1065,7 @@ with hero_cols[1]:
     donut_section = section_open("Compute vs. Storage")
     with donut_section:
         donut_total = mtd_total + storage_mtd_total
-        if PLOTLY and donut_total > 0:
+        if donut_total > 0 and go.available:
             fig_tc = go.Figure(
                 data=[
                     go.Pie(
@@ -931,7 +1108,7 @@ st.markdown(
 st.markdown('<div class="spendscope-gap"></div>', unsafe_allow_html=True)
 
 # -------- Cost Forecast Chart (v3.0.0) -------------------------------------
-if not forecast_df.empty and "forecast_date" in forecast_df.columns and PLOTLY:
+if not forecast_df.empty and "forecast_date" in forecast_df.columns and go.available:
     forecast_section = section_open("Cost Forecast")
     with forecast_section:
         fc_agg = forecast_df.groupby("forecast_date", as_index=False).agg(
@@ -1013,7 +1190,7 @@ if not storage_df.empty and "estimated_storage_cost_usd" in storage_df.columns:
         with left_s:
             if storage_window_total <= 0:
                 st.info("No nonzero storage cost found in the selected window. Small fresh accounts can legitimately round to $0 at the current TB/month rate.")
-            elif PLOTLY:
+            elif go.available:
                 stor_daily = storage_df.groupby("usage_date", as_index=False).agg(
                     active=("estimated_active_cost_usd", "sum"),
                     failsafe=("estimated_failsafe_cost_usd", "sum"),
@@ -1109,6 +1286,12 @@ if not top_spenders_df.empty and "user_name" in top_spenders_df.columns:
             display_cols["est_cost_fmt"] = "Est. Cost"
         ts_display = ts_agg.rename(columns=display_cols)
         st.dataframe(ts_display[list(display_cols.values())], hide_index=True, width="stretch")
+        window_users = active_users_df["active_users"].iloc[0] if "active_users" in active_users_df.columns and not active_users_df.empty else None
+        if pd.notnull(window_users):
+            st.caption(
+                f"≈{int(round(window_users)):,} distinct users ran queries in the last {days_shown} days "
+                "across all warehouses (estimated by merging daily HLL sketches)."
+            )
         if not has_cost:
             st.caption("Cost estimates require Pro pack. Showing volume metrics only.")
     section_close()
@@ -1122,7 +1305,7 @@ with department_section:
     if not dept.empty and "usage_date" in dept.columns and deps:
         dcur = dept[(dept["usage_date"] >= today - dt.timedelta(days=days_shown - 1)) & (dept["usage_date"] < today)].copy()
         plot_df = dcur.rename(columns={"usage_date": "date", "total_cost_usd": "usd"}).copy()
-        if PLOTLY and not plot_df.empty:
+        if not plot_df.empty and go.available:
             totals = plot_df.groupby("department", as_index=False)["usd"].sum().sort_values("usd", ascending=False)
             primary_department = str(totals.iloc[0]["department"])
             fig = go.Figure()
@@ -1247,6 +1430,69 @@ with R:
 
 st.markdown('<div class="spendscope-gap"></div>', unsafe_allow_html=True)
 
+# -------- Warehouse Utilization ---------------------------------------------
+if not utilization_df.empty and "hour_of_day" in utilization_df.columns and go.available:
+    utilization_section = section_open("Warehouse Utilization")
+    with utilization_section:
+        ud = utilization_df.copy()
+        pick_l, pick_r = st.columns([2, 1], gap="large")
+        with pick_l:
+            wh_options = ["All warehouses"] + sorted(ud["warehouse_name"].dropna().unique().tolist())
+            wh_choice = st.selectbox("Warehouse", wh_options, index=0, key="utilization_warehouse")
+        with pick_r:
+            metric_choice = st.radio("Show", ["Credits / hour", "Active-hour ratio"], horizontal=True, key="utilization_metric")
+        warehouse_count = max(ud["warehouse_name"].nunique(), 1)
+        all_warehouses = wh_choice == "All warehouses"
+        if not all_warehouses:
+            ud = ud[ud["warehouse_name"] == wh_choice]
+            warehouse_count = 1
+        if metric_choice == "Credits / hour":
+            grid = ud.groupby(["day_of_week", "hour_of_day"])["avg_credits_per_hour"].sum()
+            hover = "%{y} %{x}:00 · %{z:,.2f} credits/hour<extra></extra>"
+            scale = [[0, "#0d1117"], [1, "#2dd4bf"]]
+        else:
+            # The mart has no row for a warehouse's unmetered slots, so average over
+            # every warehouse's hours rather than the rows present.
+            cells = ud.groupby(["day_of_week", "hour_of_day"]).agg(
+                active_hours=("active_hours", "sum"), days_in_window=("days_in_window", "max")
+            )
+            grid = cells["active_hours"] / (cells["days_in_window"] * warehouse_count).replace(0, np.nan)
+            hover = "%{y} %{x}:00 · active %{z:.0%}<extra></extra>"
+            scale = [[0, "#0d1117"], [1, "#f59e0b"]]
+        weekdays = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+        matrix = grid.unstack("hour_of_day").reindex(index=range(1, 8), columns=range(24)).fillna(0.0)
+        fig_u = go.Figure(
+            go.Heatmap(
+                z=matrix.values,
+                x=list(range(24)),
+                y=weekdays,
+                colorscale=scale,
+                hovertemplate=hover,
+                showscale=False,
+            )
+        )
+        apply_chart_theme(fig_u)
+        fig_u.update_layout(height=300)
+        fig_u.update_xaxes(dtick=2, ticksuffix=":00")
+        fig_u.update_yaxes(autorange="reversed")
+        st.plotly_chart(fig_u, use_container_width=True, config={"displayModeBar": False})
+        window_start = ud["window_start_date"].min() if "window_start_date" in ud.columns else None
+        window_end = ud["window_end_date"].max() if "window_end_date" in ud.columns else None
+        span = f" from {window_start} to {window_end}" if window_start is not None and window_end is not None else ""
+        if metric_choice == "Credits / hour":
+            st.caption(
+                f"Average credits billed in each weekday and hour slot{span}{', summed across warehouses' if all_warehouses else ''}. "
+                "Dark cells used few or no credits; compare bright cells with the active-hour ratio to spot idle spend."
+            )
+        else:
+            st.caption(
+                f"Share of hours in each weekday and hour slot with at least one query{span}{', over every warehouse' if all_warehouses else ''}; "
+                "hours a warehouse was not running count as inactive. "
+                "Slots that bill credits but show a low ratio are auto-suspend candidates."
+            )
+    section_close()
+    st.markdown('<div class="spendscope-gap"></div>', unsafe_allow_html=True)
+
 # -------- Pro section -------------------------------------------------------
 show_for_export = pd.DataFrame()
 if PRO_PACK_FLAG:
@@ -1345,6 +1591,46 @@ if PRO_PACK_FLAG:
     section_close()
     st.markdown('<div class="spendscope-gap"></div>', unsafe_allow_html=True)
 
+# -------- Dashboard Footprint -----------------------------------------------
+if not app_costs_df.empty and "query_tag" in app_costs_df.columns:
+    footprint_section = section_open("Dashboard Footprint")
+    with footprint_section:
+        ac = app_costs_df.copy()
+        app_queries_total = int(ac["query_count"].sum())
+        app_cost_total = float(ac["attributed_cost_usd"].sum())
+        zero_scan_share = float(ac["zero_scan_query_count"].sum()) / app_queries_total if app_queries_total else 0.0
+        left_a, right_a = st.columns([2, 1], gap="large")
+        with left_a:
+            by_tag = ac.groupby("query_tag", as_index=False).agg(
+                queries=("query_count", "sum"),
+                elapsed_min=("total_elapsed_seconds", lambda x: round(x.sum() / 60.0, 1)),
+                gb_scanned=("gb_scanned", "sum"),
+                credits=("attributed_credits", "sum"),
+                cost=("attributed_cost_usd", "sum"),
+            ).sort_values("cost", ascending=False).head(rows_to_show)
+            by_tag["queries"] = by_tag["queries"].astype(int)
+            by_tag["gb_scanned"] = by_tag["gb_scanned"].round(2)
+            by_tag["credits"] = by_tag["credits"].round(3)
+            by_tag["cost"] = by_tag["cost"].apply(lambda x: fmt_usd(float(x), 2))
+            st.dataframe(
+                by_tag.rename(columns={
+                    "query_tag": "Query tag",
+                    "queries": "Queries",
+                    "elapsed_min": "Elapsed (min)",
+                    "gb_scanned": "GB Scanned",
+                    "credits": "Credits",
+                    "cost": "Est. Cost",
+                }),
+                hide_index=True,
+                width="stretch",
+            )
+        with right_a:
+            kpi("App cost (window)", fmt_usd(app_cost_total, 2), f"{app_queries_total:,} queries over {days_shown} days")
+            kpi("Zero-scan share", f"{zero_scan_share:.0%}", "Queries served without scanning (result cache)")
+        st.caption("Queries tagged spendscope:* by this app. Credits are attributed by each query's share of its warehouse-hour runtime.")
+    section_close()
+    st.markdown('<div class="spendscope-gap"></div>', unsafe_allow_html=True)
+
 # -------- Insights CSV ------------------------------------------------------
 def build_insights_csv() -> pd.DataFrame:
     expected = [
@@ -1451,8 +1737,13 @@ diag_rows.append(diag_entry("fct_daily_storage_costs", storage_df, "usage_date")
 diag_rows.append(diag_entry("fct_cost_forecast", forecast_df, "forecast_date"))
 diag_rows.append(diag_entry("fct_total_cost_summary", total_cost_df, "usage_date"))
 diag_rows.append(diag_entry("fct_top_spenders", top_spenders_df, "usage_date"))
+diag_rows.append(diag_entry("fct_app_query_costs", app_costs_df, "usage_date"))
+diag_rows.append(diag_entry("active_users", active_users_df, "last_usage_date"))
+diag_rows.append(diag_entry("fct_warehouse_hourly_utilization", utilization_df, "window_end_date"))
 diag_df = pd.DataFrame(diag_rows)
 
+startup_profile.mark("render")
+
 exports_section = section_open("Exports & Diagnostics")
 with exports_section:
     if not insights_df.empty:
@@ -1474,6 +1765,34 @@ with exports_section:
                 "Latest usage_date": st.column_config.TextColumn(width="medium"),
             },
         )
+        cache_stats = query_cache().stats()
+        st.caption(
+            f"Query cache: {cache_stats['entries']}/{cache_stats['max_entries']} entries \u2022 "
+            f"{cache_stats['bytes'] / 1024 / 1024:.1f}/{cache_stats['max_bytes'] / 1024 / 1024:.0f} MB \u2022 "
+            f"{cache_stats['hits']} hits \u2022 {cache_stats['misses']} misses \u2022 "
+            f"{cache_stats['coalesced']} coalesced ({cache_stats['flight_timeouts']} timed out) \u2022 {cache_stats['evictions']} evictions \u2022 "
+            f"{cache_stats['negative_entries']} failed queries held for retry \u2022 "
+            f"{cache_stats['stale_hits']} stale serves \u2022 {cache_stats['refreshes']} background refreshes "
+            f"({cache_stats['refresh_failures']} failed, {cache_stats['refreshing']} running)"
+        )
+        routing = {cls: warehouse_for(cls) for cls in queries.QUERY_CLASS_NAMES}
+        if set(routing.values()) != {get_conn_params().get("warehouse", "")}:
+            st.caption("Warehouses: " + " \u2022 ".join(f"{cls} `{wh or '-'}`" for cls, wh in routing.items()))
+        if cache_stats["shared_backend"] != "none":
+            st.caption(
+                f"Shared cache ({cache_stats['shared_backend']}): {cache_stats['shared_hits']} hits \u2022 "
+                f"{cache_stats['shared_misses']} misses \u2022 {cache_stats['shared_errors']} errors"
+            )
+        if prewarm is not None:
+            warm = prewarm.progress()
+            state = "done" if warm["finished"] else f"running ({warm['current'] or 'starting'})"
+            st.caption(
+                f"Pre-warm: {warm['done']}/{warm['total']} queries \u2022 {warm['failed']} failed \u2022 "
+                f"{warm['elapsed_s']:.1f}s \u2022 {state}"
+            )
+        if DEV_MODE:
+            st.markdown("**Startup profile**")
+            st.dataframe(pd.DataFrame(startup_profile.report()), hide_index=True, width="stretch")
 section_close()
 
 # -------- Freshness (sidebar microcopy) ------------------------------------
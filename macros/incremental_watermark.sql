@@ -0,0 +1,20 @@
+{#
+  Evaluates an aggregate over {{ this }} once at run time and returns it as a
+  quoted literal, e.g. incremental_watermark("dateadd('hour', -1, max(usage_hour_ntz))")
+  -> '2026-10-18 22:00:00'. Predicates such as END_TIME >= <literal> then
+  compare the raw source column to a constant, which Snowflake can prune on;
+  a correlated (select max(...) from this) subquery cannot.
+  Returns none on full builds, at parse time, or when the table is empty.
+#}
+
+{% macro incremental_watermark(expression, format='YYYY-MM-DD HH24:MI:SS') -%}
+  {% if not (execute and is_incremental()) %}
+    {{ return(none) }}
+  {% endif %}
+  {% set result = run_query("select to_char(" ~ expression ~ ", '" ~ format ~ "') from " ~ this) %}
+  {% set value = result.columns[0].values()[0] if result and result.rows | length > 0 else none %}
+  {% if value is none %}
+    {{ return(none) }}
+  {% endif %}
+  {{ return("'" ~ value ~ "'") }}
+{%- endmacro %}
@@ -0,0 +1,69 @@
+{#
+  Run-once schema migrations for incremental models.
+
+  A model declares its current shape in config(meta={'schema_version': N}) and
+  calls apply_schema_migrations() with a list of versioned migrations:
+
+    {% do apply_schema_migrations([
+        {'version': 1, 'description': '...', 'statements': [
+            {'sql': 'alter table ... add column if not exists ...'},
+            {'sql': 'update ...', 'requires': ['hour_start']},
+        ]},
+    ]) %}
+
+  Applied versions live in SPENDSCOPE_SCHEMA_MIGRATIONS next to the model. On
+  an incremental run only versions above the recorded one run, each once; a
+  statement with `requires` is skipped when the table lacks those columns. The
+  record_schema_version() post-hook stamps the table at schema_version after a
+  successful build, so fresh and full-refresh builds never replay migrations.
+  Steady-state runs cost one small lookup instead of full-table UPDATEs.
+#}
+
+{% macro schema_migrations_relation(relation) -%}
+  {{ return(api.Relation.create(database=relation.database, schema=relation.schema, identifier='SPENDSCOPE_SCHEMA_MIGRATIONS')) }}
+{%- endmacro %}
+
+{% macro apply_schema_migrations(migrations) -%}
+  {# Only mutate tables when the model is actually being built, never on compile/docs #}
+  {% if not execute or flags.WHICH not in ['run', 'build'] %}
+    {{ return(none) }}
+  {% endif %}
+
+  {% set state = schema_migrations_relation(this) %}
+  {% do run_query('create table if not exists ' ~ state ~ ' (model_name varchar, version integer, description varchar, applied_at timestamp_ntz)') %}
+  {% if not is_incremental() %}
+    {{ return(none) }}
+  {% endif %}
+
+  {% set model_name = this.identifier | lower %}
+  {% set applied = run_query("select coalesce(max(version), 0) from " ~ state ~ " where model_name = '" ~ model_name ~ "'") %}
+  {% set applied_version = applied.columns[0].values()[0] | int %}
+
+  {% for migration in migrations | sort(attribute='version') if migration.version > applied_version %}
+    {% for statement in migration.statements %}
+      {% set missing = [] %}
+      {% if statement.requires %}
+        {% set column_names = adapter.get_columns_in_relation(this) | map(attribute='name') | map('lower') | list %}
+        {% set missing = statement.requires | reject('in', column_names) | list %}
+      {% endif %}
+      {% if missing | length == 0 %}
+        {% do run_query(statement.sql) %}
+      {% endif %}
+    {% endfor %}
+    {% do run_query("insert into " ~ state ~ " (model_name, version, description, applied_at) select '" ~ model_name ~ "', " ~ migration.version ~ ", '" ~ migration.description | replace("'", "''") ~ "', current_timestamp()::timestamp_ntz") %}
+    {% do log('Applied schema migration ' ~ model_name ~ ' v' ~ migration.version ~ ': ' ~ migration.description, info=true) %}
+  {% endfor %}
+{%- endmacro %}
+
+{% macro record_schema_version() -%}
+  {% set version = (config.get('meta') or {}).get('schema_version', 0) | int %}
+  {% set state = schema_migrations_relation(this) %}
+  {% set model_name = this.identifier | lower %}
+  insert into {{ state }} (model_name, version, description, applied_at)
+  select '{{ model_name }}', {{ version }}, 'baseline: built at schema_version {{ version }}', current_timestamp()::timestamp_ntz
+  where not exists (
+      select 1 from {{ state }}
+      where model_name = '{{ model_name }}'
+        and version >= {{ version }}
+  )
+{%- endmacro %}
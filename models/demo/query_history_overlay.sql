@@ -18,6 +18,7 @@ with base as (
         QUERY_TYPE::varchar          as QUERY_TYPE,
         DATABASE_NAME::varchar       as DATABASE_NAME,
         SCHEMA_NAME::varchar         as SCHEMA_NAME,
+        QUERY_TAG::varchar           as QUERY_TAG,
         EXECUTION_STATUS::varchar    as EXECUTION_STATUS,
         BYTES_SCANNED::number        as BYTES_SCANNED,
         ROWS_PRODUCED::number        as ROWS_PRODUCED,
@@ -2,95 +2,75 @@
     config(
         materialized='incremental',
         unique_key='cost_hour_key',
-        on_schema_change='sync_all_columns'
+        on_schema_change='sync_all_columns',
+        cluster_by=['usage_date', 'warehouse_name'],
+        meta={'schema_version': 2},
+        post_hook="{{ record_schema_version() }}"
     )
 }}
 
-{% set hourly_costs_watermark_column = 'usage_hour_ntz' %}
-{% set existing_column_names = [] %}
-{% if is_incremental() and execute %}
-  {% set existing_relation = adapter.get_relation(database=this.database, schema=this.schema, identifier=this.identifier) %}
-  {% if existing_relation %}
-    {% set existing_columns = adapter.get_columns_in_relation(existing_relation) %}
-    {% for col in existing_columns %}
-      {% do existing_column_names.append(col.name | lower) %}
-    {% endfor %}
-
-    {% if 'usage_hour_ntz' not in existing_column_names %}
-      {% do run_query('alter table ' ~ existing_relation ~ ' add column usage_hour_ntz timestamp_ntz') %}
-      {% do existing_column_names.append('usage_hour_ntz') %}
-    {% endif %}
-    {% if 'warehouse_id' not in existing_column_names %}
-      {% do run_query('alter table ' ~ existing_relation ~ ' add column warehouse_id number') %}
-      {% do existing_column_names.append('warehouse_id') %}
-    {% endif %}
-
-    {% if 'hour_start' in existing_column_names %}
-      {% set backfill_usage_sql %}
-        update {{ existing_relation }}
-        set usage_hour_ntz = coalesce(usage_hour_ntz, date_trunc('hour', hour_start::timestamp_ntz))
-        where usage_hour_ntz is null
-      {% endset %}
-      {% do run_query(backfill_usage_sql) %}
-    {% endif %}
-
-    {% if 'warehouse_id' in existing_column_names %}
-      {% set backfill_wh_sql %}
-        update {{ existing_relation }} as target
-        set warehouse_id = src.warehouse_id
-        from {{ ref('stg_warehouse_metering') }} as src
-        where target.warehouse_id is null
-          and target.warehouse_name = src.warehouse_name
-          and coalesce(target.usage_hour_ntz, date_trunc('hour', target.hour_start::timestamp_ntz)) = coalesce(src.usage_hour_ntz, date_trunc('hour', src.hour_end::timestamp_ntz))
-      {% endset %}
-      {% do run_query(backfill_wh_sql) %}
-    {% endif %}
-
-    {% if 'usage_hour_ntz' in existing_column_names and 'warehouse_id' in existing_column_names %}
-      {% set sync_key_sql %}
-        update {{ existing_relation }} as target
-        set cost_hour_key = {{ dbt_utils.generate_surrogate_key(['target.warehouse_id', 'target.usage_hour_ntz']) }}
-        where target.usage_hour_ntz is not null
-          and target.warehouse_id is not null
-      {% endset %}
-      {% do run_query(sync_key_sql) %}
-    {% endif %}
-
-    {% if 'usage_hour_ntz' in existing_column_names %}
-      {% set hourly_costs_watermark_column = 'usage_hour_ntz' %}
-    {% elif 'hour_start' in existing_column_names %}
-      {% set hourly_costs_watermark_column = 'hour_start' %}
-    {% else %}
-      {% set hourly_costs_watermark_column = none %}
-    {% endif %}
-  {% else %}
-    {% set hourly_costs_watermark_column = none %}
-  {% endif %}
-{% endif %}
+{# Run-once upgrades for tables built before usage_hour_ntz / warehouse_id keys and users_hll (see macros/schema_migrations.sql) #}
+{% set add_usage_hour_sql %}
+  alter table {{ this }} add column if not exists usage_hour_ntz timestamp_ntz
+{% endset %}
+{% set add_warehouse_id_sql %}
+  alter table {{ this }} add column if not exists warehouse_id number
+{% endset %}
+{% set backfill_usage_sql %}
+  update {{ this }}
+  set usage_hour_ntz = date_trunc('hour', hour_start::timestamp_ntz)
+  where usage_hour_ntz is null
+{% endset %}
+{% set backfill_wh_sql %}
+  update {{ this }} as target
+  set warehouse_id = src.warehouse_id
+  from {{ ref('stg_warehouse_metering') }} as src
+  where target.warehouse_id is null
+    and target.warehouse_name = src.warehouse_name
+    and target.usage_hour_ntz = src.usage_hour_ntz
+{% endset %}
+{% set sync_key_sql %}
+  update {{ this }} as target
+  set cost_hour_key = {{ dbt_utils.generate_surrogate_key(['target.warehouse_id', 'target.usage_hour_ntz']) }}
+  where target.usage_hour_ntz is not null
+    and target.warehouse_id is not null
+{% endset %}
+{% set add_users_hll_sql %}
+  alter table {{ this }} add column if not exists users_hll binary
+{% endset %}
+{% set backfill_users_hll_sql %}
+  update {{ this }} as target
+  set users_hll = src.users_hll
+  from (
+      select warehouse_name, usage_hour_ntz, hll_accumulate(user_name) as users_hll
+      from {{ ref('stg_query_history') }}
+      group by 1, 2
+  ) as src
+  where target.users_hll is null
+    and target.warehouse_name = src.warehouse_name
+    and target.usage_hour_ntz = src.usage_hour_ntz
+{% endset %}
+{% do apply_schema_migrations([
+    {'version': 1, 'description': 'add usage_hour_ntz and warehouse_id, rekey cost_hour_key', 'statements': [
+        {'sql': add_usage_hour_sql},
+        {'sql': add_warehouse_id_sql},
+        {'sql': backfill_usage_sql, 'requires': ['hour_start']},
+        {'sql': backfill_wh_sql},
+        {'sql': sync_key_sql},
+    ]},
+    {'version': 2, 'description': 'add and backfill users_hll sketches', 'statements': [
+        {'sql': add_users_hll_sql},
+        {'sql': backfill_users_hll_sql},
+    ]},
+]) %}
+
+{% set hour_floor = incremental_watermark("dateadd('hour', -1, max(usage_hour_ntz))") %}
 
 with metering as (
     select *
     from {{ ref('stg_warehouse_metering') }}
-    {% if is_incremental() %}
-        {% if hourly_costs_watermark_column == 'usage_hour_ntz' %}
-            where usage_hour_ntz >= (
-                select coalesce(
-                    dateadd('hour', -1, max(usage_hour_ntz)),
-                    '1970-01-01'::timestamp_ntz
-                )
-                from {{ this }}
-            )
-        {% elif hourly_costs_watermark_column == 'hour_start' %}
-            where usage_hour_ntz >= (
-                select coalesce(
-                    dateadd('hour', -1, max(hour_start::timestamp_ntz)),
-                    '1970-01-01'::timestamp_ntz
-                )
-                from {{ this }}
-            )
-        {% else %}
-            where usage_hour_ntz >= '1970-01-01'::timestamp_ntz
-        {% endif %}
+    {% if hour_floor is not none %}
+        where usage_hour_ntz >= {{ hour_floor }}
     {% endif %}
 ),
 
@@ -101,28 +81,16 @@ queries as (
         count(*)                         as query_count,
         sum(total_elapsed_seconds)       as total_runtime_seconds,
         sum(gb_scanned)                  as total_gb_scanned,
-        count(distinct user_name)        as unique_users
-    from {{ ref('stg_query_history') }}
-    {% if is_incremental() %}
-        {% if hourly_costs_watermark_column == 'usage_hour_ntz' %}
-            where usage_hour_ntz >= (
-                select coalesce(
-                    dateadd('hour', -1, max(usage_hour_ntz)),
-                    '1970-01-01'::timestamp_ntz
-                )
-                from {{ this }}
-            )
-        {% elif hourly_costs_watermark_column == 'hour_start' %}
-            where usage_hour_ntz >= (
-                select coalesce(
-                    dateadd('hour', -1, max(hour_start::timestamp_ntz)),
-                    '1970-01-01'::timestamp_ntz
-                )
-                from {{ this }}
-            )
+        -- HLL state of the hour's users; merged with hll_combine for daily/weekly/window counts
+        hll_accumulate(user_name)        as users_hll,
+        {% if var('approx_distinct_users', false) %}
+        hll_estimate(hll_accumulate(user_name)) as unique_users
         {% else %}
-            where usage_hour_ntz >= '1970-01-01'::timestamp_ntz
+        count(distinct user_name)        as unique_users
         {% endif %}
+    from {{ ref('stg_query_history') }}
+    {% if hour_floor is not none %}
+        where usage_hour_ntz >= {{ hour_floor }}
     {% endif %}
     group by 1, 2
 ),
@@ -147,6 +115,7 @@ hourly_costs as (
         coalesce(q.total_runtime_seconds, 0) as total_runtime_seconds,
         coalesce(q.total_gb_scanned, 0)      as gb_scanned,
         coalesce(q.unique_users, 0)          as unique_users,
+        q.users_hll,
 
         -- Efficiency metrics
         case
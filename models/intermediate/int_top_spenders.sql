@@ -1,6 +1,8 @@
 {{
     config(
-        materialized='table'
+        materialized='incremental',
+        incremental_strategy='delete+insert',
+        unique_key='usage_date'
     )
 }}
 
@@ -9,6 +11,8 @@
   Aggregates query activity to user x role x database x warehouse x day.
   In Pro mode, joins int_query_cost_attribution for estimated per-user cost.
   In Starter mode, cost columns are null; volume metrics are still available.
+  Incremental runs rebuild whole days from the last `top_spenders_restatement_days`
+  days before the latest loaded usage_date and replace them (delete+insert).
 #}
 
 with query_base as (
@@ -25,6 +29,15 @@ with query_base as (
         rows_produced,
         runtime_category
     from {{ ref('stg_query_history') }}
+    {% if is_incremental() %}
+    where usage_date >= (
+        select coalesce(
+            dateadd('day', -{{ var('top_spenders_restatement_days') }}, max(usage_date)),
+            '1970-01-01'::date
+        )
+        from {{ this }}
+    )
+    {% endif %}
 
 ),
 
@@ -0,0 +1,78 @@
+{{
+    config(
+        materialized='table'
+    )
+}}
+
+{#
+  fct_app_query_costs
+  What the Spendscope dashboard itself costs to run.
+  Grain: query_tag x usage_date, restricted to queries tagged '<app_query_tag_prefix>:*'.
+  Credits are attributed from int_hourly_compute_costs by each query's share of
+  the warehouse-hour's total runtime, the same basis as the Pro attribution.
+#}
+
+with app_queries as (
+
+    select
+        usage_date,
+        usage_hour_ntz,
+        warehouse_name,
+        query_tag,
+        query_id,
+        total_elapsed_seconds,
+        gb_scanned
+    from {{ ref('stg_query_history') }}
+    where query_tag like '{{ var("app_query_tag_prefix") }}:%'
+
+),
+
+attributed as (
+
+    select
+        q.usage_date,
+        q.query_tag,
+        q.warehouse_name,
+        q.query_id,
+        q.total_elapsed_seconds,
+        q.gb_scanned,
+        case
+            when h.total_runtime_seconds > 0
+            then h.total_credits_used * q.total_elapsed_seconds / h.total_runtime_seconds
+            else 0
+        end                                     as attributed_credits,
+        case
+            when h.total_runtime_seconds > 0
+            then h.total_cost_usd * q.total_elapsed_seconds / h.total_runtime_seconds
+            else 0
+        end                                     as attributed_cost_usd
+    from app_queries q
+    left join {{ ref('int_hourly_compute_costs') }} h
+        on q.warehouse_name = h.warehouse_name
+        and q.usage_hour_ntz = h.usage_hour_ntz
+
+),
+
+daily as (
+
+    select
+        {{ dbt_utils.generate_surrogate_key(['query_tag', 'usage_date']) }}
+                                                as app_query_cost_id,
+        usage_date,
+        query_tag,
+        count(query_id)                         as query_count,
+        count(distinct warehouse_name)          as warehouse_count,
+        sum(total_elapsed_seconds)              as total_elapsed_seconds,
+        sum(gb_scanned)                         as gb_scanned,
+        -- Result-cache hits scan nothing; their share tracks cache effectiveness
+        sum(case when gb_scanned = 0 then 1 else 0 end)
+                                                as zero_scan_query_count,
+        sum(attributed_credits)                 as attributed_credits,
+        sum(attributed_cost_usd)                as attributed_cost_usd
+    from attributed
+    group by usage_date, query_tag
+
+)
+
+select * from daily
+order by usage_date, query_tag
@@ -1,6 +1,9 @@
 {{
     config(
-        materialized='table'
+        materialized='incremental',
+        incremental_strategy='delete+insert',
+        unique_key='forecast_run_date',
+        full_refresh=false
     )
 }}
 
@@ -9,6 +12,10 @@
   Projects warehouse-level daily cost 30 days into the future.
   Methodology: rolling average + linear trend slope + day-of-week seasonality.
   Confidence bands widen with forecast horizon (1 stddev * sqrt(days_ahead)).
+  Each run appends (or, on a same-day rerun, replaces) the forecast_run_date =
+  current_date() batch, so past forecasts stay available for
+  fct_forecast_accuracy. full_refresh=false keeps that history through
+  `--full-refresh`.
 #}
 
 with actuals as (
@@ -1,10 +1,84 @@
 {{
     config(
-        materialized='table'
+        materialized='incremental',
+        incremental_strategy='merge',
+        unique_key='daily_cost_key',
+        on_schema_change='append_new_columns',
+        cluster_by=['usage_date', 'warehouse_name'],
+        meta={'schema_version': 1},
+        post_hook="{{ record_schema_version() }}"
     )
 }}
 
-with compute_costs as (
+{#
+  Incremental runs re-aggregate only the last `daily_costs_restatement_days`
+  days (ACCOUNT_USAGE metering can land hours late) and merge them on
+  daily_cost_key. Window columns for those days read their preceding rows
+  (the last 7 per warehouse, and the rest of the month) from this table, so
+  they match a full rebuild.
+
+  users_hll merges the hourly HLL sketches into one per warehouse-day, so
+  weekly and window-level distinct users (fct_weekly_active_users, the app)
+  combine these rows instead of rescanning query history. daily_unique_users
+  is an exact count(distinct) from stg_query_history, or hll_estimate of the
+  sketch when `approx_distinct_users` is on.
+#}
+
+{# Run-once upgrade for tables built before the distinct-user columns (see macros/schema_migrations.sql) #}
+{% set add_users_hll_sql %}
+  alter table {{ this }} add column if not exists users_hll binary
+{% endset %}
+{% set add_daily_users_sql %}
+  alter table {{ this }} add column if not exists daily_unique_users number(38,0)
+{% endset %}
+{% set backfill_users_sql %}
+  update {{ this }} as target
+  set users_hll = src.users_hll,
+      daily_unique_users = src.daily_unique_users
+  from (
+      {% if var('approx_distinct_users', false) %}
+      select usage_date, warehouse_name,
+             hll_combine(users_hll) as users_hll,
+             coalesce(hll_estimate(hll_combine(users_hll)), 0) as daily_unique_users
+      from {{ ref('int_hourly_compute_costs') }}
+      group by 1, 2
+      {% else %}
+      select h.usage_date, h.warehouse_name, h.users_hll, coalesce(u.daily_unique_users, 0) as daily_unique_users
+      from (
+          select usage_date, warehouse_name, hll_combine(users_hll) as users_hll
+          from {{ ref('int_hourly_compute_costs') }}
+          group by 1, 2
+      ) h
+      left join (
+          select usage_date, warehouse_name, count(distinct user_name) as daily_unique_users
+          from {{ ref('stg_query_history') }}
+          group by 1, 2
+      ) u
+        on u.usage_date = h.usage_date
+       and u.warehouse_name = h.warehouse_name
+      {% endif %}
+  ) as src
+  where target.daily_unique_users is null
+    and target.usage_date = src.usage_date
+    and target.warehouse_name = src.warehouse_name
+{% endset %}
+{% do apply_schema_migrations([
+    {'version': 1, 'description': 'add and backfill users_hll and daily_unique_users', 'statements': [
+        {'sql': add_users_hll_sql},
+        {'sql': add_daily_users_sql},
+        {'sql': backfill_users_sql},
+    ]},
+]) %}
+
+with
+{% if is_incremental() %}
+bounds as (
+    select dateadd('day', -{{ var('daily_costs_restatement_days') }}, max(usage_date)) as restate_from
+    from {{ this }}
+),
+{% endif %}
+
+compute_costs as (
     select
         usage_date,
         warehouse_name,
@@ -18,16 +92,34 @@ with compute_costs as (
         -- Existing signals
         sum(idle_cost_usd)              as idle_cost,
         sum(queries_executed)           as total_queries,
-        avg(unique_users)               as avg_concurrent_users
+        avg(unique_users)               as avg_concurrent_users,
+        hll_combine(users_hll)          as users_hll
     from {{ ref('int_hourly_compute_costs') }}
+    {% if is_incremental() %}
+    where usage_date >= (select coalesce(restate_from, '1970-01-01'::date) from bounds)
+    {% endif %}
     group by 1, 2
 ),
 
-daily_summary as (
+{% if not var('approx_distinct_users', false) %}
+daily_users as (
+    select
+        usage_date,
+        warehouse_name,
+        count(distinct user_name)       as daily_unique_users
+    from {{ ref('stg_query_history') }}
+    {% if is_incremental() %}
+    where usage_date >= (select coalesce(restate_from, '1970-01-01'::date) from bounds)
+    {% endif %}
+    group by 1, 2
+),
+{% endif %}
+
+daily_base as (
     select
         -- Contract-friendly explicit types
-        usage_date::date                                   as usage_date,
-        warehouse_name::varchar                            as warehouse_name,
+        c.usage_date::date                                 as usage_date,
+        c.warehouse_name::varchar                          as warehouse_name,
 
         compute_credits::number(38,3)                      as compute_credits,
         compute_cost::number(38,6)                         as compute_cost,
@@ -39,6 +131,12 @@ daily_summary as (
 
         total_queries::number(38,0)                        as total_queries,
         avg_concurrent_users::number(38,2)                 as avg_concurrent_users,
+        {% if var('approx_distinct_users', false) %}
+        coalesce(hll_estimate(users_hll), 0)::number(38,0) as daily_unique_users,
+        {% else %}
+        coalesce(u.daily_unique_users, 0)::number(38,0)    as daily_unique_users,
+        {% endif %}
+        users_hll::binary                                  as users_hll,
 
         case when total_queries > 0
              then (compute_cost / nullif(total_queries,0))::number(38,6)
@@ -47,7 +145,38 @@ daily_summary as (
         case when compute_cost > 0
              then greatest(0, least(100, 100 * (1 - (least(idle_cost, compute_cost) / nullif(compute_cost,0)))))::number(5,2)
              else 100::number(5,2)
-        end                                                as efficiency_score,
+        end                                                as efficiency_score
+    from compute_costs c
+    {% if not var('approx_distinct_users', false) %}
+    left join daily_users u
+      on u.usage_date = c.usage_date
+     and u.warehouse_name = c.warehouse_name
+    {% endif %}
+),
+
+window_input as (
+    select usage_date, warehouse_name, total_cost
+    from daily_base
+    {% if is_incremental() %}
+    union all
+    -- Prior days the windows reach back to: rest of the month, and 7 rows per warehouse for lag/7-day avg
+    -- (looked up within 60 days; a warehouse idle for longer restarts its lags, as after a gap in metering)
+    select usage_date, warehouse_name, total_cost
+    from {{ this }}
+    where usage_date < (select restate_from from bounds)
+      and usage_date >= least(
+          (select date_trunc('month', restate_from) from bounds),
+          (select dateadd('day', -60, restate_from) from bounds)
+      )
+    qualify usage_date >= (select date_trunc('month', restate_from) from bounds)
+         or row_number() over (partition by warehouse_name order by usage_date desc) <= 7
+    {% endif %}
+),
+
+windowed as (
+    select
+        usage_date,
+        warehouse_name,
 
         -- Use TOTAL for running/MA signals (holistic)
         sum(total_cost) over (
@@ -68,8 +197,20 @@ daily_summary as (
         (total_cost - lag(total_cost, 7) over (
             partition by warehouse_name order by usage_date
         ))::number(38,6)                                   as week_over_week_change
+    from window_input
+),
 
-    from compute_costs
+daily_summary as (
+    select
+        d.*,
+        w.month_to_date_cost,
+        w.cost_7day_avg,
+        w.day_over_day_change,
+        w.week_over_week_change
+    from daily_base d
+    join windowed w
+      on w.usage_date = d.usage_date
+     and w.warehouse_name = d.warehouse_name
 )
 
 select
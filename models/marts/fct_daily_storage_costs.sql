@@ -1,6 +1,9 @@
 {{
     config(
-        materialized='table',
+        materialized='incremental',
+        incremental_strategy='merge',
+        unique_key='daily_storage_key',
+        on_schema_change='append_new_columns',
         contract={ 'enforced': true }
     )
 }}
@@ -10,15 +13,34 @@
   Authoritative daily storage cost by database; counterpart to fct_daily_costs (compute).
   Grain: database x day.
   Adds MTD running totals and 30-day rolling averages for trend analysis.
+  Incremental runs recompute the last `storage_restatement_days` days and merge
+  on daily_storage_key; the running sum and rolling average read their earlier
+  rows (rest of the month, last 29 days per database) from this table.
 #}
 
-with storage as (
+with
+{% if is_incremental() %}
+bounds as (
+
+    select coalesce(
+        dateadd('day', -{{ var('storage_restatement_days') }}, max(usage_date)),
+        '1970-01-01'::date
+    ) as restate_from
+    from {{ this }}
+
+),
+{% endif %}
+
+storage as (
 
     select * from {{ ref('stg_storage_usage') }}
+    {% if is_incremental() %}
+    where usage_date >= (select restate_from from bounds)
+    {% endif %}
 
 ),
 
-with_trends as (
+daily as (
 
     select
         {{ dbt_utils.generate_surrogate_key(['database_name', 'usage_date']) }}
@@ -38,7 +60,37 @@ with_trends as (
         round(estimated_active_cost_usd, 9)     as estimated_active_cost_usd,
         round(estimated_failsafe_cost_usd, 9)   as estimated_failsafe_cost_usd,
         round(estimated_stage_cost_usd, 9)      as estimated_stage_cost_usd,
-        round(estimated_storage_cost_usd, 9)    as estimated_storage_cost_usd,
+        round(estimated_storage_cost_usd, 9)    as estimated_storage_cost_usd
+
+    from storage
+
+),
+
+window_input as (
+
+    select usage_date, database_name, estimated_storage_cost_usd
+    from daily
+    {% if is_incremental() %}
+    union all
+    -- Earlier rows the windows reach: rest of the month, and 29 rows per database
+    select usage_date, database_name, estimated_storage_cost_usd
+    from {{ this }}
+    where usage_date < (select restate_from from bounds)
+      and usage_date >= least(
+          (select date_trunc('month', restate_from) from bounds),
+          (select dateadd('day', -90, restate_from) from bounds)
+      )
+    qualify usage_date >= (select date_trunc('month', restate_from) from bounds)
+         or row_number() over (partition by database_name order by usage_date desc) <= 29
+    {% endif %}
+
+),
+
+trends as (
+
+    select
+        usage_date,
+        database_name,
 
         -- Month-to-date (running sum within each database x calendar month)
         round(sum(estimated_storage_cost_usd) over (
@@ -54,7 +106,20 @@ with_trends as (
             rows between 29 preceding and current row
         ), 9)                                   as storage_cost_30day_avg
 
-    from storage
+    from window_input
+
+),
+
+with_trends as (
+
+    select
+        d.*,
+        t.month_to_date_storage_cost,
+        t.storage_cost_30day_avg
+    from daily d
+    inner join trends t
+        on t.database_name = d.database_name
+        and t.usage_date = d.usage_date
 
 )
 
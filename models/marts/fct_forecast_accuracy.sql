@@ -0,0 +1,75 @@
+{{
+    config(
+        materialized='table'
+    )
+}}
+
+{#
+  fct_forecast_accuracy
+  Backtest of fct_cost_forecast against actual daily cost in fct_daily_costs.
+  Grain: warehouse_name x days_ahead x lookback_days (forecast_lookback_days at
+  run time), over every past forecast whose forecast_date is a complete day in
+  fct_daily_costs. A warehouse with no metering on a forecast day counts as
+  $0 actual; those days are left out of MAPE but count toward error, bias and
+  band coverage.
+#}
+
+with actuals_through as (
+
+    select max(usage_date) as max_usage_date
+    from {{ ref('fct_daily_costs') }}
+
+),
+
+scored as (
+
+    select
+        f.warehouse_name,
+        f.days_ahead,
+        f.lookback_days,
+        f.forecast_method,
+        f.forecast_run_date,
+        f.forecasted_cost_usd,
+        coalesce(a.total_cost, 0)                           as actual_cost_usd,
+        f.forecasted_cost_usd - coalesce(a.total_cost, 0)   as error_usd,
+        case
+            when coalesce(a.total_cost, 0) > 0
+            then abs(f.forecasted_cost_usd - a.total_cost) / a.total_cost
+        end                                                 as abs_pct_error,
+        case
+            when coalesce(a.total_cost, 0) between f.confidence_band_low and f.confidence_band_high
+            then 1 else 0
+        end                                                 as within_band
+    from {{ ref('fct_cost_forecast') }} f
+    cross join actuals_through t
+    left join {{ ref('fct_daily_costs') }} a
+        on a.warehouse_name = f.warehouse_name
+        and a.usage_date = f.forecast_date
+    where f.forecast_date < t.max_usage_date   -- latest day may still be loading
+
+),
+
+accuracy as (
+
+    select
+        {{ dbt_utils.generate_surrogate_key(['warehouse_name', 'days_ahead', 'lookback_days', 'forecast_method']) }}
+                                                    as forecast_accuracy_id,
+        warehouse_name,
+        days_ahead,
+        lookback_days,
+        forecast_method,
+        count(*)                                    as forecast_count,
+        min(forecast_run_date)                      as first_forecast_run_date,
+        max(forecast_run_date)                      as last_forecast_run_date,
+        sum(actual_cost_usd)                        as actual_cost_usd,
+        sum(forecasted_cost_usd)                    as forecasted_cost_usd,
+        round(100 * avg(abs_pct_error), 2)          as mape_pct,
+        avg(abs(error_usd))                         as mean_abs_error_usd,
+        avg(error_usd)                              as bias_usd,
+        round(100.0 * avg(within_band), 2)          as band_coverage_pct
+    from scored
+    group by warehouse_name, days_ahead, lookback_days, forecast_method
+
+)
+
+select * from accuracy
@@ -1,6 +1,8 @@
 {{
     config(
-        materialized='table'
+        materialized='incremental',
+        incremental_strategy='delete+insert',
+        unique_key='usage_date'
     )
 }}
 
@@ -9,16 +11,40 @@
   Ranked leaderboard of users by daily cost / query volume.
   Grain: user_name x usage_date.
   Rolls up int_top_spenders (user x role x db x warehouse x day) to user x day.
+  Incremental runs replace whole days from the last `top_spenders_restatement_days`
+  days; ranks and shares are per day, and the 7-day rolling cost reads each
+  user's prior 6 rows from this table.
 #}
 
-with primary_warehouse as (
+with
+{% if is_incremental() %}
+bounds as (
+    select coalesce(
+        dateadd('day', -{{ var('top_spenders_restatement_days') }}, max(usage_date)),
+        '1970-01-01'::date
+    ) as restate_from
+    from {{ this }}
+),
+{% endif %}
+
+daily_spenders as (
+
+    select *
+    from {{ ref('int_top_spenders') }}
+    {% if is_incremental() %}
+    where usage_date >= (select restate_from from bounds)
+    {% endif %}
+
+),
+
+primary_warehouse as (
 
     -- For each user x day, find the warehouse with the highest query count
     select
         usage_date,
         user_name,
         warehouse_name                          as primary_warehouse_name
-    from {{ ref('int_top_spenders') }}
+    from daily_spenders
     qualify row_number() over (
         partition by user_name, usage_date
         order by query_count desc
@@ -37,11 +63,42 @@ spenders as (
         sum(t.gb_scanned)                       as gb_scanned,
         sum(t.estimated_cost_usd)               as estimated_cost_usd,
         max(t.has_cost_estimate::int)::boolean  as has_cost_estimate
-    from {{ ref('int_top_spenders') }} t
+    from daily_spenders t
     group by t.usage_date, t.user_name
 
 ),
 
+rolling_input as (
+
+    select usage_date, user_name, estimated_cost_usd
+    from spenders
+    {% if is_incremental() %}
+    union all
+    -- Each user's 6 prior days for the rolling window, looked up within 60 days
+    select usage_date, user_name, estimated_cost_usd
+    from {{ this }}
+    where usage_date < (select restate_from from bounds)
+      and usage_date >= (select dateadd('day', -60, restate_from) from bounds)
+    qualify row_number() over (partition by user_name order by usage_date desc) <= 6
+    {% endif %}
+
+),
+
+rolling as (
+
+    select
+        usage_date,
+        user_name,
+        -- 7-day rolling cost per user
+        sum(estimated_cost_usd) over (
+            partition by user_name
+            order by usage_date
+            rows between 6 preceding and current row
+        )                                       as rolling_7d_cost_usd
+    from rolling_input
+
+),
+
 with_rankings as (
 
     select
@@ -79,18 +136,17 @@ with_rankings as (
             / nullif(sum(s.estimated_cost_usd) over (partition by s.usage_date), 0),
         2)                                      as pct_of_daily_cost,
 
-        -- 7-day rolling cost per user
-        sum(s.estimated_cost_usd) over (
-            partition by s.user_name
-            order by s.usage_date
-            rows between 6 preceding and current row
-        )                                       as rolling_7d_cost_usd
+        r.rolling_7d_cost_usd
 
     from spenders s
     left join primary_warehouse pw
         on s.user_name = pw.user_name
         and s.usage_date = pw.usage_date
+    inner join rolling r
+        on s.user_name = r.user_name
+        and s.usage_date = r.usage_date
 
 )
 
 select * from with_rankings
+order by usage_date, user_name
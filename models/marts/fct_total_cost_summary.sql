@@ -91,3 +91,4 @@ with_totals as (
 )
 
 select * from with_totals
+order by usage_date, cost_category
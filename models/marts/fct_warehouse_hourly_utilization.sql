@@ -0,0 +1,100 @@
+{{
+    config(
+        materialized='table'
+    )
+}}
+
+{#
+  fct_warehouse_hourly_utilization
+  When each warehouse burns credits, for auto-suspend and scheduling decisions.
+  Grain: warehouse_name x day_of_week (ISO, 1 = Monday) x hour_of_day, over the
+  last `utilization_window_days` complete days (default 28, four of each weekday).
+  At most warehouses x 168 rows, so the app can draw a heatmap without reading
+  int_hourly_compute_costs. Hours with no metering row count as zero credits and
+  inactive.
+  Cells are keyed on hour_start, the hour the credits were used (08:00-09:00 is
+  hour 8); usage_hour_ntz is the metering END_TIME hour and would shift every
+  cell by one. usage_date only bounds the scan to the clustered date range.
+#}
+
+{% set window_days = var('utilization_window_days') | int %}
+
+with calendar as (
+
+    -- How many times each weekday occurs in the window (denominator for ratios)
+    select
+        dayofweekiso(dateadd('day', -1 - seq4(), current_date()))   as day_of_week,
+        count(*)                                                    as days_in_window
+    from table(generator(rowcount => {{ window_days }}))
+    group by 1
+
+),
+
+hourly as (
+
+    select
+        warehouse_name,
+        dayofweekiso(hour_start::timestamp_ntz) as day_of_week,
+        hour(hour_start::timestamp_ntz)         as hour_of_day,
+        total_credits_used,
+        total_cost_usd,
+        idle_cost_usd,
+        queries_executed
+    from {{ ref('int_hourly_compute_costs') }}
+    -- usage_date (END_TIME hour) prunes; hour_start picks the hours that began inside the window
+    where usage_date >= dateadd('day', -{{ window_days }}, current_date())
+      and usage_date <= current_date()
+      and hour_start::timestamp_ntz >= dateadd('day', -{{ window_days }}, current_date())
+      and hour_start::timestamp_ntz < current_date()
+
+),
+
+aggregated as (
+
+    select
+        warehouse_name,
+        day_of_week,
+        hour_of_day,
+        count(*)                                as metered_hours,
+        sum(case when queries_executed > 0 then 1 else 0 end)
+                                                as active_hours,
+        sum(total_credits_used)                 as total_credits,
+        sum(total_cost_usd)                     as total_cost_usd,
+        sum(idle_cost_usd)                      as idle_cost_usd,
+        sum(queries_executed)                   as query_count
+    from hourly
+    group by warehouse_name, day_of_week, hour_of_day
+
+),
+
+final as (
+
+    select
+        {{ dbt_utils.generate_surrogate_key(['a.warehouse_name', 'a.day_of_week', 'a.hour_of_day']) }}
+                                                as warehouse_utilization_id,
+        a.warehouse_name,
+        a.day_of_week,
+        decode(a.day_of_week, 1, 'Mon', 2, 'Tue', 3, 'Wed', 4, 'Thu', 5, 'Fri', 6, 'Sat', 7, 'Sun')
+                                                as day_name,
+        a.hour_of_day,
+        c.days_in_window,
+        a.metered_hours,
+        a.active_hours,
+        round(a.total_credits, 6)               as total_credits,
+        round(a.total_credits / c.days_in_window, 6)
+                                                as avg_credits_per_hour,
+        round(a.total_cost_usd, 6)              as total_cost_usd,
+        round(a.idle_cost_usd, 6)               as idle_cost_usd,
+        a.query_count,
+        round(a.active_hours / c.days_in_window, 4)
+                                                as active_hour_ratio,
+        dateadd('day', -{{ window_days }}, current_date())
+                                                as window_start_date,
+        dateadd('day', -1, current_date())      as window_end_date
+    from aggregated a
+    inner join calendar c
+        on a.day_of_week = c.day_of_week
+
+)
+
+select * from final
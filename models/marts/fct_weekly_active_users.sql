@@ -0,0 +1,81 @@
+{{
+    config(
+        materialized='table'
+    )
+}}
+
+{#
+  fct_weekly_active_users
+  Distinct users who ran queries per week, per warehouse and across all warehouses.
+  Grain: week_start x warehouse_name; 'ALL WAREHOUSES' rows count a user once
+  however many warehouses they used, which summing the per-warehouse rows cannot.
+  With `approx_distinct_users` the counts merge fct_daily_costs.users_hll
+  (one small row per warehouse-day, typical error around 1.6%); otherwise they
+  are exact count(distinct) over stg_query_history.
+#}
+
+with
+{% if var('approx_distinct_users', false) %}
+daily as (
+
+    select
+        date_trunc('week', usage_date)          as week_start,
+        usage_date,
+        warehouse_name,
+        users_hll
+    from {{ ref('fct_daily_costs') }}
+    where users_hll is not null
+
+),
+
+weekly as (
+
+    select
+        week_start,
+        coalesce(warehouse_name, 'ALL WAREHOUSES') as warehouse_name,
+        grouping(warehouse_name) = 1            as is_all_warehouses,
+        count(distinct usage_date)              as days_covered,
+        coalesce(hll_estimate(hll_combine(users_hll)), 0)
+                                                as distinct_users
+    from daily
+    group by grouping sets ((week_start, warehouse_name), (week_start))
+
+)
+{% else %}
+daily as (
+
+    select
+        date_trunc('week', usage_date)          as week_start,
+        usage_date,
+        warehouse_name,
+        user_name
+    from {{ ref('stg_query_history') }}
+
+),
+
+weekly as (
+
+    select
+        week_start,
+        coalesce(warehouse_name, 'ALL WAREHOUSES') as warehouse_name,
+        grouping(warehouse_name) = 1            as is_all_warehouses,
+        count(distinct usage_date)              as days_covered,
+        count(distinct user_name)               as distinct_users
+    from daily
+    group by grouping sets ((week_start, warehouse_name), (week_start))
+
+)
+{% endif %}
+
+select
+    {{ dbt_utils.generate_surrogate_key(['week_start', 'warehouse_name']) }}
+                                                as weekly_active_users_id,
+    week_start::date                            as week_start,
+    warehouse_name,
+    is_all_warehouses,
+    days_covered,
+    distinct_users::number(38,0)                as distinct_users,
+    {{ 'true' if var('approx_distinct_users', false) else 'false' }}
+                                                as is_approximate
+from weekly
+order by week_start, warehouse_name
@@ -1,6 +1,56 @@
-{{ config(materialized='table') }}
+{{
+  config(
+    materialized='incremental',
+    incremental_strategy='delete+insert',
+    unique_key='usage_date',
+    meta={'schema_version': 1},
+    post_hook="{{ record_schema_version() }}"
+  )
+}}
 
-with daily_actuals as (
+{#
+  Incremental runs replace every day from `daily_costs_restatement_days` before
+  the latest day with actuals onward, so restated fct_daily_costs days and all
+  future budget rows are refreshed together.
+  Edits to the budget_daily or department_mapping seeds can touch any day, so
+  each row carries a checksum of both seeds; when it differs from the one in
+  this table, the run restates every day instead, as a full refresh would.
+#}
+
+{# Run-once upgrade for tables built before seed_checksum (see macros/schema_migrations.sql) #}
+{% set add_seed_checksum_sql %}
+  alter table {{ this }} add column if not exists seed_checksum number
+{% endset %}
+{% do apply_schema_migrations([
+    {'version': 1, 'description': 'add seed_checksum', 'statements': [
+        {'sql': add_seed_checksum_sql},
+    ]},
+]) %}
+
+with seed_state as (
+  select hash(b.checksum, m.checksum) as seed_checksum
+  from (select hash_agg(*) as checksum from {{ ref('budget_daily') }}) b
+  cross join (select hash_agg(*) as checksum from {{ ref('department_mapping') }}) m
+),
+{% if is_incremental() %}
+bounds as (
+  select
+    case
+      -- seeds changed since the last build (or the table predates seed_checksum): restate everything
+      when (select max(seed_checksum) from {{ this }}) is distinct from (select seed_checksum from seed_state)
+        then '1970-01-01'::date
+      else coalesce(
+        (
+          select dateadd('day', -{{ var('daily_costs_restatement_days') }}, max(usage_date))
+          from {{ this }}
+          where actual_cost_usd > 0
+        ),
+        '1970-01-01'::date
+      )
+    end as restate_from
+),
+{% endif %}
+daily_actuals as (
   select
     f.usage_date,
     coalesce(nullif(trim(m.department), ''), 'Unassigned') as department,
@@ -8,6 +58,9 @@ with daily_actuals as (
   from {{ ref('fct_daily_costs') }} f
   left join {{ ref('department_mapping') }} m
     on upper(f.warehouse_name) = upper(m.warehouse_name)
+  {% if is_incremental() %}
+  where f.usage_date >= (select restate_from from bounds)
+  {% endif %}
   group by 1,2
 ),
 budget as (
@@ -16,14 +69,17 @@ budget as (
     trim(b.department)    as department,
     b.budget_usd
   from {{ ref('budget_daily') }} b
+  {% if is_incremental() %}
+  where cast(b.date as date) >= (select restate_from from bounds)
+  {% endif %}
 )
 select
   coalesce(a.usage_date, b.usage_date) as usage_date,
   coalesce(a.department, b.department) as department,
   coalesce(a.actual_cost_usd, 0)       as actual_cost_usd,
-  coalesce(b.budget_usd, 0)            as budget_usd
+  coalesce(b.budget_usd, 0)            as budget_usd,
+  (select seed_checksum from seed_state) as seed_checksum
 from daily_actuals a
 full outer join budget b
   on a.usage_date = b.usage_date
  and a.department = b.department
-order by 1,2
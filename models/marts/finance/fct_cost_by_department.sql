@@ -24,3 +24,4 @@ select
     sum(total_cost_usd)   as total_cost_usd
 from base
 group by 1, 2
+order by 1, 2
@@ -3,76 +3,63 @@
         materialized='incremental',
         unique_key='query_id',
         on_schema_change='sync_all_columns',
+        meta={'schema_version': 1},
+        post_hook="{{ record_schema_version() }}",
         cluster_by=['usage_date', 'warehouse_name']
     )
 }}
 
-{% set query_history_watermark_column = 'usage_hour_ntz' %}
-{% set existing_column_names = [] %}
-{% if is_incremental() and execute %}
-  {% set existing_relation = adapter.get_relation(database=this.database, schema=this.schema, identifier=this.identifier) %}
-  {% if existing_relation %}
-    {% set existing_columns = adapter.get_columns_in_relation(existing_relation) %}
-    {% for col in existing_columns %}
-      {% do existing_column_names.append(col.name | lower) %}
-    {% endfor %}
+{# Run-once upgrade for tables built before usage_hour_ntz / usage_date (see macros/schema_migrations.sql) #}
+{% set add_usage_hour_sql %}
+  alter table {{ this }} add column if not exists usage_hour_ntz timestamp_ntz
+{% endset %}
+{% set add_usage_date_sql %}
+  alter table {{ this }} add column if not exists usage_date date
+{% endset %}
+{% set backfill_sql %}
+  update {{ this }}
+  set usage_hour_ntz = coalesce(usage_hour_ntz, date_trunc('hour', end_time::timestamp_ntz)),
+      usage_date = coalesce(usage_date, cast(date_trunc('day', end_time::timestamp_ntz) as date))
+  where usage_hour_ntz is null
+     or usage_date is null
+{% endset %}
+{% do apply_schema_migrations([
+    {'version': 1, 'description': 'add and backfill usage_hour_ntz and usage_date', 'statements': [
+        {'sql': add_usage_hour_sql},
+        {'sql': add_usage_date_sql},
+        {'sql': backfill_sql, 'requires': ['end_time']},
+    ]},
+]) %}
 
-    {% if 'usage_hour_ntz' not in existing_column_names %}
-      {% do run_query('alter table ' ~ existing_relation ~ ' add column usage_hour_ntz timestamp_ntz') %}
-      {% do existing_column_names.append('usage_hour_ntz') %}
-    {% endif %}
-    {% if 'usage_date' not in existing_column_names %}
-      {% do run_query('alter table ' ~ existing_relation ~ ' add column usage_date date') %}
-      {% do existing_column_names.append('usage_date') %}
-    {% endif %}
-
-    {% if 'end_time' in existing_column_names %}
-      {% set backfill_sql %}
-        update {{ existing_relation }}
-        set usage_hour_ntz = coalesce(usage_hour_ntz, date_trunc('hour', end_time::timestamp_ntz)),
-            usage_date = coalesce(usage_date, cast(date_trunc('day', end_time::timestamp_ntz) as date))
-        where usage_hour_ntz is null
-           or usage_date is null
-      {% endset %}
-      {% do run_query(backfill_sql) %}
-    {% endif %}
-
-    {% if 'usage_hour_ntz' in existing_column_names %}
-      {% set query_history_watermark_column = 'usage_hour_ntz' %}
-    {% elif 'usage_date' in existing_column_names %}
-      {% set query_history_watermark_column = 'usage_date' %}
-    {% else %}
-      {% set query_history_watermark_column = none %}
-    {% endif %}
-  {% else %}
-    {% set query_history_watermark_column = none %}
-  {% endif %}
-{% endif %}
+{# Literal watermarks so the QUERY_HISTORY scan prunes on raw END_TIME / START_TIME #}
+{% set end_floor = incremental_watermark("dateadd('hour', -1, max(usage_hour_ntz))") %}
+{% set start_floor = incremental_watermark("dateadd('hour', -1 - " ~ var('query_history_max_runtime_hours') ~ ", max(usage_hour_ntz))") %}
 
 with source as (
-    select *
+    select
+        QUERY_ID,
+        START_TIME,
+        END_TIME,
+        USER_NAME,
+        ROLE_NAME,
+        WAREHOUSE_NAME,
+        WAREHOUSE_SIZE,
+        QUERY_TYPE,
+        DATABASE_NAME,
+        SCHEMA_NAME,
+        QUERY_TAG,
+        EXECUTION_STATUS,
+        BYTES_SCANNED,
+        ROWS_PRODUCED,
+        TOTAL_ELAPSED_TIME,
+        EXECUTION_TIME
     from {{ query_history_relation() }}
     where START_TIME >= dateadd('day', -{{ var('query_history_days') }}, current_date())
-    {% if is_incremental() %}
-      {% if query_history_watermark_column == 'usage_hour_ntz' %}
-        and date_trunc('hour', END_TIME::timestamp_ntz) >= (
-            select coalesce(
-                dateadd('hour', -1, max(usage_hour_ntz)),
-                '1970-01-01'::timestamp_ntz
-            )
-            from {{ this }}
-        )
-      {% elif query_history_watermark_column == 'usage_date' %}
-        and date_trunc('hour', END_TIME::timestamp_ntz) >= (
-            select coalesce(
-                dateadd('day', -1, max(usage_date)::timestamp_ntz),
-                '1970-01-01'::timestamp_ntz
-            )
-            from {{ this }}
-        )
-      {% else %}
-        and date_trunc('hour', END_TIME::timestamp_ntz) >= '1970-01-01'::timestamp_ntz
-      {% endif %}
+    {% if end_floor is not none %}
+      -- hour-aligned floor, so END_TIME >= floor matches date_trunc('hour', END_TIME) >= floor
+      and END_TIME >= {{ end_floor }}
+      -- a query ending after the floor started at most query_history_max_runtime_hours before it
+      and START_TIME >= {{ start_floor }}
     {% endif %}
 ),
 
@@ -104,6 +91,7 @@ transformed as (
         QUERY_TYPE      as query_type,
         DATABASE_NAME   as database_name,
         SCHEMA_NAME     as schema_name,
+        QUERY_TAG       as query_tag,
         EXECUTION_STATUS,
         BYTES_SCANNED,
         ROWS_PRODUCED,
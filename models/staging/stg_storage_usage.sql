@@ -16,7 +16,7 @@
   summary model exists.
 #}
 
-{% set storage_watermark_column = 'usage_date' %}
+{% set storage_watermark = incremental_watermark('max(usage_date)', 'YYYY-MM-DD') %}
 
 with source as (
 
@@ -28,10 +28,8 @@ with source as (
         cast(AVERAGE_FAILSAFE_BYTES as number(38, 0)) as AVERAGE_FAILSAFE_BYTES
     from {{ storage_relation() }}
 
-    {% if is_incremental() %}
-    where cast(USAGE_DATE as date) > (
-        select max({{ storage_watermark_column }}) from {{ this }}
-    )
+    {% if storage_watermark is not none %}
+    where USAGE_DATE > {{ storage_watermark }}
     {% else %}
     where USAGE_DATE >= dateadd('day', -{{ var('storage_history_days', 365) }}, current_date())
     {% endif %}
@@ -2,77 +2,54 @@
     config(
         materialized='incremental',
         unique_key='metering_id',
-        on_schema_change='sync_all_columns'
+        on_schema_change='sync_all_columns',
+        meta={'schema_version': 1},
+        post_hook="{{ record_schema_version() }}"
     )
 }}
 
-{% set metering_watermark_column = 'usage_hour_ntz' %}
-{% set existing_column_names = [] %}
-{% if is_incremental() and execute %}
-  {% set existing_relation = adapter.get_relation(database=this.database, schema=this.schema, identifier=this.identifier) %}
-  {% if existing_relation %}
-    {% set existing_columns = adapter.get_columns_in_relation(existing_relation) %}
-    {% for col in existing_columns %}
-      {% do existing_column_names.append(col.name | lower) %}
-    {% endfor %}
+{# Run-once upgrade for tables built before usage_hour_ntz / usage_date (see macros/schema_migrations.sql) #}
+{% set add_usage_hour_sql %}
+  alter table {{ this }} add column if not exists usage_hour_ntz timestamp_ntz
+{% endset %}
+{% set add_usage_date_sql %}
+  alter table {{ this }} add column if not exists usage_date date
+{% endset %}
+{% set backfill_sql %}
+  update {{ this }}
+  set usage_hour_ntz = coalesce(usage_hour_ntz, date_trunc('hour', hour_end::timestamp_ntz)),
+      usage_date = coalesce(usage_date, cast(date_trunc('day', hour_end::timestamp_ntz) as date))
+  where usage_hour_ntz is null
+     or usage_date is null
+{% endset %}
+{% do apply_schema_migrations([
+    {'version': 1, 'description': 'add and backfill usage_hour_ntz and usage_date', 'statements': [
+        {'sql': add_usage_hour_sql},
+        {'sql': add_usage_date_sql},
+        {'sql': backfill_sql, 'requires': ['hour_end']},
+    ]},
+]) %}
 
-    {% if 'usage_hour_ntz' not in existing_column_names %}
-      {% do run_query('alter table ' ~ existing_relation ~ ' add column usage_hour_ntz timestamp_ntz') %}
-      {% do existing_column_names.append('usage_hour_ntz') %}
-    {% endif %}
-    {% if 'usage_date' not in existing_column_names %}
-      {% do run_query('alter table ' ~ existing_relation ~ ' add column usage_date date') %}
-      {% do existing_column_names.append('usage_date') %}
-    {% endif %}
-
-    {% if 'hour_end' in existing_column_names %}
-      {% set backfill_sql %}
-        update {{ existing_relation }}
-        set usage_hour_ntz = coalesce(usage_hour_ntz, date_trunc('hour', hour_end::timestamp_ntz)),
-            usage_date = coalesce(usage_date, cast(date_trunc('day', hour_end::timestamp_ntz) as date))
-        where usage_hour_ntz is null
-           or usage_date is null
-      {% endset %}
-      {% do run_query(backfill_sql) %}
-    {% endif %}
-
-    {% if 'usage_hour_ntz' in existing_column_names %}
-      {% set metering_watermark_column = 'usage_hour_ntz' %}
-    {% elif 'hour_end' in existing_column_names %}
-      {% set metering_watermark_column = 'hour_end' %}
-    {% else %}
-      {% set metering_watermark_column = none %}
-    {% endif %}
-  {% else %}
-    {% set metering_watermark_column = none %}
-  {% endif %}
-{% endif %}
+{# Literal watermarks so the metering scan prunes on raw END_TIME / START_TIME #}
+{% set end_floor = incremental_watermark("dateadd('hour', -1, max(usage_hour_ntz))") %}
+{% set start_floor = incremental_watermark("dateadd('hour', -2, max(usage_hour_ntz))") %}
 
 -- Authoritative (ACCOUNT_USAGE) or Demo overlay via macro
 with source as (
-    select *
+    select
+        START_TIME,
+        END_TIME,
+        WAREHOUSE_ID,
+        WAREHOUSE_NAME,
+        CREDITS_USED,
+        CREDITS_USED_COMPUTE,
+        CREDITS_USED_CLOUD_SERVICES
     from {{ metering_relation() }}
     where START_TIME >= dateadd('day', -{{ var('metering_history_days') }}, current_date())
-    {% if is_incremental() %}
-      {% if metering_watermark_column == 'usage_hour_ntz' %}
-        and date_trunc('hour', END_TIME::timestamp_ntz) >= (
-            select coalesce(
-                dateadd('hour', -1, max(usage_hour_ntz)),
-                '1970-01-01'::timestamp_ntz
-            )
-            from {{ this }}
-        )
-      {% elif metering_watermark_column == 'hour_end' %}
-        and date_trunc('hour', END_TIME::timestamp_ntz) >= (
-            select coalesce(
-                dateadd('hour', -1, max(hour_end::timestamp_ntz)),
-                '1970-01-01'::timestamp_ntz
-            )
-            from {{ this }}
-        )
-      {% else %}
-        and date_trunc('hour', END_TIME::timestamp_ntz) >= '1970-01-01'::timestamp_ntz
-      {% endif %}
+    {% if end_floor is not none %}
+      -- metering rows span one hour, so START_TIME trails END_TIME by at most an hour
+      and END_TIME >= {{ end_floor }}
+      and START_TIME >= {{ start_floor }}
     {% endif %}
 ),
 
@@ -8,13 +8,39 @@ Reads the same env vars as app/streamlit_app.py:get_conn_params and reports:
   2. Whether connect() succeeds
   3. Identity (user/role/warehouse/database)
   4. Row counts in the two critical demo marts
+
+Performance probe (tells warehouse, network and app time apart):
+    python scripts/check_snowflake.py --probe [--schema DEMO] [--days 30]
+        [--concurrency 1,4,8] [--repeat 3] [--no-result-cache] [--json perf_probe.json]
+
+  - connect time and round-trip time of `select 1` (network + login)
+  - per mart: `select *` execute time, fetch time, rows/s and bytes/s
+  - the same for the exact SQL the app issues (app/queries.py)
+  - app query throughput at each concurrency level, one connection per worker
+Results print as a table and are written to JSON.
+
+Partition pruning report (do the marts' date layouts prune?):
+    python scripts/check_snowflake.py --pruning [--schema DEMO] [--days 30]
+        [--pruning-report docs/partition_pruning.md]
+
+  - runs each app query once with the result cache off
+  - reads partitions scanned vs total for every table scan from
+    GET_QUERY_OPERATOR_STATS and writes them into the report's marked section
 """
 from __future__ import annotations
 
+import argparse
+import json
 import os
+import statistics
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parents[1]
+
 
 def load_dotenv(path: Path) -> None:
     if not path.exists():
@@ -29,8 +55,397 @@ def load_dotenv(path: Path) -> None:
         os.environ.setdefault(key, value)
 
 
-def main() -> int:
-    load_dotenv(Path(__file__).resolve().parents[1] / ".env")
+MARTS = (
+    "fct_daily_costs",
+    "fct_cost_by_department",
+    "fct_daily_storage_costs",
+    "fct_top_spenders",
+    "fct_total_cost_summary",
+    "fct_cost_forecast",
+    "fct_budget_vs_actual",
+    "fct_warehouse_hourly_utilization",
+    "fct_weekly_active_users",
+)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--probe", action="store_true", help="run the latency/throughput probe")
+    parser.add_argument("--pruning", action="store_true", help="report partitions scanned vs total per app query")
+    parser.add_argument("--pruning-report", default=str(ROOT / "docs" / "partition_pruning.md"),
+                        help="Markdown file whose marked section receives the pruning table")
+    parser.add_argument("--schema", default="DEMO", help="schema holding the marts (default: DEMO)")
+    parser.add_argument("--days", type=int, default=30, help="app time window to replay (default: 30)")
+    parser.add_argument("--concurrency", default="1,4,8", help="comma-separated worker counts (default: 1,4,8)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per query; the median is reported")
+    parser.add_argument("--no-result-cache", action="store_true", help="disable USE_CACHED_RESULT to time the warehouse")
+    parser.add_argument("--json", default="perf_probe.json", help="where to write results (default: perf_probe.json)")
+    return parser.parse_args(argv)
+
+
+def connect_from_env(sf):
+    # Same session tuning and mart warehouse as the app.
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    from app import queries
+
+    return sf.connect(
+        account=os.environ["SNOWFLAKE_ACCOUNT"],
+        user=os.environ["SNOWFLAKE_USER"],
+        password=os.environ["SNOWFLAKE_PASSWORD"],
+        warehouse=os.environ.get("SNOWFLAKE_WAREHOUSE_MARTS")
+        or os.environ.get("SNOWFLAKE_APP_WAREHOUSE")
+        or os.environ.get("SNOWFLAKE_WAREHOUSE")
+        or None,
+        role=os.environ.get("SNOWFLAKE_ROLE") or None,
+        database=os.environ.get("SNOWFLAKE_DATABASE") or None,
+        schema=os.environ.get("SNOWFLAKE_SCHEMA") or None,
+        paramstyle="qmark",
+        session_parameters=queries.session_parameters(),
+    )
+
+
+def timed_query(conn, sql: str, params: tuple = (), statement_params: dict | None = None) -> dict:
+    import pandas as pd
+    from app.query_cache import estimate_bytes
+
+    cur = conn.cursor()
+    try:
+        started = time.perf_counter()
+        cur.execute(sql, params or None, _statement_params=statement_params)
+        executed = time.perf_counter()
+        rows = cur.fetchall()
+        fetched = time.perf_counter()
+        cols = [c[0] for c in cur.description] if cur.description else []
+    finally:
+        cur.close()
+    size = estimate_bytes(pd.DataFrame(rows, columns=cols)) if rows else 0
+    return {
+        "execute_s": executed - started,
+        "fetch_s": fetched - executed,
+        "total_s": fetched - started,
+        "rows": len(rows),
+        "bytes": size,
+    }
+
+
+def measure(conn, name: str, sql: str, repeat: int, params: tuple = (), statement_params: dict | None = None) -> dict:
+    runs = []
+    error = ""
+    for _ in range(max(1, repeat)):
+        try:
+            runs.append(timed_query(conn, sql, params, statement_params))
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+            break
+    if not runs:
+        return {"name": name, "sql": sql.strip(), "error": error}
+    median = {k: statistics.median(r[k] for r in runs) for k in ("execute_s", "fetch_s", "total_s")}
+    rows, size = runs[-1]["rows"], runs[-1]["bytes"]
+    transfer = median["fetch_s"] or median["total_s"]
+    return {
+        "name": name,
+        "sql": " ".join(sql.split()),
+        "params": list(params),
+        "runs": len(runs),
+        **median,
+        "rows": rows,
+        "bytes": size,
+        "rows_per_s": rows / transfer if transfer else 0.0,
+        "bytes_per_s": size / transfer if transfer else 0.0,
+        "error": error,
+    }
+
+
+def snowflake_today(conn):
+    # Same date the app binds: Snowflake's current_date(), not the local clock
+    from app import queries
+
+    cur = conn.cursor()
+    try:
+        cur.execute(queries.current_date().sql)
+        return cur.fetchone()[0]
+    finally:
+        cur.close()
+
+
+def app_queries(db: str, schema: str, days: int, today=None) -> list:
+    from app import queries
+
+    lb = queries.models_lookback_days(days)
+    return [
+        queries.daily_costs(db, schema, lb, today),
+        queries.cost_by_department(db, schema, lb, today),
+        queries.budget_daily(db, schema),
+        queries.budget_vs_actual_latest(db, schema),
+        queries.cost_forecast(db, schema, today),
+        queries.storage_costs(db, schema, days, today),
+        queries.top_spenders(db, schema, days, today),
+        queries.total_cost_summary(db, schema, today),
+        queries.active_users(db, schema, days, today),
+        queries.app_query_costs(db, schema, days, today),
+        queries.warehouse_utilization(db, schema),
+    ]
+
+
+def throughput(sf, app: list, workers: int, setup: list[str]) -> dict:
+    conns = []
+    try:
+        for _ in range(workers):
+            conn = connect_from_env(sf)
+            for stmt in setup:
+                conn.cursor().execute(stmt).close()
+            conns.append(conn)
+        latencies: list[float] = []
+        failures = 0
+        rows = 0
+        lock = threading.Lock()
+
+        def worker(conn) -> None:
+            nonlocal failures, rows
+            for q in app:
+                try:
+                    result = timed_query(conn, q.sql, q.params, {"QUERY_TAG": q.tag})
+                except Exception:
+                    with lock:
+                        failures += 1
+                    continue
+                with lock:
+                    latencies.append(result["total_s"])
+                    rows += result["rows"]
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(worker, conns))
+        wall = time.perf_counter() - started
+    finally:
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))] if ordered else 0.0
+    return {
+        "workers": workers,
+        "queries": len(latencies),
+        "failures": failures,
+        "wall_s": wall,
+        "queries_per_s": len(latencies) / wall if wall else 0.0,
+        "rows_per_s": rows / wall if wall else 0.0,
+        "p50_s": statistics.median(ordered) if ordered else 0.0,
+        "p95_s": p95,
+    }
+
+
+def print_table(title: str, rows: list[dict], columns: list[tuple[str, str, str]]) -> None:
+    print(f"\n== {title} ==")
+    header = "  ".join(f"{label:>{width}}" if i else f"{label:<{width}}" for i, (label, _, width) in enumerate(columns))
+    print(header)
+    for row in rows:
+        cells = []
+        for i, (_, key, width) in enumerate(columns):
+            value = row.get(key, "")
+            if isinstance(value, float):
+                value = f"{value:,.3f}" if key.endswith("_s") and "_per_" not in key else f"{value:,.0f}"
+            elif isinstance(value, int):
+                value = f"{value:,}"
+            cells.append(f"{str(value):>{width}}" if i else f"{str(value):<{width}}")
+        print("  ".join(cells))
+        if row.get("error"):
+            print(f"    ERROR {row['error']}")
+
+
+QUERY_COLUMNS = [
+    ("query", "name", "34"),
+    ("exec s", "execute_s", "8"),
+    ("fetch s", "fetch_s", "8"),
+    ("total s", "total_s", "8"),
+    ("rows", "rows", "9"),
+    ("rows/s", "rows_per_s", "11"),
+    ("bytes/s", "bytes_per_s", "13"),
+]
+
+
+def probe(args: argparse.Namespace) -> int:
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    try:
+        import snowflake.connector as sf
+    except Exception as exc:
+        print(f"FAIL: snowflake.connector import: {type(exc).__name__}: {exc}")
+        return 1
+
+    db = os.environ.get("SNOWFLAKE_DATABASE") or "FINOPS_DEV"
+    schema = args.schema
+    setup = ["alter session set use_cached_result = false"] if args.no_result_cache else []
+    report: dict = {
+        "database": db,
+        "schema": schema,
+        "days": args.days,
+        "use_cached_result": not args.no_result_cache,
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+    started = time.perf_counter()
+    try:
+        conn = connect_from_env(sf)
+    except Exception as exc:
+        print(f"FAIL: connect: {type(exc).__name__}: {exc}")
+        return 1
+    report["connect_s"] = time.perf_counter() - started
+    for stmt in setup:
+        conn.cursor().execute(stmt).close()
+
+    rtt = measure(conn, "select 1", "select 1", max(args.repeat, 5))
+    report["round_trip_s"] = rtt.get("total_s")
+    print(f"\n== network ==\n  connect: {report['connect_s']:.3f}s  round trip (select 1, median): {rtt.get('total_s', 0.0):.3f}s")
+
+    marts = [measure(conn, table, f"select * from {db}.{schema}.{table}", args.repeat) for table in MARTS]
+    today = snowflake_today(conn)
+    app = [
+        measure(conn, q.cache_key, q.sql, args.repeat, q.params, {"QUERY_TAG": q.tag})
+        for q in app_queries(db, schema, args.days, today)
+    ]
+    conn.close()
+    report["marts"] = marts
+    report["app_queries"] = app
+    print_table(f"marts ({db}.{schema}, select *)", marts, QUERY_COLUMNS)
+    print_table(f"app queries ({args.days}-day window)", app, QUERY_COLUMNS)
+
+    levels = [int(x) for x in args.concurrency.split(",") if x.strip()]
+    report["concurrency"] = [throughput(sf, app_queries(db, schema, args.days, today), max(1, n), setup) for n in levels]
+    print_table(
+        "app query throughput",
+        report["concurrency"],
+        [
+            ("workers", "workers", "7"),
+            ("queries", "queries", "8"),
+            ("failed", "failures", "7"),
+            ("wall s", "wall_s", "8"),
+            ("queries/s", "queries_per_s", "10"),
+            ("rows/s", "rows_per_s", "11"),
+            ("p50 s", "p50_s", "8"),
+            ("p95 s", "p95_s", "8"),
+        ],
+    )
+
+    Path(args.json).write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
+    print(f"\nwrote {args.json}")
+    print(
+        "\nReading it: high connect/round-trip time points at network or login; execute time well above the "
+        "round trip points at the warehouse; fetch time or low bytes/s points at result transfer; if all of "
+        "these are small, the time is spent in the app."
+    )
+    return 0
+
+
+PRUNING_START = "<!-- pruning-report:start -->"
+PRUNING_END = "<!-- pruning-report:end -->"
+
+OPERATOR_PRUNING_SQL = """
+    select operator_attributes:table_name::string                   as table_name,
+           operator_statistics:pruning:partitions_scanned::number   as partitions_scanned,
+           operator_statistics:pruning:partitions_total::number     as partitions_total
+    from table(get_query_operator_stats(?))
+    where operator_type = 'TableScan'
+"""
+
+
+def query_pruning(conn, q) -> dict:
+    cur = conn.cursor()
+    try:
+        cur.execute(q.sql, q.params or None, _statement_params={"QUERY_TAG": q.tag})
+        cur.fetchall()
+        cur.execute(OPERATOR_PRUNING_SQL, (cur.sfqid,))
+        scans = cur.fetchall()
+    finally:
+        cur.close()
+    scanned = sum(int(r[1] or 0) for r in scans)
+    total = sum(int(r[2] or 0) for r in scans)
+    return {
+        "name": q.cache_key.split(":")[0],
+        "tables": ", ".join(sorted({(r[0] or "").split(".")[-1].lower() for r in scans})),
+        "partitions_scanned": scanned,
+        "partitions_total": total,
+        "pruned_pct": 100.0 * (1 - scanned / total) if total else 0.0,
+    }
+
+
+def pruning_markdown(rows: list[dict], header: str) -> str:
+    lines = [
+        header,
+        "",
+        "| app query | tables | partitions scanned | partitions total | pruned |",
+        "|---|---|---:|---:|---:|",
+    ]
+    for r in rows:
+        if r.get("error"):
+            lines.append(f"| {r['name']} | error: {r['error']} | | | |")
+            continue
+        lines.append(
+            f"| {r['name']} | {r['tables']} | {r['partitions_scanned']:,} | {r['partitions_total']:,} | {r['pruned_pct']:.0f}% |"
+        )
+    return "\n".join(lines)
+
+
+def write_pruning_report(path: Path, body: str) -> None:
+    text = path.read_text(encoding="utf-8") if path.exists() else f"{PRUNING_START}\n{PRUNING_END}\n"
+    if PRUNING_START not in text or PRUNING_END not in text:
+        text = text.rstrip("\n") + f"\n\n{PRUNING_START}\n{PRUNING_END}\n"
+    head, _, rest = text.partition(PRUNING_START)
+    _, _, tail = rest.partition(PRUNING_END)
+    path.write_text(f"{head}{PRUNING_START}\n{body}\n{PRUNING_END}{tail}", encoding="utf-8")
+
+
+def pruning(args: argparse.Namespace) -> int:
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    try:
+        import snowflake.connector as sf
+    except Exception as exc:
+        print(f"FAIL: snowflake.connector import: {type(exc).__name__}: {exc}")
+        return 1
+
+    db = os.environ.get("SNOWFLAKE_DATABASE") or "FINOPS_DEV"
+    try:
+        conn = connect_from_env(sf)
+    except Exception as exc:
+        print(f"FAIL: connect: {type(exc).__name__}: {exc}")
+        return 1
+    conn.cursor().execute("alter session set use_cached_result = false").close()
+    rows = []
+    for q in app_queries(db, args.schema, args.days, snowflake_today(conn)):
+        try:
+            rows.append(query_pruning(conn, q))
+        except Exception as exc:
+            rows.append({"name": q.cache_key.split(":")[0], "error": f"{type(exc).__name__}: {exc}"})
+    conn.close()
+
+    print_table(
+        f"partition pruning ({db}.{args.schema}, {args.days}-day window)",
+        rows,
+        [
+            ("query", "name", "14"),
+            ("tables", "tables", "28"),
+            ("scanned", "partitions_scanned", "9"),
+            ("total", "partitions_total", "9"),
+            ("pruned %", "pruned_pct", "9"),
+        ],
+    )
+    header = f"Generated {time.strftime('%Y-%m-%d', time.gmtime())} against `{db}.{args.schema}` with a {args.days}-day window."
+    write_pruning_report(Path(args.pruning_report), pruning_markdown(rows, header))
+    print(f"\nwrote {args.pruning_report}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    load_dotenv(ROOT / ".env")
+    args = parse_args(argv)
+    if args.probe:
+        return probe(args)
+    if args.pruning:
+        return pruning(args)
 
     keys = [
         "SNOWFLAKE_ACCOUNT",
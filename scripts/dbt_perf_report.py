@@ -0,0 +1,329 @@
+"""Report where `dbt build` spends its time, from run_results.json and manifest.json.
+
+Run from the finops-dbt repo root after a `dbt build` / `dbt run`:
+    python scripts/dbt_perf_report.py [--target-dir target] [--top 10]
+        [--history dbt_perf_history.jsonl] [--baseline previous|INVOCATION_ID|PATH]
+        [--threshold-pct 20] [--min-delta-s 5] [--fail-on-regression]
+
+Each run is appended to a local JSON-lines history (once per invocation_id):
+per-node execution time, status, rows affected and the Snowflake query ID
+from adapter_response. The report prints:
+
+  - the slowest models of this run, flagging `table` models as incremental candidates
+  - the fastest-growing models across the last --growth-runs recorded runs
+  - the critical path: the longest chain of dependent nodes by execution time,
+    i.e. the wall time no thread count can beat
+  - regressions against the baseline (the previous recorded run by default,
+    an invocation_id prefix from the history, or another target directory)
+
+Query IDs join to SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY for credits per model.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from check_snowflake import print_table  # noqa: E402
+
+TIMED_TYPES = ("model", "seed", "snapshot", "test")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target-dir", default=str(ROOT / "target"), help="dbt target directory (default: target)")
+    parser.add_argument("--history", default=str(ROOT / "dbt_perf_history.jsonl"),
+                        help="JSON-lines run history (default: dbt_perf_history.jsonl)")
+    parser.add_argument("--no-record", action="store_true", help="report without appending this run to the history")
+    parser.add_argument("--baseline", default="previous",
+                        help="'previous' recorded run, an invocation_id prefix, or a target directory (default: previous)")
+    parser.add_argument("--top", type=int, default=10, help="rows in the slowest and fastest-growing tables (default: 10)")
+    parser.add_argument("--growth-runs", type=int, default=10, help="recorded runs used for growth (default: 10)")
+    parser.add_argument("--threshold-pct", type=float, default=20.0, help="slowdown that counts as a regression (default: 20)")
+    parser.add_argument("--min-delta-s", type=float, default=5.0, help="ignore regressions smaller than this (default: 5)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit 1 when any model regressed")
+    return parser.parse_args(argv)
+
+
+def load_run(target_dir: Path) -> dict:
+    results = json.loads((target_dir / "run_results.json").read_text(encoding="utf-8"))
+    manifest_path = target_dir / "manifest.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8")) if manifest_path.exists() else {}
+    manifest_nodes = manifest.get("nodes", {})
+    metadata = results.get("metadata", {})
+    nodes = {}
+    for result in results.get("results", []):
+        unique_id = result["unique_id"]
+        node = manifest_nodes.get(unique_id, {})
+        resource_type = node.get("resource_type") or unique_id.split(".", 1)[0]
+        if resource_type not in TIMED_TYPES:
+            continue
+        adapter = result.get("adapter_response") or {}
+        nodes[unique_id] = {
+            "name": node.get("name") or unique_id.rsplit(".", 1)[-1],
+            "resource_type": resource_type,
+            "materialized": (node.get("config") or {}).get("materialized", ""),
+            "status": result.get("status", ""),
+            "execution_time": float(result.get("execution_time") or 0.0),
+            "rows_affected": adapter.get("rows_affected"),
+            "query_id": adapter.get("query_id"),
+            "depends_on": [
+                parent for parent in (node.get("depends_on") or {}).get("nodes", [])
+                if parent.split(".", 1)[0] in TIMED_TYPES
+            ],
+        }
+    return {
+        "invocation_id": metadata.get("invocation_id", ""),
+        "generated_at": metadata.get("generated_at", ""),
+        "command": (results.get("args") or {}).get("which", ""),
+        "elapsed_time": float(results.get("elapsed_time") or 0.0),
+        "nodes": nodes,
+    }
+
+
+def read_history(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    runs = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.strip():
+            runs.append(json.loads(line))
+    return runs
+
+
+def record(path: Path, run: dict, history: list[dict]) -> bool:
+    if any(r.get("invocation_id") == run["invocation_id"] for r in history):
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as fh:
+        fh.write(json.dumps(run, sort_keys=True) + "\n")
+    history.append(run)
+    return True
+
+
+def models_of(run: dict) -> dict:
+    return {uid: n for uid, n in run["nodes"].items() if n["resource_type"] == "model"}
+
+
+def slowest(run: dict, top: int) -> list[dict]:
+    models = models_of(run)
+    total = sum(n["execution_time"] for n in models.values()) or 1.0
+    rows = []
+    for node in sorted(models.values(), key=lambda n: n["execution_time"], reverse=True)[:top]:
+        rows.append({
+            "name": node["name"],
+            "materialized": node["materialized"],
+            "execution_s": node["execution_time"],
+            "share": f"{100.0 * node['execution_time'] / total:.1f}%",
+            "rows": node["rows_affected"] if node["rows_affected"] is not None else "",
+            "note": "incremental candidate" if node["materialized"] == "table" else "",
+            "query_id": node["query_id"] or "",
+        })
+    return rows
+
+
+def growth(history: list[dict], runs: int, top: int) -> list[dict]:
+    recent = history[-runs:]
+    series: dict[str, list[tuple[int, float]]] = {}
+    names = {}
+    for index, run in enumerate(recent):
+        for uid, node in models_of(run).items():
+            if node["status"] == "success":
+                series.setdefault(uid, []).append((index, node["execution_time"]))
+                names[uid] = node["name"]
+    rows = []
+    for uid, points in series.items():
+        if len(points) < 3:
+            continue
+        # least-squares slope in seconds per recorded run
+        mean_x = sum(x for x, _ in points) / len(points)
+        mean_y = sum(y for _, y in points) / len(points)
+        denom = sum((x - mean_x) ** 2 for x, _ in points)
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / denom if denom else 0.0
+        first, last = points[0][1], points[-1][1]
+        rows.append({
+            "name": names[uid],
+            "runs": len(points),
+            "first_s": first,
+            "latest_s": last,
+            "growth_s": slope,
+            "change": f"{100.0 * (last - first) / first:+.0f}%" if first else "",
+        })
+    rows = [r for r in rows if r["growth_s"] > 0]
+    return sorted(rows, key=lambda r: r["growth_s"], reverse=True)[:top]
+
+
+def build_edges(run: dict) -> dict[str, set[str]]:
+    nodes = run["nodes"]
+    parents = {uid: {p for p in node["depends_on"] if p in nodes} for uid, node in nodes.items()}
+    if run.get("command") == "build":
+        # `dbt build` starts a node only after the tests on its parents pass
+        tests_on: dict[str, set[str]] = {}
+        for uid, node in nodes.items():
+            if node["resource_type"] == "test":
+                for tested in parents[uid]:
+                    tests_on.setdefault(tested, set()).add(uid)
+        for uid, node in nodes.items():
+            if node["resource_type"] == "test":
+                continue
+            for parent in list(parents[uid]):
+                parents[uid] |= tests_on.get(parent, set())
+    return parents
+
+
+def critical_path(run: dict) -> list[dict]:
+    nodes = run["nodes"]
+    if not nodes:
+        return []
+    parents = build_edges(run)
+    finish: dict[str, float] = {}
+    via: dict[str, str | None] = {}
+
+    def visit(uid: str) -> float:
+        if uid in finish:
+            return finish[uid]
+        finish[uid] = 0.0  # guards against cycles in a hand-edited manifest
+        best, best_parent = 0.0, None
+        for parent in parents[uid]:
+            done = visit(parent)
+            if done > best:
+                best, best_parent = done, parent
+        finish[uid] = best + nodes[uid]["execution_time"]
+        via[uid] = best_parent
+        return finish[uid]
+
+    for uid in nodes:
+        visit(uid)
+    uid: str | None = max(finish, key=finish.get)
+    chain = []
+    while uid is not None:
+        chain.append(uid)
+        uid = via[uid]
+    rows = []
+    for uid in reversed(chain):
+        node = nodes[uid]
+        rows.append({
+            "name": node["name"],
+            "resource_type": node["resource_type"],
+            "execution_s": node["execution_time"],
+            "cumulative_s": finish[uid],
+        })
+    return rows
+
+
+def resolve_baseline(spec: str, run: dict, history: list[dict]) -> dict | None:
+    candidates = [r for r in history if r.get("invocation_id") != run["invocation_id"]]
+    if spec == "previous":
+        return candidates[-1] if candidates else None
+    path = Path(spec)
+    if path.is_dir() and (path / "run_results.json").exists():
+        return load_run(path)
+    matches = [r for r in candidates if str(r.get("invocation_id", "")).startswith(spec)]
+    return matches[-1] if matches else None
+
+
+def regressions(run: dict, baseline: dict, threshold_pct: float, min_delta_s: float) -> list[dict]:
+    before = models_of(baseline)
+    rows = []
+    for uid, node in models_of(run).items():
+        old = before.get(uid)
+        if not old or old["status"] != "success" or node["status"] != "success":
+            continue
+        delta = node["execution_time"] - old["execution_time"]
+        if delta < min_delta_s or node["execution_time"] < old["execution_time"] * (1 + threshold_pct / 100.0):
+            continue
+        rows.append({
+            "name": node["name"],
+            "baseline_s": old["execution_time"],
+            "current_s": node["execution_time"],
+            "delta_s": delta,
+            "change": f"{100.0 * delta / old['execution_time']:+.0f}%" if old["execution_time"] else "new cost",
+            "query_id": node["query_id"] or "",
+        })
+    return sorted(rows, key=lambda r: r["delta_s"], reverse=True)
+
+
+SLOWEST_COLUMNS = [
+    ("model", "name", "36"),
+    ("mat", "materialized", "11"),
+    ("exec s", "execution_s", "9"),
+    ("share", "share", "6"),
+    ("rows", "rows", "11"),
+    ("note", "note", "21"),
+    ("query id", "query_id", "36"),
+]
+GROWTH_COLUMNS = [
+    ("model", "name", "36"),
+    ("runs", "runs", "4"),
+    ("first s", "first_s", "9"),
+    ("latest s", "latest_s", "9"),
+    ("+s/run", "growth_s", "8"),
+    ("change", "change", "7"),
+]
+PATH_COLUMNS = [
+    ("node", "name", "48"),
+    ("type", "resource_type", "8"),
+    ("exec s", "execution_s", "9"),
+    ("cumul s", "cumulative_s", "9"),
+]
+REGRESSION_COLUMNS = [
+    ("model", "name", "36"),
+    ("base s", "baseline_s", "9"),
+    ("now s", "current_s", "9"),
+    ("delta s", "delta_s", "9"),
+    ("change", "change", "7"),
+    ("query id", "query_id", "36"),
+]
+
+
+def report(args: argparse.Namespace) -> int:
+    target_dir = Path(args.target_dir)
+    if not (target_dir / "run_results.json").exists():
+        print(f"No run_results.json in {target_dir}; run `dbt build` first.")
+        return 2
+    run = load_run(target_dir)
+    history_path = Path(args.history)
+    history = read_history(history_path)
+    baseline = resolve_baseline(args.baseline, run, history)
+    if not args.no_record and record(history_path, run, history):
+        print(f"Recorded run {run['invocation_id']} in {history_path} ({len(history)} runs).")
+
+    models = models_of(run)
+    print(f"\n{run['command'] or 'dbt'} {run['invocation_id']} at {run['generated_at']}: "
+          f"{len(models)} models, {sum(n['execution_time'] for n in models.values()):,.1f}s model time, "
+          f"{run['elapsed_time']:,.1f}s wall")
+
+    print_table(f"Slowest models (top {args.top})", slowest(run, args.top), SLOWEST_COLUMNS)
+
+    grown = growth(history, args.growth_runs, args.top)
+    if grown:
+        print_table(f"Fastest-growing models (last {min(len(history), args.growth_runs)} runs)", grown, GROWTH_COLUMNS)
+    else:
+        print("\nFastest-growing models: need at least 3 recorded runs.")
+
+    path = critical_path(run)
+    if path:
+        print_table(f"Critical path ({path[-1]['cumulative_s']:,.1f}s)", path, PATH_COLUMNS)
+
+    if baseline is None:
+        print(f"\nRegressions: no baseline run found for {args.baseline!r}.")
+        return 0
+    regressed = regressions(run, baseline, args.threshold_pct, args.min_delta_s)
+    label = f"Regressions vs {baseline.get('invocation_id', '')} (>{args.threshold_pct:g}% and >{args.min_delta_s:g}s)"
+    if regressed:
+        print_table(label, regressed, REGRESSION_COLUMNS)
+    else:
+        print(f"\n{label}: none")
+    return 1 if regressed and args.fail_on_regression else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    return report(parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
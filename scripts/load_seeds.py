@@ -0,0 +1,344 @@
+"""Bulk-load the demo seeds with stage + COPY INTO instead of `dbt seed`.
+
+Run from the finops-dbt repo root:
+    python scripts/load_seeds.py [--format parquet|csv] [--schema DEMO]
+    dbt build --exclude resource_type:seed --vars '{"DEMO_MODE": true}'
+
+`dbt seed` sends batched INSERTs. This script writes each seed as gzip CSV or
+Parquet, PUTs the files to a temporary internal stage and loads them with one
+COPY INTO per table. The tables it creates have the seed names and columns, so
+the demo overlays (metering_overlay, query_history_overlay, storage_overlay) and
+budget models read them unchanged through ref().
+
+Large synthetic sets load the same way. Point a table at a file, glob or shard
+directory, e.g. from seeds/generate_query_history_seed_sharded.py:
+    python scripts/load_seeds.py \\
+        --source query_history_demo_seed=target/loadtest/query_history \\
+        --source metering_demo_seed=target/loadtest/metering.parquet
+
+`--target duckdb` loads the same files into a local DuckDB file
+(target/seeds.duckdb by default) for offline tests; it needs `pip install duckdb`.
+Parquet output needs pyarrow.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from check_snowflake import connect_from_env, load_dotenv  # noqa: E402
+
+# Same fallback as the dbt `demo` target, so ref() finds the loaded tables.
+DEFAULT_DATABASE = "DEMO_DB"
+
+# Seed name -> columns in CSV header order, with a portable type per column.
+TABLES = {
+    "metering_demo_seed": [
+        ("START_TIME", "timestamp"),
+        ("END_TIME", "timestamp"),
+        ("WAREHOUSE_NAME", "varchar"),
+        ("TOTAL_CREDITS_USED", "double"),
+        ("TOTAL_COST_USD", "double"),
+    ],
+    "query_history_demo_seed": [
+        ("QUERY_ID", "varchar"),
+        ("START_TIME", "timestamp"),
+        ("END_TIME", "timestamp"),
+        ("USER_NAME", "varchar"),
+        ("ROLE_NAME", "varchar"),
+        ("WAREHOUSE_NAME", "varchar"),
+        ("WAREHOUSE_SIZE", "varchar"),
+        ("QUERY_TYPE", "varchar"),
+        ("DATABASE_NAME", "varchar"),
+        ("SCHEMA_NAME", "varchar"),
+        ("EXECUTION_STATUS", "varchar"),
+        ("BYTES_SCANNED", "bigint"),
+        ("ROWS_PRODUCED", "bigint"),
+        ("TOTAL_ELAPSED_TIME", "bigint"),
+        ("EXECUTION_TIME", "bigint"),
+        ("QUERY_TAG", "varchar"),
+    ],
+    "storage_demo_seed": [
+        ("USAGE_DATE", "date"),
+        ("DATABASE_ID", "bigint"),
+        ("DATABASE_NAME", "varchar"),
+        ("AVERAGE_DATABASE_BYTES", "bigint"),
+        ("AVERAGE_FAILSAFE_BYTES", "bigint"),
+        ("AVERAGE_STAGE_BYTES", "bigint"),
+    ],
+    "budget_daily": [
+        ("department", "varchar"),
+        ("date", "date"),
+        ("budget_usd", "double"),
+    ],
+    "department_mapping": [
+        ("warehouse_name", "varchar"),
+        ("department", "varchar"),
+    ],
+}
+
+SNOWFLAKE_TYPES = {
+    "timestamp": "timestamp_ntz",
+    "varchar": "varchar",
+    "double": "float",
+    "bigint": "number(38,0)",
+    "date": "date",
+}
+DUCKDB_TYPES = {
+    "timestamp": "timestamp",
+    "varchar": "varchar",
+    "double": "double",
+    "bigint": "bigint",
+    "date": "date",
+}
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", choices=["snowflake", "duckdb"], default="snowflake")
+    parser.add_argument("--format", choices=["parquet", "csv"], default="csv",
+                        help="file format to stage: gzip CSV (default) or Parquet (needs pyarrow)")
+    parser.add_argument("--schema", default="DEMO", help="schema for the seed tables (default: DEMO)")
+    parser.add_argument("--database", default=None, help=f"database (default: SNOWFLAKE_DATABASE, else {DEFAULT_DATABASE})")
+    parser.add_argument("--duckdb-path", default=str(ROOT / "target" / "seeds.duckdb"))
+    parser.add_argument("--tables", default=",".join(TABLES), help="comma-separated seed tables to load")
+    parser.add_argument("--source", action="append", default=[], metavar="TABLE=PATH",
+                        help="load TABLE from a file, glob or directory instead of seeds/<TABLE>.csv")
+    return parser.parse_args(argv)
+
+
+def resolve_sources(table: str, overrides: dict[str, str]) -> list[Path]:
+    spec = overrides.get(table)
+    if spec is None:
+        return [ROOT / "seeds" / f"{table}.csv"]
+    path = Path(spec)
+    if path.is_dir():
+        files = sorted(p for p in path.iterdir() if p.name.endswith((".csv", ".csv.gz", ".parquet")))
+    elif any(ch in spec for ch in "*?["):
+        files = sorted(Path().glob(spec))
+    else:
+        files = [path]
+    if not files:
+        raise SystemExit(f"no files for {table} at {spec}")
+    return files
+
+
+def file_format(path: Path) -> str:
+    return "parquet" if path.name.endswith(".parquet") else "csv"
+
+
+def prepare_files(table: str, sources: list[Path], fmt: str, workdir: Path) -> list[Path]:
+    # Files already in the requested format (compressed shards) are linked as
+    # is; plain CSVs are gzipped or converted to Parquet.
+    out_dir = workdir / table
+    out_dir.mkdir(parents=True, exist_ok=True)
+    prepared = []
+    for i, src in enumerate(sources):
+        src = src.resolve()
+        if file_format(src) == fmt and (fmt == "parquet" or src.name.endswith(".gz")):
+            dest = out_dir / f"{i:05d}_{src.name}"
+            try:
+                os.symlink(src, dest)
+            except OSError:
+                shutil.copyfile(src, dest)
+        elif fmt == "parquet":
+            dest = out_dir / f"{i:05d}.parquet"
+            csv_to_parquet(src, dest, TABLES[table])
+        elif file_format(src) == "csv":
+            dest = out_dir / f"{i:05d}.csv.gz"
+            with open(src, "rb") as f, gzip.open(dest, "wb", compresslevel=6) as g:
+                shutil.copyfileobj(f, g, 1024 * 1024)
+        else:
+            raise SystemExit(f"{src} is Parquet; load it with --format parquet")
+        prepared.append(dest)
+    return prepared
+
+
+def csv_to_parquet(src: Path, dest: Path, columns: list[tuple[str, str]]) -> None:
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pcsv
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("--format parquet needs pyarrow: pip install pyarrow")
+    arrow_types = {
+        "timestamp": pa.timestamp("us"),
+        "varchar": pa.string(),
+        "double": pa.float64(),
+        "bigint": pa.int64(),
+        "date": pa.date32(),
+    }
+    table = pcsv.read_csv(
+        src,
+        convert_options=pcsv.ConvertOptions(
+            column_types={name: arrow_types[kind] for name, kind in columns},
+            strings_can_be_null=True,
+        ),
+    )
+    pq.write_table(table, dest, compression="snappy")
+
+
+class SnowflakeTarget:
+    stage = "spendscope_seed_stage"
+
+    def __init__(self, conn, database: str, schema: str):
+        self.conn = conn
+        self.schema = f"{database or DEFAULT_DATABASE}.{schema}"
+
+    def execute(self, sql: str) -> list:
+        cur = self.conn.cursor()
+        try:
+            cur.execute(sql)
+            return cur.fetchall()
+        finally:
+            cur.close()
+
+    def prepare(self) -> None:
+        self.execute(f"create schema if not exists {self.schema}")
+        self.execute(f"create temporary stage if not exists {self.schema}.{self.stage}")
+
+    def create_table(self, table: str, columns: list[tuple[str, str]]) -> None:
+        cols = ", ".join(f"{name} {SNOWFLAKE_TYPES[kind]}" for name, kind in columns)
+        self.execute(f"create or replace table {self.schema}.{table} ({cols})")
+
+    def upload(self, table: str, files: list[Path]) -> None:
+        pattern = (files[0].parent / "*").as_posix()
+        self.execute(
+            f"put 'file://{pattern}' @{self.schema}.{self.stage}/{table}/ "
+            "parallel=8 auto_compress=false overwrite=true"
+        )
+
+    def copy(self, table: str, files: list[Path], fmt: str) -> int:
+        if fmt == "parquet":
+            options = "file_format = (type = parquet) match_by_column_name = case_insensitive"
+        else:
+            options = (
+                "file_format = (type = csv skip_header = 1 field_optionally_enclosed_by = '\"' "
+                "compression = gzip empty_field_as_null = true)"
+            )
+        result = self.execute(
+            f"copy into {self.schema}.{table} from @{self.schema}.{self.stage}/{table}/ "
+            f"{options} on_error = abort_statement purge = true"
+        )
+        # One result row per file: (file, status, rows_parsed, rows_loaded, ...)
+        return sum(int(row[3] or 0) for row in result if len(row) > 3 and str(row[1]).upper().startswith("LOADED"))
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class DuckDBTarget:
+    # Offline stand-in: same tables, same prepared files, read with DuckDB's
+    # CSV/Parquet readers instead of PUT + COPY.
+    def __init__(self, path: str, schema: str):
+        try:
+            import duckdb
+        except ImportError:
+            raise SystemExit("--target duckdb needs duckdb: pip install duckdb")
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = duckdb.connect(path)
+        self.schema = schema
+
+    def prepare(self) -> None:
+        self.conn.execute(f"create schema if not exists {self.schema}")
+
+    def create_table(self, table: str, columns: list[tuple[str, str]]) -> None:
+        cols = ", ".join(f"{name} {DUCKDB_TYPES[kind]}" for name, kind in columns)
+        self.conn.execute(f"create or replace table {self.schema}.{table} ({cols})")
+
+    def upload(self, table: str, files: list[Path]) -> None:
+        return None
+
+    def copy(self, table: str, files: list[Path], fmt: str) -> int:
+        columns = TABLES[table]
+        names = ", ".join(name for name, _ in columns)
+        paths = "[" + ", ".join(f"'{p.as_posix()}'" for p in files) + "]"
+        if fmt == "parquet":
+            source = f"read_parquet({paths})"
+        else:
+            types = ", ".join(f"'{name}': '{DUCKDB_TYPES[kind]}'" for name, kind in columns)
+            source = f"read_csv({paths}, header = true, columns = {{{types}}})"
+        count = self.conn.execute(f"insert into {self.schema}.{table} ({names}) select {names} from {source}").fetchone()
+        return int(count[0]) if count else 0
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def load(target, tables: list[str], overrides: dict[str, str], fmt: str) -> list[dict]:
+    results = []
+    target.prepare()
+    with tempfile.TemporaryDirectory(prefix="spendscope-seeds-") as tmp:
+        for table in tables:
+            started = time.perf_counter()
+            files = prepare_files(table, resolve_sources(table, overrides), fmt, Path(tmp))
+            prepared = time.perf_counter()
+            target.create_table(table, TABLES[table])
+            target.upload(table, files)
+            uploaded = time.perf_counter()
+            rows = target.copy(table, files, fmt)
+            copied = time.perf_counter()
+            results.append({
+                "table": table,
+                "files": len(files),
+                "rows": rows,
+                "prepare_s": prepared - started,
+                "upload_s": uploaded - prepared,
+                "copy_s": copied - uploaded,
+            })
+    return results
+
+
+def print_table(results: list[dict]) -> None:
+    print(f"{'table':<26}{'files':>6}{'rows':>12}{'prepare s':>11}{'upload s':>10}{'copy s':>9}")
+    for r in results:
+        print(
+            f"{r['table']:<26}{r['files']:>6}{r['rows']:>12,}"
+            f"{r['prepare_s']:>11.2f}{r['upload_s']:>10.2f}{r['copy_s']:>9.2f}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    tables = [t.strip() for t in args.tables.split(",") if t.strip()]
+    unknown = [t for t in tables if t not in TABLES]
+    if unknown:
+        print(f"Unknown seed tables: {', '.join(unknown)}")
+        return 2
+    overrides = dict(spec.split("=", 1) for spec in args.source)
+
+    if args.target == "duckdb":
+        target = DuckDBTarget(args.duckdb_path, args.schema)
+    else:
+        load_dotenv(ROOT / ".env")
+        try:
+            import snowflake.connector as sf
+        except ImportError:
+            print("snowflake-connector-python is not installed: pip install -r requirements.txt")
+            return 1
+        target = SnowflakeTarget(
+            connect_from_env(sf),
+            args.database or os.environ.get("SNOWFLAKE_DATABASE") or DEFAULT_DATABASE,
+            args.schema,
+        )
+
+    started = time.perf_counter()
+    try:
+        results = load(target, tables, overrides, args.format)
+    finally:
+        target.close()
+    print_table(results)
+    print(f"Loaded {sum(r['rows'] for r in results):,} rows in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,6 +6,9 @@ import datetime as dt
 import os
 from collections import defaultdict
 from pathlib import Path
+from typing import Iterable, List, Sequence
+
+from generate_metering_seed import read_rows as read_metering_rows
 
 OUT_DIR = Path("seeds")
 OUT_DIR.mkdir(exist_ok=True)
@@ -37,22 +40,18 @@ def load_mapping(path: Path) -> dict[str, str]:
         }
 
 
-def compute_daily_department_actuals() -> dict[str, float]:
-    mapping = load_mapping(MAPPING_PATH)
+def compute_daily_department_actuals(metering_rows: Iterable[Sequence], mapping: dict[str, str]) -> dict[str, float]:
+    # metering_rows are generate_metering_seed rows: start, end, warehouse, credits, cost.
     daily_totals: dict[tuple[str, dt.date], float] = defaultdict(float)
     max_day = None
 
-    with open(METERING_PATH, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            start_time = dt.datetime.fromisoformat(row["START_TIME"])
-            usage_day = start_time.date()
-            max_day = usage_day if max_day is None or usage_day > max_day else max_day
-            warehouse_name = row["WAREHOUSE_NAME"].strip().upper()
-            department = mapping.get(warehouse_name)
-            if department is None:
-                continue
-            daily_totals[(department, usage_day)] += float(row["TOTAL_COST_USD"])
+    for start_time, _, warehouse_name, _, cost in metering_rows:
+        usage_day = start_time.date()
+        max_day = usage_day if max_day is None or usage_day > max_day else max_day
+        department = mapping.get(warehouse_name.strip().upper())
+        if department is None:
+            continue
+        daily_totals[(department, usage_day)] += cost
 
     if max_day is None:
         raise RuntimeError("metering_demo_seed.csv is empty; regenerate metering before budget")
@@ -73,35 +72,45 @@ def compute_daily_department_actuals() -> dict[str, float]:
     return actual_daily
 
 
-actual_daily = compute_daily_department_actuals()
-weighted_total = sum(
-    actual_daily[department] * multiplier
-    for department, multiplier in DEPARTMENT_VARIANCE_MULTIPLIERS.items()
-)
-target_total = sum(actual_daily.values()) * TARGET_TOTAL_MULTIPLIER
-scale = target_total / weighted_total if weighted_total else 1.0
+def build_rows(metering_rows: Iterable[Sequence], mapping: dict[str, str]) -> List[list]:
+    actual_daily = compute_daily_department_actuals(metering_rows, mapping)
+    weighted_total = sum(
+        actual_daily[department] * multiplier
+        for department, multiplier in DEPARTMENT_VARIANCE_MULTIPLIERS.items()
+    )
+    target_total = sum(actual_daily.values()) * TARGET_TOTAL_MULTIPLIER
+    scale = target_total / weighted_total if weighted_total else 1.0
+
+    department_budgets = {
+        department: round(actual_daily[department] * multiplier * scale, 2)
+        for department, multiplier in DEPARTMENT_VARIANCE_MULTIPLIERS.items()
+    }
+
+    start_date = dt.date.today() - dt.timedelta(days=DAYS_BACK)
+    end_date = dt.date.today() + dt.timedelta(days=DAYS_FORWARD)
+    rows = []
+
+    d = start_date
+    while d <= end_date:
+        for department, budget in sorted(department_budgets.items()):
+            rows.append([department, d.isoformat(), budget])
+        d += dt.timedelta(days=1)
+    return rows
+
+
+def write_rows(rows: List[list], path: Path = OUT_PATH) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f, lineterminator="\n")
+        w.writerow(["department", "date", "budget_usd"])
+        w.writerows(rows)
+
+
+def main() -> None:
+    rows = build_rows(read_metering_rows(METERING_PATH), load_mapping(MAPPING_PATH))
+    write_rows(rows)
+    days = len({row[1] for row in rows})
+    print(f"Wrote {len(rows)} rows to {OUT_PATH} ({len(rows) // max(days, 1)} depts x {days} days)")
 
-department_budgets = {
-    department: round(actual_daily[department] * multiplier * scale, 2)
-    for department, multiplier in DEPARTMENT_VARIANCE_MULTIPLIERS.items()
-}
 
-start_date = dt.date.today() - dt.timedelta(days=DAYS_BACK)
-end_date = dt.date.today() + dt.timedelta(days=DAYS_FORWARD)
-rows = []
-
-d = start_date
-while d <= end_date:
-    for department, budget in sorted(department_budgets.items()):
-        rows.append([department, d.isoformat(), budget])
-    d += dt.timedelta(days=1)
-
-with open(OUT_PATH, "w", newline="", encoding="utf-8") as f:
-    w = csv.writer(f)
-    w.writerow(["department", "date", "budget_usd"])
-    w.writerows(rows)
-
-print(
-    f"Wrote {len(rows)} rows to {OUT_PATH} "
-    f"({len(department_budgets)} depts x {(end_date - start_date).days + 1} days)"
-)
+if __name__ == "__main__":
+    main()
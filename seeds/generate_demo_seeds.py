@@ -0,0 +1,94 @@
+# seeds/generate_demo_seeds.py
+# Purpose: Regenerate every demo seed in one pass.
+#
+# Runs the metering, storage, query history and budget generators in one
+# pipeline instead of four programs. Metering rows are built once and handed to
+# the query history and budget generators in memory, so nothing re-reads
+# metering_demo_seed.csv. Storage runs on a worker process alongside metering,
+# and query history and budget run side by side once metering is done. The
+# output is identical to running the four scripts one after another.
+#
+#   python seeds/generate_demo_seeds.py            # parallel
+#   python seeds/generate_demo_seeds.py --serial   # one process, for comparison
+
+import argparse
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import generate_budget_seed as budget
+import generate_metering_seed as metering
+import generate_query_history_seed as query_history
+import generate_storage_seed as storage
+
+Timing = Dict[str, Any]
+
+
+def run_stage(name: str, build: Callable[..., List[list]], write: Callable[[List[list]], None], *args) -> Tuple[List[list], Timing]:
+    started = time.perf_counter()
+    rows = build(*args)
+    built = time.perf_counter()
+    write(rows)
+    done = time.perf_counter()
+    return rows, {"stage": name, "rows": len(rows), "build_s": built - started, "write_s": done - built}
+
+
+def metering_stage() -> Tuple[List[list], Timing]:
+    return run_stage("metering", metering.build_rows, metering.write_rows)
+
+
+def storage_stage() -> Timing:
+    return run_stage("storage", storage.build_rows, storage.write_rows)[1]
+
+
+def query_history_stage(metering_rows: List[list]) -> Timing:
+    return run_stage("query_history", query_history.build_rows, query_history.write_rows, metering_rows)[1]
+
+
+def budget_stage(metering_rows: List[list], mapping: Dict[str, str]) -> Timing:
+    return run_stage("budget", budget.build_rows, budget.write_rows, metering_rows, mapping)[1]
+
+
+class InlineExecutor(Executor):
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+def run_pipeline(serial: bool = False) -> List[Timing]:
+    mapping = budget.load_mapping(budget.MAPPING_PATH)
+    executor = InlineExecutor() if serial else ProcessPoolExecutor(max_workers=2)
+    with executor:
+        storage_done = executor.submit(storage_stage)
+        metering_rows, metering_timing = metering_stage()
+        downstream = [
+            executor.submit(query_history_stage, metering_rows),
+            executor.submit(budget_stage, metering_rows, mapping),
+        ]
+        return [metering_timing, storage_done.result()] + [f.result() for f in downstream]
+
+
+def print_report(timings: List[Timing], wall_s: float) -> None:
+    print(f"{'stage':<15}{'rows':>9}{'build s':>10}{'write s':>10}")
+    for t in timings:
+        print(f"{t['stage']:<15}{t['rows']:>9,}{t['build_s']:>10.3f}{t['write_s']:>10.3f}")
+    stage_total = sum(t["build_s"] + t["write_s"] for t in timings)
+    print(f"stages {stage_total:.3f}s, wall {wall_s:.3f}s")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Regenerate all demo seeds in one pass.")
+    parser.add_argument("--serial", action="store_true", help="Run every stage in this process")
+    args = parser.parse_args(argv)
+    started = time.perf_counter()
+    timings = run_pipeline(serial=args.serial)
+    print_report(timings, time.perf_counter() - started)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
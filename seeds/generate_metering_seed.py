@@ -6,7 +6,7 @@ import datetime as dt
 import os
 import random
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 OUT_DIR = Path("seeds")
 OUT_DIR.mkdir(exist_ok=True)
@@ -46,7 +46,7 @@ DS_BURSTS_PER_MONTH = int(os.getenv("DS_BURSTS_PER_MONTH", "3"))
 DS_BURST_MULT = float(os.getenv("DS_BURST_MULT", "1.80"))
 ANNUAL_DAYLIGHT_NOISE = float(os.getenv("DAILY_NOISE_SD", "0.20"))
 
-random.seed(SEED)
+COLUMNS = ["START_TIME", "END_TIME", "WAREHOUSE_NAME", "TOTAL_CREDITS_USED", "TOTAL_COST_USD"]
 
 
 def month_days(d: dt.date) -> int:
@@ -143,36 +143,66 @@ def add_noise_and_preserve_total(hour_slices: List[float], total: float, jitter_
     return rounded
 
 
-start_date = dt.date.today() - dt.timedelta(days=DAYS)
-rows = []
+def build_rows(start_date: Optional[dt.date] = None) -> List[list]:
+    # Rows hold datetimes, not strings, so the pipeline can hand them to the
+    # query history and budget generators without re-parsing; csv writes them
+    # in the same "YYYY-MM-DD HH:MM:SS" form.
+    rng = random.Random(SEED)
+    start_date = start_date or dt.date.today() - dt.timedelta(days=DAYS)
+    rows = []
 
-for wh in WAREHOUSES:
-    dept = WH_TO_DEPT.get(wh, "Unmapped")
-    base_daily = WAREHOUSE_BASELINES[wh]
+    for wh in WAREHOUSES:
+        dept = WH_TO_DEPT.get(wh, "Unmapped")
+        base_daily = WAREHOUSE_BASELINES[wh]
 
-    hw = hourly_weights_for(dept)
-    hw_sum = sum(hw)
-    hw = [w / hw_sum for w in hw]
+        hw = hourly_weights_for(dept)
+        hw_sum = sum(hw)
+        hw = [w / hw_sum for w in hw]
 
-    for d in range(DAYS + 1):
-        day = start_date + dt.timedelta(days=d)
-        day_mult = daily_multiplier(dept, day)
-        day_wiggle = random.gauss(1.0, ANNUAL_DAYLIGHT_NOISE)
-        day_total_credits = max(0.2, base_daily * day_mult * day_wiggle)
+        for d in range(DAYS + 1):
+            day = start_date + dt.timedelta(days=d)
+            day_mult = daily_multiplier(dept, day)
+            day_wiggle = rng.gauss(1.0, ANNUAL_DAYLIGHT_NOISE)
+            day_total_credits = max(0.2, base_daily * day_mult * day_wiggle)
 
-        per_hour = [day_total_credits * w for w in hw]
-        per_hour = add_noise_and_preserve_total(per_hour, day_total_credits, jitter_scale=0.25)
+            per_hour = [day_total_credits * w for w in hw]
+            per_hour = add_noise_and_preserve_total(per_hour, day_total_credits, jitter_scale=0.25)
 
-        for h, credits in enumerate(per_hour):
-            start = dt.datetime.combine(day, dt.time(hour=h))
-            end = start + dt.timedelta(hours=1)
-            credits = max(0.0, round(credits, 3))
-            cost = round(credits * COST_PER_CREDIT, 2)
-            rows.append([start.isoformat(sep=" "), end.isoformat(sep=" "), wh, credits, cost])
+            for h, credits in enumerate(per_hour):
+                start = dt.datetime.combine(day, dt.time(hour=h))
+                end = start + dt.timedelta(hours=1)
+                credits = max(0.0, round(credits, 3))
+                cost = round(credits * COST_PER_CREDIT, 2)
+                rows.append([start, end, wh, credits, cost])
+    return rows
 
-with open(OUT_PATH, "w", newline="", encoding="utf-8") as f:
-    w = csv.writer(f)
-    w.writerow(["START_TIME", "END_TIME", "WAREHOUSE_NAME", "TOTAL_CREDITS_USED", "TOTAL_COST_USD"])
-    w.writerows(rows)
 
-print(f"Wrote {len(rows)} rows to {OUT_PATH} for {len(WAREHOUSES)} warehouses over {DAYS + 1} days.")
+def write_rows(rows: List[list], path: Path = OUT_PATH) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f, lineterminator="\n")
+        w.writerow(COLUMNS)
+        w.writerows(rows)
+
+
+def read_rows(path: Path = OUT_PATH) -> List[list]:
+    with open(path, newline="", encoding="utf-8") as f:
+        return [
+            [
+                dt.datetime.fromisoformat(row["START_TIME"]),
+                dt.datetime.fromisoformat(row["END_TIME"]),
+                row["WAREHOUSE_NAME"],
+                float(row["TOTAL_CREDITS_USED"]),
+                float(row["TOTAL_COST_USD"]),
+            ]
+            for row in csv.DictReader(f)
+        ]
+
+
+def main() -> None:
+    rows = build_rows()
+    write_rows(rows)
+    print(f"Wrote {len(rows)} rows to {OUT_PATH} for {len(WAREHOUSES)} warehouses over {DAYS + 1} days.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+# seeds/generate_metering_seed_scaled.py
+# Purpose: Generate WAREHOUSE_METERING_HISTORY-shaped load-test data at any scale.
+#
+# Vectorized counterpart of generate_metering_seed.py: the same department shapes
+# (weekend dips, end-of-month spikes, mid-month Finance closes, Data Science
+# bursts, per-department hourly curves) computed with NumPy a block of days at a
+# time and streamed to CSV or Parquet, so memory stays bounded by --chunk-rows.
+#
+#   python seeds/generate_metering_seed_scaled.py --scale 5000,40,730 \
+#       --out target/loadtest/metering.parquet
+#
+# Every day draws from its own RNG stream derived from (seed, day), so output is
+# identical for a seed regardless of chunk size. At the default scale (8
+# warehouses, 5 departments, 75 days) the warehouses and baselines match the demo
+# seed; additional warehouses get lognormal baselines around the demo mean and
+# additional departments cycle through the five department archetypes.
+
+import argparse
+import datetime as dt
+import gzip
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+DEMO_WAREHOUSES = [
+    ("COMPUTE_WH", 75.0, "Data Platform"),
+    ("TRANSFORMING", 64.0, "Data Platform"),
+    ("ETL_WH", 86.0, "Data Platform"),
+    ("INTL_WH", 32.0, "Analytics"),
+    ("ML_WH", 43.0, "Data Science"),
+    ("BI_WH", 48.0, "Business Intelligence"),
+    ("REPORTING_WH", 37.0, "Business Intelligence"),
+    ("BATCH_WH", 27.0, "Finance"),
+]
+ARCHETYPES = ["Data Platform", "Business Intelligence", "Finance", "Data Science", "Analytics"]
+
+COST_PER_CREDIT = float(os.getenv("COST_PER_CREDIT", "3.0"))
+SEED = int(os.getenv("DEMO_SEED", "42"))
+
+WEEKEND_DIP = float(os.getenv("WEEKEND_DIP", "0.70"))
+BI_EOM_SPIKE = float(os.getenv("BI_EOM_SPIKE", "1.60"))
+DP_EOM_SPIKE = float(os.getenv("DP_EOM_SPIKE", "1.10"))
+FIN_MID_EOM_SPIKE = float(os.getenv("FIN_MID_EOM_SPIKE", "1.30"))
+DS_BURSTS_PER_MONTH = int(os.getenv("DS_BURSTS_PER_MONTH", "3"))
+DS_BURST_MULT = float(os.getenv("DS_BURST_MULT", "1.80"))
+DAILY_NOISE_SD = float(os.getenv("DAILY_NOISE_SD", "0.20"))
+HOURLY_NOISE_SD = 0.25
+
+# Rows are ARCHETYPES order; same curves as hourly_weights_for() in the demo generator.
+HOURLY_WEIGHTS = np.array([
+    [1.1, 1.1, 1.2, 1.2, 1.1, 1.0, 0.8, 0.7, 0.7, 0.7, 0.7, 0.7,
+     0.7, 0.7, 0.7, 0.7, 0.8, 0.9, 1.0, 1.1, 1.2, 1.3, 1.2, 1.1],
+    [0.8, 0.8, 0.9, 0.9, 0.9, 0.8, 0.6, 0.7, 0.9, 1.0, 1.0, 0.9,
+     0.8, 0.8, 0.8, 0.8, 0.7, 0.7, 0.9, 1.0, 1.1, 1.2, 1.1, 0.9],
+    [0.9, 1.0, 1.2, 1.2, 1.1, 1.0, 0.7, 0.6, 0.5, 0.5, 0.6, 0.7,
+     0.8, 0.8, 0.7, 0.7, 0.6, 0.6, 0.6, 0.7, 0.8, 0.8, 0.8, 0.9],
+    [0.6, 0.6, 0.7, 0.8, 0.8, 0.8, 0.7, 0.7, 0.6, 0.6, 0.7, 0.8,
+     0.9, 1.0, 1.0, 1.0, 1.1, 1.2, 1.3, 1.3, 1.2, 1.1, 0.9, 0.7],
+    [0.5, 0.5, 0.6, 0.6, 0.6, 0.7, 0.8, 0.9, 0.9, 1.0, 1.0, 1.0,
+     1.1, 1.2, 1.2, 1.2, 1.2, 1.1, 1.0, 0.9, 0.9, 0.8, 0.7, 0.6],
+])
+HOURLY_WEIGHTS = HOURLY_WEIGHTS / HOURLY_WEIGHTS.sum(axis=1, keepdims=True)
+
+COLUMNS = ["START_TIME", "END_TIME", "WAREHOUSE_NAME", "TOTAL_CREDITS_USED", "TOTAL_COST_USD"]
+HOUR = np.timedelta64(1, "h")
+
+
+class Scale(NamedTuple):
+    warehouses: int = len(DEMO_WAREHOUSES)
+    departments: int = len(ARCHETYPES)
+    days: int = 75
+
+
+def parse_scale(text: str) -> Scale:
+    parts = [p.strip() for p in text.split(",")]
+    if len(parts) != 3 or not all(p.isdigit() and int(p) > 0 for p in parts):
+        raise argparse.ArgumentTypeError("--scale takes WAREHOUSES,DEPARTMENTS,DAYS, e.g. 5000,40,730")
+    return Scale(*(int(p) for p in parts))
+
+
+class Fleet(NamedTuple):
+    names: np.ndarray          # warehouse names
+    baselines: np.ndarray      # mean daily credits per warehouse
+    dept_index: np.ndarray     # department of each warehouse
+    departments: List[str]     # department names
+    dept_archetype: np.ndarray  # archetype (row of HOURLY_WEIGHTS) of each department
+
+
+def department_names(count: int) -> List[str]:
+    names = []
+    for i in range(count):
+        base = ARCHETYPES[i % len(ARCHETYPES)]
+        names.append(base if i < len(ARCHETYPES) else f"{base} {i // len(ARCHETYPES) + 1}")
+    return names
+
+
+def build_fleet(scale: Scale, seed: int = SEED) -> Fleet:
+    departments = department_names(scale.departments)
+    dept_archetype = np.arange(scale.departments) % len(ARCHETYPES)
+    demo = DEMO_WAREHOUSES[: scale.warehouses]
+    names = [name for name, _, _ in demo]
+    baselines = [base for _, base, _ in demo]
+    dept_index = [
+        departments.index(dept) if dept in departments else ARCHETYPES.index(dept) % scale.departments
+        for _, _, dept in demo
+    ]
+    extra = scale.warehouses - len(demo)
+    if extra > 0:
+        rng = np.random.default_rng([seed, 0xF1EE7])
+        mean = float(np.mean([base for _, base, _ in DEMO_WAREHOUSES]))
+        names += [f"WH_{i:05d}" for i in range(len(demo) + 1, scale.warehouses + 1)]
+        baselines += list(np.round(rng.lognormal(np.log(mean) - 0.18, 0.6, extra), 1))
+        dept_index += list(np.arange(len(demo), scale.warehouses) % scale.departments)
+    return Fleet(
+        np.array(names, dtype=object),
+        np.array(baselines, dtype=float),
+        np.array(dept_index, dtype=int),
+        departments,
+        dept_archetype,
+    )
+
+
+def month_lengths(days: np.ndarray) -> np.ndarray:
+    months = days.astype("datetime64[M]")
+    return ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(int)
+
+
+def ds_burst_mask(fleet: Fleet, days: np.ndarray, seed: int) -> np.ndarray:
+    # Burst days are picked per (department, month) so they are the same no
+    # matter which chunk a month falls in.
+    mask = np.zeros((len(fleet.departments), len(days)), dtype=bool)
+    ds = np.flatnonzero(fleet.dept_archetype == ARCHETYPES.index("Data Science"))
+    if not len(ds) or DS_BURSTS_PER_MONTH <= 0:
+        return mask
+    months = days.astype("datetime64[M]")
+    dom = (days - months.astype("datetime64[D]")).astype(int) + 1
+    mlen = month_lengths(days)
+    for month in np.unique(months):
+        in_month = months == month
+        length = int(mlen[in_month][0])
+        candidates = np.arange(2, length - 1)
+        year, mon = int(str(month)[:4]), int(str(month)[5:7])
+        for d in ds:
+            rng = np.random.default_rng([seed, year * 100 + mon, int(d)])
+            picks = rng.choice(candidates, size=min(DS_BURSTS_PER_MONTH, len(candidates)), replace=False)
+            mask[d, in_month] = np.isin(dom[in_month], picks)
+    return mask
+
+
+def department_multipliers(fleet: Fleet, days: np.ndarray, seed: int) -> np.ndarray:
+    weekday = (days.astype("datetime64[D]").astype(int) + 3) % 7  # 1970-01-01 was a Thursday
+    months = days.astype("datetime64[M]")
+    dom = (days - months.astype("datetime64[D]")).astype(int) + 1
+    eom = dom > month_lengths(days) - 4
+    weekend = np.where(weekday >= 5, WEEKEND_DIP, 1.0)
+
+    by_archetype = np.empty((len(ARCHETYPES), len(days)))
+    by_archetype[0] = weekend * np.where(eom, DP_EOM_SPIKE, 1.0)
+    by_archetype[1] = np.where(weekday == 0, 1.05, 1.0) * weekend * np.where(eom, BI_EOM_SPIKE, 1.0)
+    by_archetype[2] = (
+        weekend
+        * np.where(np.isin(dom, (14, 15, 16)), FIN_MID_EOM_SPIKE, 1.0)
+        * np.where(eom, FIN_MID_EOM_SPIKE, 1.0)
+    )
+    by_archetype[3] = 0.95 * weekend
+    by_archetype[4] = (1.0 + np.where(np.isin(weekday, (3, 4)), 0.05, 0.0)) * weekend
+
+    mult = by_archetype[fleet.dept_archetype]
+    return mult * np.where(ds_burst_mask(fleet, days, seed), DS_BURST_MULT, 1.0)
+
+
+def day_credits(fleet: Fleet, day_index: int, day_mult: np.ndarray, seed: int) -> np.ndarray:
+    # One day for every warehouse: (warehouses, 24) credits that sum to the day total.
+    rng = np.random.default_rng([seed, day_index])
+    wiggle = rng.normal(1.0, DAILY_NOISE_SD, len(fleet.names))
+    totals = np.maximum(0.2, fleet.baselines * day_mult[fleet.dept_index] * wiggle)
+    weights = HOURLY_WEIGHTS[fleet.dept_archetype[fleet.dept_index]]
+    noisy = np.maximum(0.0, weights * rng.normal(1.0, HOURLY_NOISE_SD, weights.shape))
+    noisy *= (totals / np.maximum(noisy.sum(axis=1), 1e-9))[:, None]
+    rounded = np.round(noisy, 6)
+    rounded[:, -1] = np.maximum(0.0, rounded[:, -1] + totals - rounded.sum(axis=1))
+    return np.maximum(0.0, np.round(rounded, 3))
+
+
+def credits_block(fleet: Fleet, start: np.datetime64, first: int, count: int, seed: int) -> np.ndarray:
+    # (count, warehouses, 24) hourly credits for days first..first+count-1 after start.
+    days = start + np.arange(first, first + count)
+    mult = department_multipliers(fleet, days, seed)
+    return np.stack([day_credits(fleet, first + i, mult[:, i], seed) for i in range(count)])
+
+
+def start_day(scale: Scale, start_date: Optional[dt.date] = None) -> np.datetime64:
+    return np.datetime64(start_date or dt.date.today() - dt.timedelta(days=scale.days), "D")
+
+
+def metering_chunks(
+    scale: Scale,
+    seed: int = SEED,
+    start_date: Optional[dt.date] = None,
+    chunk_rows: int = 1_000_000,
+    fleet: Optional[Fleet] = None,
+) -> Iterator[pd.DataFrame]:
+    fleet = fleet or build_fleet(scale, seed)
+    start = start_day(scale, start_date)
+    total_days = scale.days + 1  # inclusive of today, like the demo generator
+    rows_per_day = len(fleet.names) * 24
+    chunk_days = max(1, chunk_rows // rows_per_day)
+    hours = np.arange(24) * HOUR
+    for first in range(0, total_days, chunk_days):
+        count = min(chunk_days, total_days - first)
+        days = start + np.arange(first, first + count)
+        credits = credits_block(fleet, start, first, count, seed)
+        starts = (days.astype("datetime64[h]")[:, None, None] + hours[None, None, :])
+        starts = np.broadcast_to(starts, (count, len(fleet.names), 24)).ravel()
+        credits = credits.ravel()
+        yield pd.DataFrame({
+            "START_TIME": starts,
+            "END_TIME": starts + HOUR,
+            "WAREHOUSE_NAME": np.tile(np.repeat(fleet.names, 24), count),
+            "TOTAL_CREDITS_USED": credits,
+            "TOTAL_COST_USD": np.round(credits * COST_PER_CREDIT, 2),
+        })
+
+
+def write_chunks(
+    chunks: Iterator[pd.DataFrame],
+    out: Path,
+    fmt: str,
+    columns: Sequence[str] = COLUMNS,
+    compresslevel: int = 6,
+) -> int:
+    out.parent.mkdir(parents=True, exist_ok=True)
+    rows = 0
+    if fmt == "parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            sys.exit("Parquet output needs pyarrow: pip install pyarrow")
+        writer = None
+        try:
+            for frame in chunks:
+                table = pa.Table.from_pandas(frame[list(columns)], preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(out, table.schema, compression="zstd")
+                writer.write_table(table)
+                rows += len(frame)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pcsv
+    except ImportError:
+        pa = None
+    # pyarrow's CSV writer is ~10x faster than DataFrame.to_csv. Its header is
+    # always quoted, so the header is written here and values never need quoting.
+    with open(out, "wb") as raw, (
+        # mtime=0 keeps compressed files byte-identical across runs
+        gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=compresslevel, mtime=0)
+        if out.suffix == ".gz" else raw
+    ) as f:
+        f.write((",".join(columns) + "\n").encode("utf-8"))
+        for frame in chunks:
+            if pa is not None:
+                options = pcsv.WriteOptions(include_header=False, quoting_style="none")
+                pcsv.write_csv(pa.Table.from_pandas(frame[list(columns)], preserve_index=False), f, options)
+            else:
+                text = frame[list(columns)].to_csv(header=False, index=False, lineterminator="\n", date_format="%Y-%m-%d %H:%M:%S")
+                f.write(text.encode("utf-8"))
+            rows += len(frame)
+    return rows
+
+
+def write_mapping(fleet: Fleet, out: Path) -> None:
+    pd.DataFrame({
+        "warehouse_name": fleet.names,
+        "department": [fleet.departments[i] for i in fleet.dept_index],
+    }).to_csv(out, index=False, lineterminator="\n")
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate scaled synthetic warehouse metering.")
+    parser.add_argument("--scale", type=parse_scale, default=Scale(),
+                        help="WAREHOUSES,DEPARTMENTS,DAYS (default: 8,5,75, the demo seed)")
+    parser.add_argument("--seed", type=int, default=SEED, help="RNG seed (default: DEMO_SEED or 42)")
+    parser.add_argument("--start-date", type=dt.date.fromisoformat, default=None,
+                        help="First day (default: today minus DAYS)")
+    parser.add_argument("--out", type=Path, default=Path("target/loadtest/metering.csv.gz"),
+                        help="Output file; .parquet writes Parquet, .gz compresses CSV")
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000,
+                        help="Approximate rows generated and written per chunk (bounds memory)")
+    parser.add_argument("--mapping-out", type=Path, default=None,
+                        help="Also write a warehouse_name,department mapping CSV here")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    fmt = "parquet" if args.out.suffix == ".parquet" else "csv"
+    fleet = build_fleet(args.scale, args.seed)
+    started = time.perf_counter()
+    rows = write_chunks(
+        metering_chunks(args.scale, args.seed, args.start_date, args.chunk_rows, fleet),
+        args.out,
+        fmt,
+    )
+    if args.mapping_out:
+        write_mapping(fleet, args.mapping_out)
+    elapsed = time.perf_counter() - started
+    print(
+        f"Wrote {rows:,} rows to {args.out} for {args.scale.warehouses} warehouses, "
+        f"{args.scale.departments} departments over {args.scale.days + 1} days "
+        f"in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
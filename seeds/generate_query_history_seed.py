@@ -6,6 +6,9 @@ import datetime as dt
 import os
 import random
 from pathlib import Path
+from typing import Iterable, List, Sequence
+
+from generate_metering_seed import read_rows as read_metering_rows
 
 OUT_DIR = Path("seeds")
 OUT_DIR.mkdir(exist_ok=True)
@@ -13,7 +16,39 @@ METERING_PATH = OUT_DIR / "metering_demo_seed.csv"
 OUT_PATH = OUT_DIR / "query_history_demo_seed.csv"
 
 SEED = int(os.getenv("DEMO_SEED", "42"))
-rng = random.Random(SEED ^ 0xA11CE)
+
+# Spendscope's own reads (tagged like app/queries.py) on the reporting warehouse,
+# so the self-metering mart has demo data.
+APP_WAREHOUSE = "REPORTING_WH"
+APP_QUERY_TAGS = [
+    "spendscope:fct",
+    "spendscope:dept",
+    "spendscope:budget",
+    "spendscope:bva_latest",
+    "spendscope:forecast",
+    "spendscope:storage",
+    "spendscope:top_spenders",
+    "spendscope:total_cost",
+]
+
+COLUMNS = [
+    "QUERY_ID",
+    "START_TIME",
+    "END_TIME",
+    "USER_NAME",
+    "ROLE_NAME",
+    "WAREHOUSE_NAME",
+    "WAREHOUSE_SIZE",
+    "QUERY_TYPE",
+    "DATABASE_NAME",
+    "SCHEMA_NAME",
+    "EXECUTION_STATUS",
+    "BYTES_SCANNED",
+    "ROWS_PRODUCED",
+    "TOTAL_ELAPSED_TIME",
+    "EXECUTION_TIME",
+    "QUERY_TAG",
+]
 
 WAREHOUSE_PROFILES = {
     "COMPUTE_WH": {
@@ -122,21 +157,25 @@ def active_probability(department: str, hour: int, weekday: int) -> float:
     return 0.70
 
 
-rows = []
-query_sequence = 0
+def build_rows(metering_rows: Iterable[Sequence]) -> List[list]:
+    # metering_rows are generate_metering_seed rows: start, end, warehouse, credits, cost.
+    rng = random.Random(SEED ^ 0xA11CE)
+    # Separate stream so adding the dashboard's own queries leaves the workload rows unchanged.
+    app_rng = random.Random(SEED ^ 0x5C0BE)
+    rows = []
+    query_sequence = 0
+    app_hours = []
 
-with open(METERING_PATH, newline="", encoding="utf-8") as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-        warehouse_name = (row.get("WAREHOUSE_NAME") or "").strip().upper()
+    for hour_start, _, warehouse_name, credits_used, _ in metering_rows:
+        warehouse_name = (warehouse_name or "").strip().upper()
         if not warehouse_name:
             continue
         profile = WAREHOUSE_PROFILES.get(warehouse_name)
         if profile is None:
             continue
 
-        hour_start = dt.datetime.fromisoformat(row["START_TIME"])
-        credits_used = float(row["TOTAL_CREDITS_USED"])
+        if warehouse_name == APP_WAREHOUSE:
+            app_hours.append((hour_start, profile["warehouse_size"]))
         active_prob = active_probability(profile["department"], hour_start.hour, hour_start.weekday())
         if rng.random() > active_prob:
             continue
@@ -176,30 +215,57 @@ with open(METERING_PATH, newline="", encoding="utf-8") as f:
                     rows_produced,
                     total_elapsed_ms,
                     execution_ms,
+                    "",
                 ]
             )
 
-with open(OUT_PATH, "w", newline="", encoding="utf-8") as f:
-    writer = csv.writer(f)
-    writer.writerow(
-        [
-            "QUERY_ID",
-            "START_TIME",
-            "END_TIME",
-            "USER_NAME",
-            "ROLE_NAME",
-            "WAREHOUSE_NAME",
-            "WAREHOUSE_SIZE",
-            "QUERY_TYPE",
-            "DATABASE_NAME",
-            "SCHEMA_NAME",
-            "EXECUTION_STATUS",
-            "BYTES_SCANNED",
-            "ROWS_PRODUCED",
-            "TOTAL_ELAPSED_TIME",
-            "EXECUTION_TIME",
-        ]
-    )
-    writer.writerows(rows)
-
-print(f"Wrote {len(rows)} rows to {OUT_PATH}.")
+    app_sequence = 0
+    for hour_start, warehouse_size in app_hours:
+        business_hours = hour_start.weekday() < 5 and 8 <= hour_start.hour < 19
+        if app_rng.random() > (0.35 if business_hours else 0.03):
+            continue
+        for _ in range(app_rng.randint(1, 2)):
+            page_load = hour_start + dt.timedelta(minutes=app_rng.randint(0, 58), seconds=app_rng.randint(0, 59))
+            for tag in APP_QUERY_TAGS:
+                app_sequence += 1
+                result_cache_hit = app_rng.random() < 0.55
+                total_elapsed_ms = app_rng.randint(40, 180) if result_cache_hit else app_rng.randint(300, 4500)
+                end_time = page_load + dt.timedelta(milliseconds=total_elapsed_ms)
+                rows.append(
+                    [
+                        f"S{app_sequence:08d}",
+                        page_load.isoformat(sep=" "),
+                        end_time.isoformat(sep=" ", timespec="milliseconds"),
+                        "spendscope_app",
+                        "SPENDSCOPE_ROLE",
+                        APP_WAREHOUSE,
+                        warehouse_size,
+                        "SELECT",
+                        "FINOPS_DEV",
+                        "DEMO",
+                        "SUCCESS",
+                        0 if result_cache_hit else app_rng.randint(2, 400) * 1024 * 1024,
+                        app_rng.randint(1, 900),
+                        total_elapsed_ms,
+                        0 if result_cache_hit else max(1, total_elapsed_ms - app_rng.randint(20, 250)),
+                        tag,
+                    ]
+                )
+    return rows
+
+
+def write_rows(rows: List[list], path: Path = OUT_PATH) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(COLUMNS)
+        writer.writerows(rows)
+
+
+def main() -> None:
+    rows = build_rows(read_metering_rows(METERING_PATH))
+    write_rows(rows)
+    print(f"Wrote {len(rows)} rows to {OUT_PATH}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+# seeds/generate_query_history_seed_sharded.py
+# Purpose: Generate QUERY_HISTORY-shaped load-test data in parallel shards.
+#
+# Scaled counterpart of generate_query_history_seed.py for tens of millions of
+# rows. The warehouse x day grid is cut into shards (--shard-warehouses by
+# --shard-days) that run on a process pool and each write their own compressed
+# file plus an entry in _manifest.json. About 50M rows:
+#
+#   python seeds/generate_query_history_seed_sharded.py --scale 2600,20,365 \
+#       --density 2 --out-dir target/loadtest/query_history
+#
+# Hourly credits come from generate_metering_seed_scaled.py for the same
+# --scale, --seed and --start-date, so query volume lines up with that metering
+# without reading it back. Each shard draws from its own RNG stream derived from
+# (seed, shard origin), so output depends on the seed and shard layout but never
+# on --workers or on the order shards finish.
+
+import argparse
+import datetime as dt
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+import generate_metering_seed_scaled as metering
+import generate_query_history_seed as demo
+
+SECOND = np.timedelta64(1, "s")
+GIB = 1024 ** 3
+
+
+class Shard(NamedTuple):
+    index: int
+    wh_start: int
+    wh_stop: int
+    day_first: int
+    day_count: int
+
+
+class Job(NamedTuple):
+    scale: metering.Scale
+    seed: int
+    start: np.datetime64
+    density: float
+    out_dir: Path
+    fmt: str
+
+
+def plan_shards(scale: metering.Scale, shard_warehouses: int, shard_days: int) -> List[Shard]:
+    shards = []
+    total_days = scale.days + 1
+    for day_first in range(0, total_days, shard_days):
+        for wh_start in range(0, scale.warehouses, shard_warehouses):
+            shards.append(Shard(
+                len(shards),
+                wh_start,
+                min(wh_start + shard_warehouses, scale.warehouses),
+                day_first,
+                min(shard_days, total_days - day_first),
+            ))
+    return shards
+
+
+class Profiles(NamedTuple):
+    index: np.ndarray          # demo profile used by each warehouse
+    size: np.ndarray
+    queries_per_credit: np.ndarray
+    users: np.ndarray          # (profiles, max choices), padded
+    roles: np.ndarray
+    query_types: np.ndarray
+    databases: np.ndarray
+    schemas: np.ndarray
+    counts: Dict[str, np.ndarray]
+
+
+def _padded(values: List[List[str]]) -> np.ndarray:
+    width = max(len(v) for v in values)
+    return np.array([v + [v[-1]] * (width - len(v)) for v in values], dtype=object)
+
+
+@lru_cache(maxsize=4)
+def fleet_profiles(scale: metering.Scale, seed: int):
+    # Demo warehouses keep their own profile; the rest borrow one from a demo
+    # warehouse of the same department archetype.
+    fleet = metering.build_fleet(scale, seed)
+    names = list(demo.WAREHOUSE_PROFILES)
+    profiles = [demo.WAREHOUSE_PROFILES[n] for n in names]
+    by_archetype = {
+        a: [i for i, p in enumerate(profiles) if p["department"] == dept] or [0]
+        for a, dept in enumerate(metering.ARCHETYPES)
+    }
+    archetype = fleet.dept_archetype[fleet.dept_index]
+    index = np.array([
+        names.index(name) if name in names else by_archetype[int(a)][i % len(by_archetype[int(a)])]
+        for i, (name, a) in enumerate(zip(fleet.names, archetype))
+    ])
+    lists = {
+        "users": [p["users"] for p in profiles],
+        "roles": [p["roles"] for p in profiles],
+        "query_types": [p["query_types"] for p in profiles],
+        "targets": [p["targets"] for p in profiles],
+    }
+    active = np.array([
+        [[demo.active_probability(p["department"], h, weekday) for h in range(24)] for weekday in (0, 5)]
+        for p in profiles
+    ])
+    return fleet, active, Profiles(
+        index,
+        np.array([p["warehouse_size"] for p in profiles], dtype=object),
+        np.array([p["queries_per_credit"] for p in profiles]),
+        _padded(lists["users"]),
+        _padded(lists["roles"]),
+        _padded(lists["query_types"]),
+        _padded([[db for db, _ in t] for t in lists["targets"]]),
+        _padded([[sch for _, sch in t] for t in lists["targets"]]),
+        {key: np.array([len(v) for v in values]) for key, values in lists.items()},
+    )
+
+
+def _pick(rng: np.random.Generator, table: np.ndarray, counts: np.ndarray, profile: np.ndarray) -> np.ndarray:
+    choice = (rng.random(len(profile)) * counts[profile]).astype(int)
+    return table[profile, choice]
+
+
+def shard_frame(job: Job, shard: Shard) -> pd.DataFrame:
+    fleet, active, profiles = fleet_profiles(job.scale, job.seed)
+    rng = np.random.default_rng([job.seed, 0xA11CE, shard.wh_start, shard.day_first])
+    credits = metering.credits_block(fleet, job.start, shard.day_first, shard.day_count, job.seed)
+    credits = credits[:, shard.wh_start:shard.wh_stop, :]  # (days, warehouses, 24)
+    days = credits.shape[0]
+
+    profile = profiles.index[shard.wh_start:shard.wh_stop]
+    day_dates = job.start + np.arange(shard.day_first, shard.day_first + days)
+    weekend = ((day_dates.astype(int) + 3) % 7 >= 5).astype(int)  # 1970-01-01 was a Thursday
+    probability = active[profile[None, :, None], weekend[:, None, None], np.arange(24)[None, None, :]]
+    is_active = rng.random(credits.shape) <= probability
+    qpc = profiles.queries_per_credit[profile][None, :, None] * job.density
+    counts = np.maximum(1, np.rint(credits * qpc + rng.uniform(0.2, 2.4, credits.shape))).astype(np.int64)
+    counts = np.where(is_active, counts, 0).ravel()
+    target = (rng.random(credits.shape) * profiles.counts["targets"][profile][None, :, None]).astype(int).ravel()
+
+    cell = np.repeat(np.arange(credits.size), counts)
+    n = len(cell)
+    d, w, h = np.unravel_index(cell, credits.shape)
+    row_credits = credits.ravel()[cell]
+    row_profile = profile[w]
+    hour_start = day_dates[d].astype("datetime64[s]") + h * 3600 * SECOND
+
+    offset = rng.integers(0, 56, n) * 60 + rng.integers(0, 56, n)
+    duration = np.minimum(1800, np.maximum(8, (rng.uniform(12, 420, n) + row_credits * rng.uniform(4, 18, n)).astype(np.int64)))
+    start = hour_start + offset * SECOND
+    end = np.minimum(start + duration * SECOND, hour_start + 3599 * SECOND)
+    elapsed_ms = (end - start).astype(np.int64) * 1000
+    sequence = shard.index * 1_000_000_000 + np.arange(1, n + 1)
+
+    return pd.DataFrame({
+        "QUERY_ID": "Q" + pd.Series(sequence).astype(str).str.zfill(14),
+        "START_TIME": start,
+        "END_TIME": end,
+        "USER_NAME": _pick(rng, profiles.users, profiles.counts["users"], row_profile),
+        "ROLE_NAME": _pick(rng, profiles.roles, profiles.counts["roles"], row_profile),
+        "WAREHOUSE_NAME": fleet.names[shard.wh_start:shard.wh_stop][w],
+        "WAREHOUSE_SIZE": profiles.size[row_profile],
+        "QUERY_TYPE": _pick(rng, profiles.query_types, profiles.counts["query_types"], row_profile),
+        "DATABASE_NAME": profiles.databases[row_profile, target[cell]],
+        "SCHEMA_NAME": profiles.schemas[row_profile, target[cell]],
+        "EXECUTION_STATUS": "SUCCESS",
+        "BYTES_SCANNED": (np.maximum(1, row_credits * rng.uniform(2.0, 18.0, n)) * GIB).astype(np.int64),
+        "ROWS_PRODUCED": np.maximum(1, (row_credits * rng.uniform(500, 6000, n)).astype(np.int64)),
+        "TOTAL_ELAPSED_TIME": elapsed_ms,
+        "EXECUTION_TIME": np.maximum(1000, elapsed_ms - rng.integers(250, 5001, n)),
+        "QUERY_TAG": "",
+    })
+
+
+def shard_path(job: Job, shard: Shard) -> Path:
+    suffix = ".parquet" if job.fmt == "parquet" else ".csv.gz"
+    return job.out_dir / f"query_history_{shard.index:05d}{suffix}"
+
+
+def run_shard(job: Job, shard: Shard) -> Dict[str, Any]:
+    started = time.perf_counter()
+    frame = shard_frame(job, shard)
+    path = shard_path(job, shard)
+    # gzip dominates shard time; level 1 is ~3x faster for ~20% larger files.
+    rows = metering.write_chunks(iter([frame]), path, job.fmt, columns=demo.COLUMNS, compresslevel=1)
+    return {
+        "file": path.name,
+        "rows": rows,
+        "warehouses": [shard.wh_start, shard.wh_stop],
+        "days": [str(job.start + shard.day_first), str(job.start + shard.day_first + shard.day_count - 1)],
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def _run_shard(args) -> Dict[str, Any]:
+    return run_shard(*args)
+
+
+def generate(job: Job, shards: List[Shard], workers: int) -> List[Dict[str, Any]]:
+    job.out_dir.mkdir(parents=True, exist_ok=True)
+    tasks = [(job, shard) for shard in shards]
+    if workers <= 1:
+        return [_run_shard(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_run_shard, tasks))
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate sharded synthetic query history.")
+    parser.add_argument("--scale", type=metering.parse_scale, default=metering.Scale(),
+                        help="WAREHOUSES,DEPARTMENTS,DAYS, as for generate_metering_seed_scaled.py")
+    parser.add_argument("--seed", type=int, default=metering.SEED, help="RNG seed (default: DEMO_SEED or 42)")
+    parser.add_argument("--start-date", type=dt.date.fromisoformat, default=None,
+                        help="First day (default: today minus DAYS)")
+    parser.add_argument("--density", type=float, default=1.0,
+                        help="Multiplier on queries per credit (default 1.0, about 43 queries per warehouse-day)")
+    parser.add_argument("--shard-warehouses", type=int, default=500, help="Warehouses per shard")
+    parser.add_argument("--shard-days", type=int, default=30, help="Days per shard")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv",
+                        help="Shard format: gzip CSV or Parquet (needs pyarrow)")
+    parser.add_argument("--out-dir", type=Path, default=Path("target/loadtest/query_history"))
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    job = Job(args.scale, args.seed, metering.start_day(args.scale, args.start_date), args.density, args.out_dir, args.format)
+    shards = plan_shards(args.scale, max(1, args.shard_warehouses), max(1, args.shard_days))
+    started = time.perf_counter()
+    results = generate(job, shards, args.workers)
+    elapsed = time.perf_counter() - started
+    rows = sum(r["rows"] for r in results)
+    manifest = {
+        "scale": args.scale._asdict(),
+        "seed": args.seed,
+        "start_date": str(job.start),
+        "density": args.density,
+        "format": args.format,
+        "rows": rows,
+        "shards": results,
+    }
+    (args.out_dir / "_manifest.json").write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    print(
+        f"Wrote {rows:,} rows in {len(results)} shards to {args.out_dir} "
+        f"with {args.workers} workers in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,6 +6,7 @@ import unittest
 from pathlib import Path
 
 from app.formatting import fmt_usd
+from app.startup import IMPORT_ERRORS, IMPORT_TIMINGS, LazyModule
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -22,13 +23,20 @@ except ModuleNotFoundError:
     snowflake_connector = None
 
 today = dt.date.today()
+# Snowflake's current_date() runs a day behind the app server, as it does in the
+# evening UTC with the default America/Los_Angeles session TIMEZONE.
+snowflake_today = today - dt.timedelta(days=1)
 
 
-def fake_query(sql):
+def fake_query(sql, params=None):
     query = sql.lower()
     dates = [today - dt.timedelta(days=i) for i in range(1, 6)]
     if "information_schema.tables" in query:
         return ["1"], []
+    if "current_date()" in query:
+        return ["TODAY"], [(snowflake_today,)]
+    if "hll_combine" in query:
+        return ["active_users", "first_usage_date", "last_usage_date"], [(42.0, dates[-1], dates[0])]
     if "fct_daily_costs" in query:
         rows = [
             (day, "COMPUTE_WH", 100.0, 5.0, 105.0, 30.0, dt.datetime.combine(day, dt.time()))
@@ -50,6 +58,8 @@ def fake_query(sql):
     if "fct_budget_vs_actual" in query:
         return ["usage_date"], [(dates[0],)]
     if "fct_cost_forecast" in query:
+        if params and params[0] != snowflake_today:
+            return ["forecast_date", "warehouse_name", "forecasted_cost_usd", "confidence_band_low", "confidence_band_high", "days_ahead"], []
         rows = [
             (today + dt.timedelta(days=i), "COMPUTE_WH", 95.0, 80.0, 115.0, i)
             for i in range(1, 4)
@@ -67,6 +77,16 @@ def fake_query(sql):
             for day in dates
         ]
         return ["usage_date", "user_name", "primary_warehouse_name", "query_count", "total_runtime_seconds", "gb_scanned", "estimated_cost_usd", "has_cost_estimate", "rank_by_query_count", "rank_by_runtime", "rank_by_cost", "pct_of_daily_query_total"], rows
+    if "fct_app_query_costs" in query:
+        rows = [(day, "spendscope:fct", 8, 4.2, 0.5, 5, 0.02, 0.06) for day in dates]
+        return ["usage_date", "query_tag", "query_count", "total_elapsed_seconds", "gb_scanned", "zero_scan_query_count", "attributed_credits", "attributed_cost_usd"], rows
+    if "fct_warehouse_hourly_utilization" in query:
+        rows = [
+            ("COMPUTE_WH", dow, hour, 4, 1.5 if hour in range(8, 18) else 0.1, 6.0, 0.4, 20, 3, 0.75, dates[-1], dates[0])
+            for dow in range(1, 8)
+            for hour in range(24)
+        ]
+        return ["warehouse_name", "day_of_week", "hour_of_day", "days_in_window", "avg_credits_per_hour", "total_credits", "idle_cost_usd", "query_count", "active_hours", "active_hour_ratio", "window_start_date", "window_end_date"], rows
     if "fct_total_cost_summary" in query:
         rows = []
         for day in dates:
@@ -78,11 +98,15 @@ def fake_query(sql):
     return ["value"], []
 
 
+EXECUTED = []
+
+
 class FakeCursor:
     description = []
 
-    def execute(self, sql):
-        columns, rows = fake_query(sql)
+    def execute(self, sql, params=None, **kwargs):
+        EXECUTED.append(sql)
+        columns, rows = fake_query(sql, params)
         self.description = [(column,) for column in columns]
         self._rows = rows
 
@@ -121,6 +145,8 @@ at.run(timeout=30)
 if not demo_mode:
     at.toggle[0].set_value(False)
     at.run(timeout=30)
+for _ in range(int(os.environ.get("APPTEST_RERUNS", "0"))):
+    at.run(timeout=30)
 
 payload = {
     "exceptions": [str(exc.value) for exc in at.exception],
@@ -130,6 +156,7 @@ payload = {
     "errors": [str(getattr(error, "value", "")) for error in at.error],
     "warnings": [str(getattr(warning, "value", "")) for warning in at.warning],
     "buttons": [button.label for button in at.button],
+    "current_date_queries": sum("current_date()" in sql.lower() for sql in EXECUTED),
 }
 print("RESULT_JSON=" + json.dumps(payload))
 sys.stdout.flush()
@@ -138,7 +165,7 @@ os._exit(0)
 
 
 class AppRegressionTests(unittest.TestCase):
-    def run_apptest(self, *, demo_mode: bool, stub_mode: str = "empty"):
+    def run_apptest(self, *, demo_mode: bool, stub_mode: str = "empty", extra_env=None):
         env = {
             **os.environ,
             "PYTHONPATH": str(ROOT),
@@ -150,6 +177,7 @@ class AppRegressionTests(unittest.TestCase):
             "SNOWFLAKE_SCHEMA": "",
             "SNOWFLAKE_WAREHOUSE": "",
             "SNOWFLAKE_ROLE": "",
+            **(extra_env or {}),
         }
         result = subprocess.run(
             [sys.executable, "-c", APPTEST_SCRIPT, str(APP_PATH), "true" if demo_mode else "false", stub_mode],
@@ -185,6 +213,34 @@ class AppRegressionTests(unittest.TestCase):
         self.assertNotIn('[data-testid="stStatusWidget"], [data-testid="stHeader"],', source)
         self.assertIn("stExpandSidebarButton", source)
 
+    def test_lazy_module_imports_on_first_use_and_records_timing(self):
+        sys.modules.pop("colorsys", None)
+        lazy = LazyModule("colorsys")
+        self.assertNotIn("colorsys", sys.modules)
+        self.assertEqual(lazy.hls_to_rgb(0, 0, 0), (0, 0, 0))
+        self.assertIn("colorsys", sys.modules)
+        self.assertIn("colorsys", IMPORT_TIMINGS)
+
+    def test_lazy_module_reports_missing_dependency(self):
+        lazy = LazyModule("spendscope_missing_dependency")
+        self.assertFalse(lazy.available)
+        self.assertIn("ModuleNotFoundError", IMPORT_ERRORS["spendscope_missing_dependency"])
+        with self.assertRaises(ImportError):
+            lazy.Figure
+
+    def test_clearing_caches_keeps_thread_owning_singletons(self):
+        source = (ROOT / "app" / "streamlit_app.py").read_text(encoding="utf-8")
+        self.assertNotIn("st.cache_resource", source)
+        self.assertIn('process_singleton("prewarmer"', source)
+        self.assertIn('"query_cache",', source)
+
+    def test_streamlit_app_defers_heavy_imports(self):
+        source = (ROOT / "app" / "streamlit_app.py").read_text(encoding="utf-8")
+        self.assertNotIn("import plotly", source)
+        self.assertNotIn("import snowflake", source)
+        self.assertIn('LazyModule("plotly.graph_objects")', source)
+        self.assertIn('LazyModule("snowflake.connector")', source)
+
     def test_streamlit_app_defines_visible_spendscope_page_header(self):
         source = (ROOT / "app" / "streamlit_app.py").read_text(encoding="utf-8")
         self.assertIn("spendscope-page-title", source)
@@ -209,6 +265,24 @@ class AppRegressionTests(unittest.TestCase):
         self.assertIn("Top Departments", rendered_text)
         self.assertIn("Analytics", rendered_text)
 
+    def test_date_bounds_use_snowflake_current_date(self):
+        payload = self.run_apptest(demo_mode=True, stub_mode="nonempty", extra_env={"APPTEST_RERUNS": "2"})
+        rendered_text = "\n".join(payload["markdown"] + payload["errors"] + payload["warnings"])
+        self.assertEqual(payload["exceptions"], [])
+        self.assertIn("Cost Forecast", rendered_text)
+        # Reruns reuse the cached date instead of asking Snowflake again.
+        self.assertEqual(payload["current_date_queries"], 1)
+
+    def test_prewarm_enabled_renders_without_exceptions(self):
+        payload = self.run_apptest(
+            demo_mode=True,
+            stub_mode="nonempty",
+            extra_env={"PREWARM_CACHES": "true", "SNOWFLAKE_DATABASE": "FINOPS_DEV"},
+        )
+        rendered_text = "\n".join(payload["markdown"] + payload["errors"] + payload["warnings"])
+        self.assertEqual(payload["exceptions"], [])
+        self.assertIn("Analytics", rendered_text)
+
     def test_streamlit_app_apptest_demo_mode_renders_without_exceptions(self):
         payload = self.run_apptest(demo_mode=True, stub_mode="nonempty")
         self.assertEqual(payload["toggle_labels"], ["Demo data"])
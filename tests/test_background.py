@@ -0,0 +1,90 @@
+import threading
+import unittest
+
+from app.background import Prewarmer, SharedConnection, in_background, process_singleton, shared_connection
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+
+class PrewarmerTests(unittest.TestCase):
+    def test_runs_jobs_in_background_and_reports_progress(self):
+        seen = []
+
+        def job(label):
+            return lambda: seen.append((label, in_background(), threading.current_thread().name))
+
+        warm = Prewarmer([("a", job("a")), ("b", job("b"))]).start()
+        self.assertTrue(warm.join(timeout=5))
+        self.assertEqual([label for label, _, _ in seen], ["a", "b"])
+        self.assertTrue(all(flag for _, flag, _ in seen))
+        self.assertTrue(all(name == "spendscope-prewarm" for _, _, name in seen))
+        self.assertFalse(in_background())
+        progress = warm.progress()
+        self.assertEqual((progress["done"], progress["total"], progress["failed"]), (2, 2, 0))
+        self.assertTrue(progress["finished"])
+
+    def test_failed_jobs_are_counted_without_stopping_the_warm_up(self):
+        seen = []
+
+        def boom():
+            raise RuntimeError("warehouse suspended")
+
+        with self.assertLogs("spendscope.background", level="WARNING"):
+            warm = Prewarmer([("bad", boom), ("good", lambda: seen.append(1))]).start()
+            warm.join(timeout=5)
+        self.assertEqual(seen, [1])
+        self.assertEqual(warm.progress()["failed"], 1)
+        self.assertIn("warehouse suspended", warm.errors["bad"])
+
+    def test_process_singleton_builds_once(self):
+        built = []
+
+        def factory():
+            built.append(1)
+            return Prewarmer([]).start()
+
+        first = process_singleton("test-prewarmer", factory)
+        self.assertIs(process_singleton("test-prewarmer", factory), first)
+        self.assertEqual(len(built), 1)
+
+    def test_start_is_idempotent(self):
+        calls = []
+        warm = Prewarmer([("a", lambda: calls.append(1))])
+        warm.start()
+        warm.start()
+        warm.join(timeout=5)
+        self.assertEqual(calls, [1])
+
+
+class SharedConnectionTests(unittest.TestCase):
+    def test_reopens_closed_connections(self):
+        opened = []
+
+        def factory():
+            opened.append(FakeConnection())
+            return opened[-1]
+
+        holder = SharedConnection(factory)
+        first = holder.get()
+        self.assertIs(holder.get(), first)
+        first.close()
+        self.assertIsNot(holder.get(), first)
+        self.assertEqual(len(opened), 2)
+
+    def test_shared_connection_returns_one_holder_per_key(self):
+        a = shared_connection("test::a", FakeConnection)
+        self.assertIs(shared_connection("test::a", FakeConnection), a)
+        self.assertIsNot(shared_connection("test::b", FakeConnection), a)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import check_snowflake  # noqa: E402
+
+
+class PruningReportTests(unittest.TestCase):
+    def test_report_replaces_only_the_marked_section(self):
+        rows = [
+            {"name": "fct", "tables": "fct_daily_costs", "partitions_scanned": 3, "partitions_total": 120, "pruned_pct": 97.5},
+            {"name": "storage", "error": "ProgrammingError: missing"},
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "report.md"
+            path.write_text(
+                f"# Title\n\n{check_snowflake.PRUNING_START}\nold\n{check_snowflake.PRUNING_END}\n\nfooter\n",
+                encoding="utf-8",
+            )
+            for _ in range(2):
+                check_snowflake.write_pruning_report(path, check_snowflake.pruning_markdown(rows, "Generated today."))
+            text = path.read_text(encoding="utf-8")
+        self.assertTrue(text.startswith("# Title\n"))
+        self.assertTrue(text.endswith("\nfooter\n"))
+        self.assertNotIn("old", text)
+        self.assertEqual(text.count(check_snowflake.PRUNING_START), 1)
+        self.assertIn("| fct | fct_daily_costs | 3 | 120 | 98% |", text)
+        self.assertIn("| storage | error: ProgrammingError: missing |", text)
+
+    def test_app_queries_cover_every_app_mart(self):
+        names = {q.cache_key.split(":")[0] for q in check_snowflake.app_queries("DB", "DEMO", 30)}
+        self.assertIn("app_costs", names)
+        self.assertIn("top_spenders", names)
+
+
+if __name__ == "__main__":
+    unittest.main()
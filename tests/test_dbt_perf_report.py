@@ -0,0 +1,74 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import dbt_perf_report  # noqa: E402
+
+
+def write_target(path, invocation_id, times, which="build"):
+    path.mkdir(parents=True, exist_ok=True)
+    nodes = {
+        "model.p.stg": {"name": "stg", "resource_type": "model", "config": {"materialized": "incremental"},
+                        "depends_on": {"nodes": ["source.p.au.query_history"]}},
+        "test.p.not_null_stg": {"name": "not_null_stg", "resource_type": "test", "config": {"materialized": "test"},
+                                "depends_on": {"nodes": ["model.p.stg"]}},
+        "model.p.fct": {"name": "fct", "resource_type": "model", "config": {"materialized": "table"},
+                        "depends_on": {"nodes": ["model.p.stg"]}},
+        "model.p.side": {"name": "side", "resource_type": "model", "config": {"materialized": "view"},
+                         "depends_on": {"nodes": []}},
+    }
+    results = [
+        {"unique_id": uid, "status": "success" if not uid.startswith("test") else "pass", "execution_time": seconds,
+         "adapter_response": {"rows_affected": 10, "query_id": f"01b-{uid}"}}
+        for uid, seconds in times.items()
+    ]
+    (path / "manifest.json").write_text(json.dumps({"nodes": nodes}), encoding="utf-8")
+    (path / "run_results.json").write_text(json.dumps({
+        "metadata": {"invocation_id": invocation_id, "generated_at": "2026-10-19T02:00:00Z"},
+        "args": {"which": which},
+        "elapsed_time": sum(times.values()),
+        "results": results,
+    }), encoding="utf-8")
+
+
+class DbtPerfReportTests(unittest.TestCase):
+    def test_critical_path_waits_for_parent_tests_in_build(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            target = Path(tmp) / "target"
+            write_target(target, "a", {"model.p.stg": 10.0, "test.p.not_null_stg": 4.0, "model.p.fct": 30.0, "model.p.side": 35.0})
+            run = dbt_perf_report.load_run(target)
+        path = dbt_perf_report.critical_path(run)
+        self.assertEqual([row["name"] for row in path], ["stg", "not_null_stg", "fct"])
+        self.assertAlmostEqual(path[-1]["cumulative_s"], 44.0)
+        self.assertEqual(run["nodes"]["model.p.fct"]["query_id"], "01b-model.p.fct")
+        self.assertEqual([(r["name"], r["note"]) for r in dbt_perf_report.slowest(run, 2)],
+                         [("side", ""), ("fct", "incremental candidate")])
+
+    def test_history_records_once_and_flags_growth_and_regressions(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            history_path = Path(tmp) / "history.jsonl"
+            history = []
+            for i, fct_seconds in enumerate([10.0, 12.0, 15.0, 30.0]):
+                target = Path(tmp) / f"run{i}"
+                write_target(target, f"run-{i}", {"model.p.stg": 5.0, "model.p.fct": fct_seconds})
+                run = dbt_perf_report.load_run(target)
+                self.assertTrue(dbt_perf_report.record(history_path, run, history))
+            self.assertFalse(dbt_perf_report.record(history_path, run, history))
+            self.assertEqual(len(dbt_perf_report.read_history(history_path)), 4)
+
+        grown = dbt_perf_report.growth(history, runs=10, top=5)
+        self.assertEqual([row["name"] for row in grown], ["fct"])
+        baseline = dbt_perf_report.resolve_baseline("previous", run, history)
+        self.assertEqual(baseline["invocation_id"], "run-2")
+        regressed = dbt_perf_report.regressions(run, baseline, threshold_pct=20.0, min_delta_s=5.0)
+        self.assertEqual([(row["name"], row["delta_s"]) for row in regressed], [("fct", 15.0)])
+        self.assertEqual(dbt_perf_report.regressions(run, run, 20.0, 5.0), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import datetime as dt
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "seeds"))
+
+import generate_budget_seed as budget  # noqa: E402
+import generate_metering_seed as metering  # noqa: E402
+import generate_query_history_seed as query_history  # noqa: E402
+
+START = dt.date(2026, 1, 1)
+
+
+class DemoSeedPipelineTests(unittest.TestCase):
+    def test_in_memory_metering_matches_a_csv_round_trip(self):
+        rows = metering.build_rows(START)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metering.csv"
+            metering.write_rows(rows, path)
+            reread = metering.read_rows(path)
+        self.assertEqual(reread, rows)
+        self.assertEqual(query_history.build_rows(rows), query_history.build_rows(reread))
+
+    def test_generators_are_repeatable_within_one_process(self):
+        rows = metering.build_rows(START)
+        self.assertEqual(metering.build_rows(START), rows)
+        mapping = budget.load_mapping(ROOT / "seeds" / "department_mapping.csv")
+        self.assertEqual(budget.build_rows(rows, mapping), budget.build_rows(rows, mapping))
+
+
+if __name__ == "__main__":
+    unittest.main()
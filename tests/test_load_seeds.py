@@ -0,0 +1,93 @@
+import csv
+import importlib.util
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import load_seeds  # noqa: E402
+
+HAS_DUCKDB = importlib.util.find_spec("duckdb") is not None
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+def seed_rows(table: str) -> int:
+    with open(ROOT / "seeds" / f"{table}.csv", newline="", encoding="utf-8") as f:
+        return sum(1 for _ in csv.reader(f)) - 1
+
+
+class FakeCursor:
+    def __init__(self, log):
+        self.log = log
+        self.result = []
+
+    def execute(self, sql):
+        self.log.append(sql)
+        self.result = [("f.csv.gz", "LOADED", 3, 3)] if sql.startswith("copy into") else []
+
+    def fetchall(self):
+        return self.result
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.log = []
+
+    def cursor(self):
+        return FakeCursor(self.log)
+
+    def close(self):
+        pass
+
+
+class LoadSeedsTests(unittest.TestCase):
+    def test_tables_match_seed_headers(self):
+        for table, columns in load_seeds.TABLES.items():
+            with open(ROOT / "seeds" / f"{table}.csv", newline="", encoding="utf-8") as f:
+                header = next(csv.reader(f))
+            self.assertEqual(header, [name for name, _ in columns], table)
+
+    def test_snowflake_target_stages_and_copies_each_table(self):
+        conn = FakeConnection()
+        target = load_seeds.SnowflakeTarget(conn, "FINOPS", "DEMO")
+        results = load_seeds.load(target, ["department_mapping"], {}, "csv")
+        self.assertEqual(results[0]["rows"], 3)
+        create_schema, create_stage, create_table, put, copy = conn.log
+        self.assertIn("create temporary stage", create_stage)
+        self.assertTrue(create_table.startswith("create or replace table FINOPS.DEMO.department_mapping"))
+        self.assertRegex(put, r"^put 'file://.+/department_mapping/\*' @FINOPS\.DEMO\.spendscope_seed_stage/department_mapping/")
+        self.assertIn("compression = gzip", copy)
+
+    def test_snowflake_target_defaults_to_profile_database(self):
+        conn = FakeConnection()
+        target = load_seeds.SnowflakeTarget(conn, "", "DEMO")
+        self.assertEqual(target.schema, "DEMO_DB.DEMO")
+
+    @unittest.skipUnless(HAS_DUCKDB, "duckdb not installed")
+    def test_duckdb_stand_in_loads_every_seed(self):
+        formats = ["csv", "parquet"] if HAS_PYARROW else ["csv"]
+        with tempfile.TemporaryDirectory() as tmp:
+            for fmt in formats:
+                path = str(Path(tmp) / f"{fmt}.duckdb")
+                target = load_seeds.DuckDBTarget(path, "DEMO")
+                results = load_seeds.load(target, list(load_seeds.TABLES), {}, fmt)
+                loaded = {r["table"]: r["rows"] for r in results}
+                for table in load_seeds.TABLES:
+                    self.assertEqual(loaded[table], seed_rows(table), (fmt, table))
+                types = dict(target.conn.execute(
+                    "select column_name, data_type from information_schema.columns "
+                    "where table_schema = 'DEMO' and table_name = 'metering_demo_seed'"
+                ).fetchall())
+                self.assertEqual(types["START_TIME"], "TIMESTAMP")
+                self.assertEqual(types["TOTAL_CREDITS_USED"], "DOUBLE")
+                target.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import datetime as dt
+import sys
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "seeds"))
+
+import generate_metering_seed_scaled as scaled  # noqa: E402
+
+START = dt.date(2026, 1, 1)
+
+
+def generate(scale, chunk_rows=1_000_000, seed=42) -> pd.DataFrame:
+    return pd.concat(scaled.metering_chunks(scale, seed, START, chunk_rows), ignore_index=True)
+
+
+class ScaledMeteringSeedTests(unittest.TestCase):
+    def test_output_is_independent_of_chunk_size(self):
+        scale = scaled.Scale(40, 7, 45)
+        whole = generate(scale)
+        chunked = generate(scale, chunk_rows=500)
+        key = ["START_TIME", "WAREHOUSE_NAME"]
+        pd.testing.assert_frame_equal(
+            whole.sort_values(key, ignore_index=True),
+            chunked.sort_values(key, ignore_index=True),
+        )
+        self.assertEqual(len(whole), 40 * 46 * 24)
+        self.assertFalse(generate(scale, seed=7).equals(whole))
+
+    def test_demo_scale_keeps_demo_warehouses_and_departments(self):
+        fleet = scaled.build_fleet(scaled.Scale())
+        mapping = dict(zip(fleet.names, (fleet.departments[i] for i in fleet.dept_index)))
+        self.assertEqual(mapping["ML_WH"], "Data Science")
+        self.assertEqual(mapping["BATCH_WH"], "Finance")
+        self.assertEqual(len(fleet.names), 8)
+
+    def test_keeps_weekend_dips_and_data_science_bursts(self):
+        frame = generate(scaled.Scale(60, 5, 90))
+        frame["day"] = frame["START_TIME"].dt.normalize()
+        daily = frame.groupby("day")["TOTAL_CREDITS_USED"].sum()
+        weekend = daily.index.weekday >= 5
+        self.assertLess(daily[weekend].mean(), daily[~weekend].mean() * 0.8)
+
+        fleet = scaled.build_fleet(scaled.Scale(60, 5, 90))
+        days = pd.date_range(START, periods=31).values.astype("datetime64[D]")
+        mask = scaled.ds_burst_mask(fleet, days, 42)
+        ds = scaled.ARCHETYPES.index("Data Science")
+        self.assertEqual(int(mask[ds].sum()), scaled.DS_BURSTS_PER_MONTH)
+        self.assertEqual(int(mask[0].sum()), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import datetime as dt
+import os
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from app import queries
+
+
+ROOT = Path(__file__).resolve().parents[1]
+TODAY = dt.date(2026, 3, 15)
+
+
+class QueryBuilderTests(unittest.TestCase):
+    def test_sql_text_is_identical_across_windows_and_days(self):
+        week = queries.daily_costs("FINOPS", "DEMO", 21, today=TODAY)
+        quarter = queries.daily_costs("FINOPS", "DEMO", 187, today=TODAY + dt.timedelta(days=1))
+        self.assertEqual(week.sql, quarter.sql)
+        self.assertNotIn("current_date", week.sql)
+        self.assertEqual(week.params, (dt.date(2026, 2, 22),))
+        self.assertNotEqual(week, quarter)
+
+    def test_sql_is_whitespace_normalized(self):
+        q = queries.storage_costs("FINOPS", "DEMO", 30, today=TODAY)
+        self.assertEqual(q.sql, " ".join(q.sql.split()))
+        self.assertFalse(q.sql.startswith(" "))
+
+    def test_table_exists_binds_schema_and_table(self):
+        q = queries.table_exists("FINOPS", "pro'; drop table x; --", "INT_HOURLY_COMPUTE_COSTS")
+        self.assertNotIn("drop table", q.sql)
+        self.assertEqual(q.params, ("pro'; drop table x; --", "INT_HOURLY_COMPUTE_COSTS"))
+
+    def test_identifiers_outside_the_plain_pattern_are_quoted(self):
+        self.assertEqual(queries.ident("FINOPS_DEV"), "FINOPS_DEV")
+        self.assertEqual(queries.ident('my "db"'), '"my ""db"""')
+
+    def test_pro_hourly_binds_threshold_and_inclusive_window(self):
+        q = queries.pro_hourly("FINOPS", "PRO", 7, 0.05, has_size=False, today=TODAY)
+        self.assertEqual(q.params, (0.05, dt.date(2026, 3, 9), TODAY))
+        self.assertEqual(q.sql.count("?"), 3)
+
+    def test_queries_carry_a_spendscope_tag(self):
+        self.assertEqual(queries.total_cost_summary("FINOPS", "DEMO", today=TODAY).tag, "spendscope:total_cost")
+        self.assertEqual(queries.total_cost_summary("FINOPS", "DEMO", today=TODAY).params, (dt.date(2026, 3, 1),))
+
+    def test_app_query_tags_match_the_dbt_self_metering_filter(self):
+        project = (ROOT / "dbt_project.yml").read_text(encoding="utf-8")
+        self.assertIn(f'app_query_tag_prefix: "{queries.QUERY_TAG_PREFIX}"', project)
+        q = queries.app_query_costs("FINOPS", "DEMO", 30, today=TODAY)
+        self.assertTrue(q.tag.startswith(queries.QUERY_TAG_PREFIX + ":"))
+        self.assertEqual(q.params, (dt.date(2026, 2, 13),))
+
+    def test_utilization_heatmap_reads_the_preaggregated_mart(self):
+        q = queries.warehouse_utilization("FINOPS", "DEMO")
+        self.assertIn("fct_warehouse_hourly_utilization", q.sql)
+        self.assertNotIn("int_hourly_compute_costs", q.sql)
+        self.assertEqual(q.tag, "spendscope:utilization")
+        self.assertEqual(queries.refresh_seconds(q.cache_key), 3600)
+
+    def test_window_active_users_merge_daily_sketches(self):
+        q = queries.active_users("FINOPS", "DEMO", 30, today=TODAY)
+        self.assertIn("hll_estimate(hll_combine(users_hll))", q.sql)
+        self.assertIn("fct_daily_costs", q.sql)
+        self.assertNotIn("query_history", q.sql.lower())
+        self.assertEqual(q.params, (dt.date(2026, 2, 13),))
+
+    def test_queries_are_classified_for_warehouse_routing(self):
+        self.assertEqual(queries.table_exists("FINOPS", "PRO", "T").query_class, "metadata")
+        self.assertEqual(queries.daily_costs("FINOPS", "DEMO", 21, today=TODAY).query_class, "marts")
+        self.assertEqual(queries.pro_hourly("FINOPS", "PRO", 7, 0.05, True, today=TODAY).query_class, "pro")
+
+    def test_session_parameters_skip_unset_and_invalid_values(self):
+        env = {
+            "SNOWFLAKE_STATEMENT_TIMEOUT_SECONDS": "120",
+            "SNOWFLAKE_CLIENT_PREFETCH_THREADS": "four",
+            "SNOWFLAKE_CLIENT_RESULT_CHUNK_SIZE": "0",
+        }
+        with mock.patch.dict(os.environ, env):
+            self.assertEqual(queries.session_parameters(), {"STATEMENT_TIMEOUT_IN_SECONDS": 120})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,344 @@
+import threading
+import unittest
+
+import pandas as pd
+
+from app.query_cache import (
+    CachedFailure,
+    QueryCache,
+    cached,
+    estimate_bytes,
+    is_permanent_error,
+    note_failure,
+    retry_with_backoff,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeSnowflakeError(Exception):
+    def __init__(self, message, errno=None, sqlstate=None):
+        super().__init__(message)
+        self.errno = errno
+        self.sqlstate = sqlstate
+
+
+def frame(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({"usage_date": range(rows), "total_cost": [1.0] * rows})
+
+
+class QueryCacheTests(unittest.TestCase):
+    def test_evicts_least_recently_used_entry_past_max_entries(self):
+        cache = QueryCache(max_entries=2)
+        cache.put("a", frame(1))
+        cache.put("b", frame(1))
+        self.assertTrue(cache.get("a")[0])
+        cache.put("c", frame(1))
+        self.assertFalse(cache.get("b")[0])
+        self.assertTrue(cache.get("a")[0])
+        self.assertTrue(cache.get("c")[0])
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_evicts_until_under_max_bytes(self):
+        size = estimate_bytes(frame(100))
+        cache = QueryCache(max_entries=10, max_bytes=size * 2)
+        for key in ("a", "b", "c"):
+            cache.put(key, frame(100))
+        stats = cache.stats()
+        self.assertEqual(stats["entries"], 2)
+        self.assertLessEqual(stats["bytes"], size * 2)
+        self.assertFalse(cache.get("a")[0])
+
+    def test_skips_values_larger_than_the_whole_budget(self):
+        cache = QueryCache(max_entries=10, max_bytes=16)
+        self.assertFalse(cache.put("big", frame(1000)))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_counts_hits_and_misses(self):
+        cache = QueryCache()
+        calls = []
+        for _ in range(3):
+            cache.get_or_load("k", lambda: calls.append(1) or frame(2))
+        stats = cache.stats()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
+
+    def test_returns_copies_so_callers_cannot_mutate_cached_frames(self):
+        cache = QueryCache()
+        first = cache.get_or_load("k", lambda: frame(2))
+        first["total_cost"] = 99.0
+        second = cache.get_or_load("k", lambda: frame(2))
+        self.assertEqual(second["total_cost"].tolist(), [1.0, 1.0])
+
+    def test_cached_decorator_keys_on_arguments(self):
+        cache = QueryCache()
+        calls = []
+
+        @cached(lambda: cache)
+        def load(days: int, threshold: float = 0.05):
+            calls.append((days, threshold))
+            return frame(days)
+
+        load(7)
+        load(7)
+        load(7, threshold=0.1)
+        load(14)
+        self.assertEqual(calls, [(7, 0.05), (7, 0.1), (14, 0.05)])
+
+
+class NegativeCachingTests(unittest.TestCase):
+    def test_failures_are_cached_until_their_ttl_expires(self):
+        clock = FakeClock()
+        cache = QueryCache(clock=clock)
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) == 1:
+                raise CachedFailure("OperationalError: timeout", ttl=30)
+            return frame(1)
+
+        for _ in range(2):
+            with self.assertRaises(CachedFailure):
+                cache.get_or_load("k", flaky)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.stats()["negative_hits"], 1)
+
+        clock.now += 31
+        self.assertEqual(len(cache.get_or_load("k", flaky)), 1)
+        self.assertEqual(len(calls), 2)
+
+    def test_loaders_wrapping_a_degraded_query_inherit_its_ttl(self):
+        clock = FakeClock()
+        cache = QueryCache(clock=clock)
+        calls = []
+
+        @cached(lambda: cache)
+        def load_section():
+            calls.append(1)
+            note_failure(30)
+            return frame(0)
+
+        load_section()
+        load_section()
+        clock.now += 31
+        load_section()
+        self.assertEqual(len(calls), 2)
+
+    def test_classifies_missing_objects_as_permanent(self):
+        self.assertTrue(is_permanent_error(FakeSnowflakeError("Object 'FCT_DAILY_COSTS' does not exist", errno=2003)))
+        self.assertTrue(is_permanent_error(FakeSnowflakeError("compilation error", sqlstate="42S02")))
+        self.assertFalse(is_permanent_error(FakeSnowflakeError("Connection reset by peer", errno=251001)))
+
+    def test_retries_transient_errors_with_bounded_jittered_backoff(self):
+        delays = []
+        attempts = []
+
+        def fn():
+            attempts.append(1)
+            raise FakeSnowflakeError("Connection reset by peer")
+
+        with self.assertRaises(FakeSnowflakeError):
+            retry_with_backoff(
+                fn,
+                attempts=4,
+                base_delay=0.5,
+                max_delay=1.5,
+                sleep=delays.append,
+                jitter=lambda low, high: high,
+            )
+        self.assertEqual(len(attempts), 4)
+        self.assertEqual(delays, [0.5, 1.0, 1.5])
+
+    def test_does_not_retry_permanent_errors(self):
+        attempts = []
+
+        def fn():
+            attempts.append(1)
+            raise FakeSnowflakeError("Table 'X' does not exist or not authorized.", errno=2003)
+
+        with self.assertRaises(FakeSnowflakeError):
+            retry_with_backoff(fn, attempts=5, sleep=lambda _: None)
+        self.assertEqual(len(attempts), 1)
+
+
+class StaleWhileRevalidateTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.pending = []
+        self.cache = QueryCache(clock=self.clock, refresh=self.pending.append)
+
+    def test_serves_stale_value_and_swaps_in_refresh(self):
+        versions = iter([frame(1), frame(2)])
+        load = lambda: next(versions)
+        self.assertEqual(len(self.cache.get_or_load("k", load, refresh_after=60)), 1)
+        self.clock.now += 61
+        self.assertEqual(len(self.cache.get_or_load("k", load, refresh_after=60)), 1)
+        self.assertEqual(len(self.pending), 1)
+        self.pending.pop()()
+        self.assertEqual(len(self.cache.get_or_load("k", load, refresh_after=60)), 2)
+        self.assertEqual(self.cache.stats()["refreshes"], 1)
+
+    def test_schedules_one_refresh_per_key(self):
+        self.cache.get_or_load("k", lambda: frame(1), refresh_after=60)
+        self.clock.now += 61
+        for _ in range(3):
+            self.cache.get_or_load("k", lambda: frame(1), refresh_after=60)
+        self.assertEqual(len(self.pending), 1)
+        self.assertEqual(self.cache.stats()["stale_hits"], 3)
+
+    def test_failed_refresh_keeps_last_good_result(self):
+        self.cache.get_or_load("k", lambda: frame(3), refresh_after=60)
+        self.clock.now += 61
+
+        def broken():
+            raise CachedFailure("OperationalError: timeout", ttl=30)
+
+        self.cache.get_or_load("k", broken, refresh_after=60)
+        self.pending.pop()()
+        self.assertEqual(len(self.cache.get_or_load("k", broken, refresh_after=60)), 3)
+        self.assertEqual(self.pending, [])
+        self.clock.now += 31
+        self.cache.get_or_load("k", broken, refresh_after=60)
+        self.assertEqual(len(self.pending), 1)
+        self.assertEqual(self.cache.stats()["refresh_failures"], 1)
+
+    def test_refresh_finishing_after_clear_is_discarded(self):
+        self.cache.get_or_load("k", lambda: frame(1), refresh_after=60)
+        self.clock.now += 61
+        self.cache.get_or_load("k", lambda: frame(2), refresh_after=60)
+        self.cache.clear()
+        self.pending.pop()()
+        self.assertFalse(self.cache.get("k")[0])
+        self.assertEqual(len(self.cache.get_or_load("k", lambda: frame(3), refresh_after=60)), 3)
+
+    def test_stale_entries_expire_after_max_stale(self):
+        cache = QueryCache(clock=self.clock, refresh=self.pending.append, max_stale=100)
+        cache.put("k", frame(1), refresh_after=60)
+        self.clock.now += 161
+        self.assertFalse(cache.get("k")[0])
+
+    def test_cached_decorator_accepts_per_call_cadence(self):
+        calls = []
+
+        @cached(lambda: self.cache, refresh_after=lambda key: 10 if key == "metering" else 1000)
+        def load(key):
+            calls.append(key)
+            return frame(1)
+
+        load("metering")
+        load("storage")
+        self.clock.now += 11
+        load("metering")
+        load("storage")
+        self.assertEqual(len(self.pending), 1)
+
+
+class SingleFlightTests(unittest.TestCase):
+    def run_concurrently(self, cache, loader, callers=5):
+        results, errors = [], []
+
+        def call():
+            try:
+                results.append(cache.get_or_load("k", loader))
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=call) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        return results, errors
+
+    def test_concurrent_misses_share_one_load(self):
+        cache = QueryCache()
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            release.wait(timeout=5)
+            return frame(3)
+
+        threading.Timer(0.2, release.set).start()
+        results, errors = self.run_concurrently(cache, slow)
+        self.assertEqual(errors, [])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([len(r) for r in results], [3] * 5)
+        self.assertEqual(cache.stats()["coalesced"], 4)
+        self.assertEqual(cache.stats()["in_flight"], 0)
+
+    def test_waiters_receive_the_leaders_failure(self):
+        cache = QueryCache()
+        release = threading.Event()
+        calls = []
+
+        def failing():
+            calls.append(1)
+            release.wait(timeout=5)
+            raise CachedFailure("OperationalError: timeout", ttl=30)
+
+        threading.Timer(0.2, release.set).start()
+        results, errors = self.run_concurrently(cache, failing)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(errors), 5)
+        self.assertTrue(all(isinstance(e, CachedFailure) for e in errors))
+
+    def test_waiters_stop_waiting_on_a_stuck_leader(self):
+        cache = QueryCache(flight_timeout=0.1)
+        release = threading.Event()
+        leader_started = threading.Event()
+
+        def stuck():
+            leader_started.set()
+            release.wait(timeout=5)
+            return frame(1)
+
+        leader = threading.Thread(target=lambda: cache.get_or_load("k", stuck))
+        leader.start()
+        leader_started.wait(timeout=5)
+        try:
+            self.assertEqual(len(cache.get_or_load("k", lambda: frame(2))), 2)
+            self.assertEqual(cache.stats()["flight_timeouts"], 1)
+        finally:
+            release.set()
+            leader.join(timeout=5)
+
+    def test_leader_control_flow_exceptions_stay_with_the_leader(self):
+        class StopSession(BaseException):
+            pass
+
+        cache = QueryCache()
+        release = threading.Event()
+        leader_started = threading.Event()
+        leader_errors = []
+
+        def interrupted():
+            leader_started.set()
+            release.wait(timeout=5)
+            raise StopSession()
+
+        def lead():
+            try:
+                cache.get_or_load("k", interrupted)
+            except StopSession as exc:
+                leader_errors.append(exc)
+
+        leader = threading.Thread(target=lead)
+        leader.start()
+        leader_started.wait(timeout=5)
+        threading.Timer(0.2, release.set).start()
+        self.assertEqual(len(cache.get_or_load("k", lambda: frame(2))), 2)
+        leader.join(timeout=5)
+        self.assertEqual(len(leader_errors), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "seeds"))
+
+import generate_metering_seed_scaled as metering  # noqa: E402
+import generate_query_history_seed_sharded as sharded  # noqa: E402
+
+SCALE = metering.Scale(12, 5, 20)
+START = np.datetime64("2026-01-01")
+
+
+class ShardedQueryHistoryTests(unittest.TestCase):
+    def run_generator(self, out_dir: Path, workers: int):
+        job = sharded.Job(SCALE, 42, START, 1.0, out_dir, "csv")
+        results = sharded.generate(job, sharded.plan_shards(SCALE, 5, 8), workers)
+        return results, {path.name: path.read_bytes() for path in sorted(out_dir.glob("*.csv.gz"))}
+
+    def test_output_does_not_depend_on_worker_count(self):
+        with tempfile.TemporaryDirectory() as one, tempfile.TemporaryDirectory() as many:
+            serial, serial_files = self.run_generator(Path(one), workers=1)
+            parallel, parallel_files = self.run_generator(Path(many), workers=3)
+        self.assertEqual(len(serial_files), 9)
+        self.assertEqual(serial_files, parallel_files)
+        self.assertEqual([r["rows"] for r in serial], [r["rows"] for r in parallel])
+
+    def test_shards_cover_the_grid_with_unique_ids_and_queries_within_their_hour(self):
+        job = sharded.Job(SCALE, 42, START, 1.0, None, "csv")
+        frames = [sharded.shard_frame(job, shard) for shard in sharded.plan_shards(SCALE, 5, 8)]
+        rows = pd.concat(frames, ignore_index=True)
+        self.assertTrue(rows["QUERY_ID"].is_unique)
+        self.assertEqual(rows["WAREHOUSE_NAME"].nunique(), SCALE.warehouses)
+        self.assertEqual(rows["START_TIME"].dt.normalize().nunique(), SCALE.days + 1)
+        self.assertTrue((rows["END_TIME"].dt.floor("h") == rows["START_TIME"].dt.floor("h")).all())
+        self.assertTrue((rows["EXECUTION_TIME"] <= rows["TOTAL_ELAPSED_TIME"]).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from app.query_cache import QueryCache
+from app.shared_cache import CacheBackend, SQLiteCacheBackend, open_backend
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def frame(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({"usage_date": range(rows), "total_cost": [1.0] * rows})
+
+
+class SQLiteCacheBackendTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "shared", "cache.db")
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def backend(self, **kwargs):
+        return SQLiteCacheBackend(self.path, clock=self.clock, **kwargs)
+
+    def test_round_trips_frames_with_age(self):
+        backend = self.backend()
+        backend.set(("execute_query", ("select 1", "fct:x")), frame(3), ttl=60)
+        self.clock.now += 5
+        value, age = backend.get(("execute_query", ("select 1", "fct:x")))
+        self.assertEqual(len(value), 3)
+        self.assertEqual(age, 5)
+
+    def test_entries_expire_after_ttl(self):
+        backend = self.backend()
+        backend.set("k", frame(1), ttl=60)
+        self.clock.now += 61
+        self.assertIsNone(backend.get("k"))
+
+    def test_evicts_least_recently_read_past_max_bytes(self):
+        probe = self.backend()
+        probe.set("probe", frame(50), ttl=60)
+        size = probe.stats()["bytes"]
+        probe.clear()
+        backend = self.backend(max_bytes=size * 2)
+        backend.set("a", frame(50), ttl=600)
+        self.clock.now += 61
+        backend.set("b", frame(50), ttl=600)
+        self.clock.now += 61
+        backend.get("a")
+        self.clock.now += 61
+        backend.set("c", frame(50), ttl=600)
+        self.assertIsNotNone(backend.get("a"))
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(backend.stats()["entries"], 2)
+
+    def test_reads_touch_accessed_at_at_most_once_per_interval(self):
+        backend = self.backend(touch_interval=60)
+        backend.set("k", frame(1), ttl=600)
+
+        def accessed_at():
+            return backend._connect().execute("select accessed_at from cache_entries").fetchone()[0]
+
+        self.clock.now += 30
+        backend.get("k")
+        self.assertEqual(accessed_at(), 1000.0)
+        self.clock.now += 30
+        backend.get("k")
+        self.assertEqual(accessed_at(), 1060.0)
+
+    def test_uses_rollback_journal_for_network_filesystems(self):
+        backend = self.backend()
+        mode = backend._connect().execute("pragma journal_mode").fetchone()[0]
+        self.assertEqual(mode, "delete")
+
+    def test_backend_interface_is_abstract(self):
+        with self.assertRaises(TypeError):
+            CacheBackend()
+
+    def test_second_replica_reads_first_replicas_results(self):
+        first = QueryCache(shared=self.backend())
+        second = QueryCache(shared=self.backend())
+        calls = []
+        load = lambda: calls.append(1) or frame(4)
+        first.get_or_load("k", load, refresh_after=60)
+        self.assertEqual(len(second.get_or_load("k", load, refresh_after=60)), 4)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(second.stats()["shared_hits"], 1)
+
+    def test_shared_age_counts_toward_local_staleness(self):
+        pending = []
+        first = QueryCache(clock=self.clock, shared=self.backend())
+        second = QueryCache(clock=self.clock, shared=self.backend(), refresh=pending.append)
+        first.get_or_load("k", lambda: frame(1), refresh_after=60)
+        self.clock.now += 61
+        second.get_or_load("k", lambda: frame(2), refresh_after=60)
+        self.assertEqual(len(pending), 1)
+
+    def test_rejects_unknown_schemes(self):
+        self.assertIsNone(open_backend(""))
+        with self.assertRaises(ValueError):
+            open_backend("memcached://cache:11211")
+
+
+if __name__ == "__main__":
+    unittest.main()